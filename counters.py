@@ -0,0 +1,283 @@
+"""
+Header badge and dashboard counters, kept in a table instead of recounted.
+
+entity_counters holds one row per (entity, counter): how many active
+(non-archived) jobs, quotes, tasks, purchase orders and customers are in
+each status and traffic-light bucket. ORM events add and subtract on the
+same connection as the write, so counts commit or roll back with the
+change that moved them. Reading every count is one small query, however
+many rows the entity tables have.
+
+Due-date buckets depend on the day, so the table records the day it was
+bucketed for (AS_OF_KEY). The first write or read on a later day rebuilds
+the table from one grouped query per entity; CounterBoard does this at
+midnight.
+
+Rebuild the counters for an existing database with:
+
+    python counters.py --rebuild
+"""
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+from enum import Enum
+from sqlalchemy import event, func, select, text
+from sqlalchemy.orm import attributes
+from models import Job, Quote, Task, PurchaseOrder, Customer, JobStatus, QuoteStatus, TaskStatus, POStatus
+
+TABLE_NAME = "entity_counters"
+
+# (entity, counter) row holding the day (as an ordinal) the buckets are for
+AS_OF_KEY = ("", "as_of")
+
+CREATE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+        entity TEXT NOT NULL,
+        counter TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (entity, counter)
+    )
+"""
+
+
+def _value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def _due_bucket(due_date, today):
+    """Jobs and Tasks page traffic lights"""
+    if due_date < today:
+        return "overdue"
+    if due_date == today:
+        return "due_today"
+    return "on_time"
+
+
+def _dashboard_due_colour(due_date, today):
+    """Dashboard: red overdue, orange due within 3 days, green later or no due date"""
+    if due_date is None:
+        return "green"
+    if due_date < today:
+        return "red"
+    if due_date <= today + timedelta(days=3):
+        return "orange"
+    return "green"
+
+
+def job_counters(today, status, due_date):
+    counters = [status, _dashboard_due_colour(due_date, today)]
+    if status == JobStatus.CREATED:
+        counters.append("unassigned")
+    if due_date and status != JobStatus.COMPLETE:
+        counters.append(_due_bucket(due_date, today))
+    return counters
+
+
+def quote_counters(today, status, expiry_date):
+    # Dashboard: accepted green, rejected red, otherwise by expiry (orange within 7 days)
+    if status == QuoteStatus.ACCEPTED:
+        colour = "green"
+    elif status == QuoteStatus.REJECTED or (expiry_date and expiry_date < today):
+        colour = "red"
+    elif expiry_date and expiry_date <= today + timedelta(days=7):
+        colour = "orange"
+    else:
+        colour = "green"
+    return [status, colour]
+
+
+def task_counters(today, status, due_date):
+    if status == TaskStatus.COMPLETED:
+        return [status, "green"]
+    counters = [status, _dashboard_due_colour(due_date, today)]
+    if due_date:
+        counters.append(_due_bucket(due_date, today))
+    return counters
+
+
+def po_counters(today, status, due_date):
+    # Page traffic lights, then the dashboard colour
+    if status == POStatus.TO_ORDER:
+        return ["to_order", "blue"]
+    if status == POStatus.RECEIVED:
+        return ["received", "orange"]
+    if status == POStatus.WAITING_STOCK:
+        if due_date and due_date < today:
+            return ["overdue", "red"]
+        return ["waiting_stock", "green"]
+    return ["green"]
+
+
+def customer_counters(today, status):
+    return [status]
+
+
+# (entity, model, fields, counters(today, *field values)) - counted when not archived
+ENTITIES = [
+    ("job", Job, ["status", "due_date"], job_counters),
+    ("quote", Quote, ["status", "expiry_date"], quote_counters),
+    ("task", Task, ["status", "due_date"], task_counters),
+    ("purchase_order", PurchaseOrder, ["status", "due_date"], po_counters),
+    ("customer", Customer, ["status"], customer_counters),
+]
+MODEL_ENTITIES = {model: (entity, fields, counters) for entity, model, fields, counters in ENTITIES}
+ENTITY_NAMES = [entity for entity, _model, _fields, _counters in ENTITIES]
+
+# Whether the table exists, per database URL
+_available = {}
+
+
+def _table_exists(connection):
+    if connection.dialect.name != "sqlite":
+        return False
+    row = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": TABLE_NAME}
+    ).first()
+    return row is not None
+
+
+def _is_ready(connection):
+    key = str(connection.engine.url)
+    if key not in _available:
+        _available[key] = _table_exists(connection)
+    return _available[key]
+
+
+def _as_of(connection):
+    return connection.execute(
+        text(f"SELECT count FROM {TABLE_NAME} WHERE entity = :entity AND counter = :counter"),
+        {"entity": AS_OF_KEY[0], "counter": AS_OF_KEY[1]}
+    ).scalar()
+
+
+def rebuild(connection, today=None):
+    """Recount every entity from scratch, bucketed for today"""
+    today = today or date.today()
+    counts = Counter()
+    for entity, model, fields, counters in ENTITIES:
+        columns = [getattr(model, field) for field in fields]
+        grouped = select(*columns, func.count()).where(model.is_archived == False).group_by(*columns)
+        for *values, total in connection.execute(grouped):
+            for counter in counters(today, *[_value(value) for value in values]):
+                if counter is not None:
+                    counts[(entity, _value(counter))] += total
+
+    connection.execute(text(f"DELETE FROM {TABLE_NAME}"))
+    rows = [{"entity": entity, "counter": counter, "count": total} for (entity, counter), total in counts.items()]
+    rows.append({"entity": AS_OF_KEY[0], "counter": AS_OF_KEY[1], "count": today.toordinal()})
+    connection.execute(
+        text(f"INSERT INTO {TABLE_NAME} (entity, counter, count) VALUES (:entity, :counter, :count)"),
+        rows
+    )
+
+
+def bring_up_to_date(connection, today=None):
+    """Rebuild if the buckets are for an earlier day; returns True if it did"""
+    today = today or date.today()
+    if _as_of(connection) == today.toordinal():
+        return False
+    rebuild(connection, today)
+    return True
+
+
+def ensure_counters(db):
+    """
+    Create the table for the database behind db if needed, and bring it up
+    to date. Returns False for databases the counters aren't kept for.
+    """
+    connection = db.connection()
+    key = str(connection.engine.url)
+    if connection.dialect.name != "sqlite":
+        _available[key] = False
+        return False
+    if not _available.get(key):
+        connection.execute(text(CREATE_SQL))
+        _available[key] = True
+    bring_up_to_date(connection)
+    return True
+
+
+def read_counts(db):
+    """{entity: Counter(counter -> count)} for every counted entity; commit db afterwards"""
+    counts = {entity: Counter() for entity in ENTITY_NAMES}
+    if not ensure_counters(db):
+        return counts
+    rows = db.execute(text(f"SELECT entity, counter, count FROM {TABLE_NAME} WHERE entity != :as_of"),
+                      {"as_of": AS_OF_KEY[0]})
+    for entity, counter, total in rows:
+        if entity in counts:
+            counts[entity][counter] = total
+    return counts
+
+
+def _counters_for(target, fields, counters, today, old=False):
+    values = {}
+    for field in fields + ["is_archived"]:
+        value = getattr(target, field)
+        if old:
+            history = attributes.get_history(target, field)
+            if history.deleted:
+                value = history.deleted[0]
+        values[field] = value
+    archived = values.pop("is_archived")
+    if archived is None or archived:
+        return [] # Only rows the pages show (is_archived == False) are counted
+    return [_value(counter) for counter in counters(today, *[_value(values[field]) for field in fields])
+            if counter is not None]
+
+
+def _apply(connection, entity, deltas):
+    rows = [{"entity": entity, "counter": counter, "delta": delta} for counter, delta in deltas.items() if delta]
+    if rows:
+        connection.execute(
+            text(f"""
+                INSERT INTO {TABLE_NAME} (entity, counter, count) VALUES (:entity, :counter, :delta)
+                ON CONFLICT (entity, counter) DO UPDATE SET count = count + excluded.count
+            """),
+            rows
+        )
+
+
+def _make_listener(kind):
+    def listener(mapper, connection, target):
+        if not _is_ready(connection):
+            return
+        if bring_up_to_date(connection):
+            return # The rebuild already counted this write
+        entity, fields, counters = MODEL_ENTITIES[mapper.class_]
+        today = date.today()
+        deltas = Counter()
+        if kind != "insert":
+            deltas.subtract(_counters_for(target, fields, counters, today, old=True))
+        if kind != "delete":
+            deltas.update(_counters_for(target, fields, counters, today))
+        _apply(connection, entity, deltas)
+    return listener
+
+
+for _entity, _model, _fields, _counters in ENTITIES:
+    for _kind in ("insert", "update", "delete"):
+        event.listen(_model, f"after_{_kind}", _make_listener(_kind))
+
+
+if __name__ == "__main__":
+    if "--rebuild" not in sys.argv[1:]:
+        print(__doc__)
+        sys.exit(1)
+
+    from db_session import open_session
+
+    db = open_session()
+    try:
+        start = time.perf_counter()
+        if ensure_counters(db):
+            rebuild(db.connection())
+            db.commit()
+            print(f"Rebuilt {TABLE_NAME} in {time.perf_counter() - start:.2f}s")
+        else:
+            print("Counters are only kept for SQLite databases.")
+            sys.exit(1)
+    finally:
+        db.close()
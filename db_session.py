@@ -0,0 +1,237 @@
+"""
+Database sessions on one tuned, pooled engine.
+
+Get a session with session_scope(), which rolls back if the block raises
+and always closes the session:
+
+    with session_scope() as db:
+        db.add(job)
+        db.commit()
+
+The engine is built from database.py's URL with a bounded connection pool
+(shared by the UI thread and the data service workers). Every new SQLite
+connection gets a busy timeout, so a station waits for another station's
+write instead of failing with "database is locked", plus these pragmas,
+each of which can be overridden with an environment variable:
+
+    PRINTSHOP_SQLITE_JOURNAL      journal_mode  (WAL)
+    PRINTSHOP_SQLITE_SYNCHRONOUS  synchronous   (NORMAL)
+    PRINTSHOP_SQLITE_CACHE_KB     cache_size    (20000 KiB)
+    PRINTSHOP_SQLITE_MMAP_MB      mmap_size     (256 MiB)
+    PRINTSHOP_SQLITE_BUSY_MS      busy_timeout  (10000 ms)
+    PRINTSHOP_DB_POOL_SIZE        connections in the pool (5)
+
+WAL lets readers and the writer work at the same time, but it only works
+when every process using the file runs on the same machine. A database
+file on a network share (a UNC path, a mapped network drive on Windows or
+a network filesystem mount on Linux) gets DELETE instead, unless
+PRINTSHOP_SQLITE_JOURNAL says otherwise.
+
+session_stats() counts sessions opened, closed and still open. A session
+that is garbage collected without being closed is counted as leaked and
+printed with where it was opened.
+"""
+import os
+import sys
+import threading
+import weakref
+import sqlalchemy
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from database import get_db
+
+DEFAULT_POOL_SIZE = 5
+POOL_TIMEOUT_S = 30
+
+# Mount types (Linux) whose files can be shared with other machines
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "afs", "9p", "ncpfs", "fuse.sshfs"}
+
+DRIVE_REMOTE = 4 # GetDriveTypeW for a network drive
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        print(f"Invalid {name}, using {default}")
+        return default
+
+
+def _drive_is_remote(path):
+    """Whether path is on a mapped network drive (Windows)"""
+    drive = os.path.splitdrive(path)[0]
+    if not drive.endswith(":"):
+        return False
+    import ctypes
+    return ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == DRIVE_REMOTE
+
+
+def _mount_type(path, mounts="/proc/mounts"):
+    """Filesystem type of the mount holding path, or None if mounts can't be read"""
+    try:
+        with open(mounts) as f:
+            entries = [line.split()[1:3] for line in f]
+    except OSError:
+        return None
+    found = None
+    for entry in entries:
+        if len(entry) < 2:
+            continue
+        mount_point = entry[0].replace("\\040", " ")
+        if path == mount_point or path.startswith(mount_point.rstrip("/") + "/"):
+            if found is None or len(mount_point) > len(found[0]):
+                found = (mount_point, entry[1])
+    return found[1] if found else None
+
+
+def is_network_path(database_path):
+    """Whether the database file is on another machine's disk"""
+    if database_path.startswith(("\\\\", "//")):
+        return True
+    path = os.path.abspath(database_path)
+    if sys.platform == "win32":
+        return _drive_is_remote(path)
+    return _mount_type(os.path.realpath(path)) in NETWORK_FILESYSTEMS
+
+
+def journal_mode(database_path):
+    mode = os.environ.get("PRINTSHOP_SQLITE_JOURNAL")
+    if mode:
+        return mode.upper()
+    # WAL needs shared memory between processes, which network shares don't provide
+    if database_path and is_network_path(database_path):
+        return "DELETE"
+    return "WAL"
+
+
+def sqlite_pragmas(database_path):
+    """(pragma, value) pairs run on every new connection"""
+    return [
+        ("busy_timeout", _env_int("PRINTSHOP_SQLITE_BUSY_MS", 10000)),
+        ("journal_mode", journal_mode(database_path)),
+        ("synchronous", os.environ.get("PRINTSHOP_SQLITE_SYNCHRONOUS", "NORMAL").upper()),
+        ("cache_size", -_env_int("PRINTSHOP_SQLITE_CACHE_KB", 20000)), # Negative means KiB
+        ("mmap_size", _env_int("PRINTSHOP_SQLITE_MMAP_MB", 256) * 1024 * 1024),
+    ]
+
+
+# Frames skipped when recording where a session was opened
+_internal_files = (__file__, sys.modules[contextmanager.__module__].__file__)
+_sqlalchemy_dir = os.path.dirname(sqlalchemy.__file__)
+
+_stats_lock = threading.Lock()
+_stats = {"opened": 0, "closed": 0, "leaked": 0}
+
+
+def session_stats():
+    """Sessions opened, closed, leaked and currently open"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["open"] = stats["opened"] - stats["closed"] - stats["leaked"]
+    return stats
+
+
+def _opened_from():
+    """file:line of the first caller outside this module, contextlib and SQLAlchemy"""
+    frame = sys._getframe(1)
+    while frame is not None and (frame.f_code.co_filename in _internal_files
+                                 or frame.f_code.co_filename.startswith(_sqlalchemy_dir)):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+
+def _collected(tracking):
+    if tracking["closed"]:
+        return
+    with _stats_lock:
+        _stats["leaked"] += 1
+    print(f"Database session opened at {tracking['opened_at']} was never closed")
+
+
+class TrackedSession(Session):
+    """Session that counts itself in session_stats()"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tracking = {"closed": False, "opened_at": _opened_from()}
+        weakref.finalize(self, _collected, self._tracking)
+        with _stats_lock:
+            _stats["opened"] += 1
+
+    def close(self):
+        super().close()
+        if not self._tracking["closed"]:
+            self._tracking["closed"] = True
+            with _stats_lock:
+                _stats["closed"] += 1
+
+
+_engine = None
+_session_factory = None
+_engine_lock = threading.Lock()
+
+
+def _database_url():
+    db = next(get_db())
+    try:
+        return db.get_bind().url
+    finally:
+        db.close()
+
+
+def get_engine():
+    """The shared pooled engine, created on first use"""
+    global _engine, _session_factory
+    with _engine_lock:
+        if _engine is not None:
+            return _engine
+
+        url = _database_url()
+        if url.get_backend_name() != "sqlite":
+            engine = create_engine(url, pool_size=_env_int("PRINTSHOP_DB_POOL_SIZE", DEFAULT_POOL_SIZE),
+                                   max_overflow=0, pool_timeout=POOL_TIMEOUT_S, pool_pre_ping=True)
+        else:
+            engine = create_engine(
+                url,
+                poolclass=QueuePool,
+                pool_size=_env_int("PRINTSHOP_DB_POOL_SIZE", DEFAULT_POOL_SIZE),
+                max_overflow=0,
+                pool_timeout=POOL_TIMEOUT_S,
+                connect_args={"check_same_thread": False},
+            )
+            pragmas = sqlite_pragmas(url.database)
+
+            @event.listens_for(engine, "connect")
+            def set_pragmas(dbapi_connection, _record):
+                cursor = dbapi_connection.cursor()
+                try:
+                    for name, value in pragmas:
+                        cursor.execute(f"PRAGMA {name} = {value}")
+                finally:
+                    cursor.close()
+
+        _engine = engine
+        _session_factory = sessionmaker(bind=engine, class_=TrackedSession)
+        return _engine
+
+
+def open_session():
+    """A new session on the shared engine; the caller must close it"""
+    get_engine()
+    return _session_factory()
+
+
+@contextmanager
+def session_scope():
+    """A session that is rolled back on error and always closed"""
+    db = open_session()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,144 @@
+"""
+Saving quote and purchase order line items.
+
+The editors keep each existing line's id with its row. On save the rows
+are compared with what is stored and only the difference is written: one
+executemany INSERT for new lines, one executemany UPDATE for changed
+lines and one DELETE for removed lines, all in the caller's transaction.
+Unchanged lines are not touched, so their rowids stay put.
+
+LineItem is the editors' in-memory line: a plain slotted object rather
+than a detached ORM row, so a 500-line order stays small. LineItemTotals
+(line_totals.py) keeps the running subtotal, tax and total in integer
+cents as lines change, without rescanning the order.
+
+The quote tax rate is a business setting (settings_manager), edited on the
+Settings page next to the tax type and number.
+"""
+from sqlalchemy import bindparam, select
+from models import QuoteItem, POItem
+from revisions import note_writes
+from settings_manager import get_settings
+
+# Columns the editors edit, per line item model
+QUOTE_ITEM_FIELDS = ["description", "quantity", "unit_price", "total"]
+PO_ITEM_FIELDS = ["description", "quantity", "unit_price", "total", "is_stock", "job_id"]
+
+# Quote tax rate (percent) if the setting can't be read
+DEFAULT_TAX_RATE = 10
+
+
+class LineItem:
+    """One editor line; id is None until the line has been saved. Prices are in cents."""
+    __slots__ = ("id", "description", "quantity", "unit_price", "is_stock", "job_id")
+
+    def __init__(self, id=None, description="", quantity=1, unit_price=0, is_stock=False, job_id=None):
+        self.id = id
+        self.description = description
+        self.quantity = quantity
+        self.unit_price = unit_price
+        self.is_stock = is_stock
+        self.job_id = job_id
+
+    @property
+    def total(self):
+        return self.quantity * self.unit_price
+
+    @classmethod
+    def from_record(cls, item):
+        """From a stored QuoteItem or POItem"""
+        return cls(
+            id=item.id,
+            description=item.description or "",
+            quantity=item.quantity or 0,
+            unit_price=item.unit_price or 0,
+            is_stock=bool(getattr(item, "is_stock", False)),
+            job_id=getattr(item, "job_id", None),
+        )
+
+    def as_row(self):
+        """Values for save_line_items"""
+        return {
+            "id": self.id,
+            "description": self.description.strip(),
+            "quantity": self.quantity,
+            "unit_price": self.unit_price,
+            "total": self.total,
+            "is_stock": self.is_stock,
+            "job_id": None if self.is_stock else self.job_id,
+        }
+
+
+def tax_rate_basis_points():
+    """The quote tax rate from settings, in hundredths of a percent"""
+    value = get_settings().get_tax_rate()
+    try:
+        return round(float(value) * 100)
+    except (TypeError, ValueError):
+        print(f"Invalid tax rate setting {value!r}, using {DEFAULT_TAX_RATE}%")
+        return DEFAULT_TAX_RATE * 100
+
+
+def diff_line_items(stored, rows, fields):
+    """
+    Compare rows (dicts with "id", None for new lines, plus fields) with
+    stored ({id: tuple of field values}). Returns (inserts, updates, delete_ids).
+    """
+    inserts = []
+    updates = []
+    kept = set()
+    for row in rows:
+        item_id = row.get("id")
+        if item_id is None or item_id not in stored:
+            inserts.append({field: row[field] for field in fields})
+            continue
+        kept.add(item_id)
+        if tuple(row[field] for field in fields) != stored[item_id]:
+            updates.append(row)
+    delete_ids = [item_id for item_id in stored if item_id not in kept]
+    return inserts, updates, delete_ids
+
+
+def save_line_items(db, model, parent_column, parent_id, rows, fields):
+    """
+    Make the parent's stored line items match rows, writing only what
+    changed. Returns True if anything was written.
+    """
+    table = model.__table__
+    parent = table.c[parent_column]
+
+    stored = {
+        row[0]: tuple(row[1:])
+        for row in db.execute(
+            select(table.c.id, *[table.c[field] for field in fields]).where(parent == parent_id)
+        )
+    }
+    inserts, updates, delete_ids = diff_line_items(stored, rows, fields)
+
+    # Rows written, for the revision triggers (the ORM events don't see Core statements)
+    written = 0
+    if delete_ids:
+        written += db.execute(table.delete().where(parent == parent_id, table.c.id.in_(delete_ids))).rowcount
+    if updates:
+        written += db.execute(
+            table.update()
+            .where(table.c.id == bindparam("item_id"), parent == parent_id)
+            .values({field: bindparam(f"new_{field}") for field in fields}),
+            [dict({"item_id": row["id"]}, **{f"new_{field}": row[field] for field in fields}) for row in updates]
+        ).rowcount
+    if inserts:
+        for values in inserts:
+            values[parent_column] = parent_id
+        db.execute(table.insert(), inserts)
+        written += len(inserts)
+    note_writes(db, table.name, written)
+
+    return bool(inserts or updates or delete_ids)
+
+
+def save_quote_items(db, quote_id, rows):
+    return save_line_items(db, QuoteItem, "quote_id", quote_id, rows, QUOTE_ITEM_FIELDS)
+
+
+def save_po_items(db, po_id, rows):
+    return save_line_items(db, POItem, "po_id", po_id, rows, PO_ITEM_FIELDS)
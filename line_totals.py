@@ -0,0 +1,43 @@
+"""
+Running quote and purchase order totals, in integer cents.
+
+Kept apart from line_items.py so it has no database or Qt dependency; the
+tests exercise it directly.
+"""
+
+
+class LineItemTotals:
+    """
+    Subtotal, tax and total of a set of lines, in cents.
+
+    set_line / remove_line adjust the running subtotal by the one line's
+    change. Tax is rounded half up to the cent.
+    """
+    def __init__(self, tax_basis_points=0):
+        self.tax_basis_points = tax_basis_points
+        self.lines = {} # line key -> cents
+        self.subtotal = 0
+
+    def reset(self, lines=()):
+        """Replace every line with lines, (key, cents) pairs"""
+        self.lines = dict(lines)
+        self.subtotal = sum(self.lines.values())
+
+    def set_line(self, key, cents):
+        self.subtotal += cents - self.lines.get(key, 0)
+        self.lines[key] = cents
+
+    def remove_line(self, key):
+        self.subtotal -= self.lines.pop(key, 0)
+
+    @property
+    def tax(self):
+        return (self.subtotal * self.tax_basis_points + 5000) // 10000
+
+    @property
+    def total(self):
+        return self.subtotal + self.tax
+
+    @property
+    def rate_text(self):
+        return f"{self.tax_basis_points / 100:g}%"
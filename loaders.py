@@ -0,0 +1,98 @@
+"""
+Loader profiles: the relationships each screen reads, loaded up front.
+
+Cards and editors get their objects from sessions that are closed before
+the widgets are built, so a relationship that wasn't loaded with the
+object can't be read at all, and one read while the session is open costs
+a query per object. Each screen instead loads what it shows in a fixed
+number of queries, however many rows there are:
+
+    db.query(PurchaseOrder).options(*PO_CARD)
+
+QueryBudget counts the statements a block of work issues. Budgets are
+only checked when PRINTSHOP_QUERY_BUDGET is set: "warn" prints the
+screens that go over, "strict" raises QueryBudgetExceeded so a test run
+fails on them.
+"""
+import os
+import threading
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import selectinload, joinedload
+from models import Job, PurchaseOrder, POItem
+
+BUDGET_ENV = "PRINTSHOP_QUERY_BUDGET"
+BUDGET_MODE = os.environ.get(BUDGET_ENV, "").lower()
+
+# Job card: the PO count badge
+JOB_CARD = [selectinload(Job.purchase_orders)]
+
+# Job editor: the job and its POs in one query
+JOB_EDITOR = [joinedload(Job.purchase_orders)]
+
+# PO card: the items and the jobs they are for
+_po_items = selectinload(PurchaseOrder.items)
+PO_CARD = [_po_items.joinedload(POItem.job) if hasattr(POItem, "job") else _po_items]
+
+# PO linked to jobs
+PO_JOBS = [selectinload(PurchaseOrder.jobs)]
+
+# Relationships each model's search result card reads
+CARD_PROFILES = {
+    Job: JOB_CARD,
+    PurchaseOrder: PO_CARD,
+}
+
+
+def card_options(model):
+    """Loader options for cards of model"""
+    return CARD_PROFILES.get(model, [])
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+# Budgets being counted on each thread
+_local = threading.local()
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for budget in getattr(_local, "budgets", ()):
+        budget.count += 1
+
+
+if BUDGET_MODE:
+    # Listening from the start: adding a listener while another thread runs a query isn't safe
+    event.listen(Engine, "before_cursor_execute", _count_statement)
+
+
+class QueryBudget:
+    """
+    with QueryBudget("job editor POs", 1): ...
+
+    Counts the statements issued on this thread inside the block and
+    reports the block if there were more than limit.
+    """
+    def __init__(self, label, limit):
+        self.label = label
+        self.limit = limit
+        self.count = 0
+
+    def __enter__(self):
+        if BUDGET_MODE:
+            if not hasattr(_local, "budgets"):
+                _local.budgets = []
+            _local.budgets.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not BUDGET_MODE:
+            return False
+        _local.budgets.remove(self)
+        if exc_type is None and self.count > self.limit:
+            message = f"{self.label} issued {self.count} queries (budget {self.limit})"
+            if BUDGET_MODE == "strict":
+                raise QueryBudgetExceeded(message)
+            print(f"Query budget: {message}")
+        return False
@@ -0,0 +1,153 @@
+"""
+Schema upkeep run at startup.
+
+The list pages filter on is_archived and sort on a date, the dashboard
+counts by status and the editors load line items by parent. INDEXES lists
+the indexes those queries need. Every start checks that they all exist
+and creates any that are missing (CREATE INDEX IF NOT EXISTS), so a
+database that was copied, restored or edited by hand is put right too.
+After creating indexes the query planner statistics are refreshed with
+ANALYZE.
+
+The table_revisions triggers (revisions.py) are checked the same way, and
+the document number sequences (numbering.py) are created and seeded. The
+full-text search index (search_index.py) is created and built the first
+time, with the triggers that keep it in sync.
+
+PRAGMA user_version records the schema version the database has been
+brought up to, for later migrations to build on.
+
+Print the query plan of each screen's main query with:
+
+    python migrations.py --explain
+"""
+import sys
+import time
+from sqlalchemy import text, func
+from sqlalchemy.dialects import sqlite
+from models import Job, Quote, Task, PurchaseOrder, Customer, Supplier, QuoteItem, POItem
+from revisions import ensure_revisions
+from numbering import ensure_sequences
+from search_index import ensure_search_index
+
+SCHEMA_VERSION = 1
+
+# (model, columns) - named ix_<table>_<columns>
+INDEXES = [
+    (Job, ["is_archived", "due_date"]),
+    (Job, ["is_archived", "status"]),
+    (Job, ["is_archived", "created_at"]),
+    (Quote, ["is_archived", "quote_date"]),
+    (Quote, ["is_archived", "status"]),
+    (Quote, ["is_archived", "created_at"]),
+    (Task, ["is_archived", "due_date"]),
+    (Task, ["is_archived", "status"]),
+    (Task, ["is_archived", "created_at"]),
+    (PurchaseOrder, ["is_archived", "created_at"]),
+    (PurchaseOrder, ["is_archived", "status"]),
+    (PurchaseOrder, ["is_archived", "due_date"]),
+    (Customer, ["is_archived", "company_name"]),
+    (Customer, ["is_archived", "status"]),
+    (Supplier, ["is_archived", "supplier_name"]),
+    (QuoteItem, ["quote_id"]),
+    (POItem, ["po_id"]),
+    (POItem, ["job_id"]),
+]
+
+
+def index_name(model, columns):
+    return f"ix_{model.__table__.name}_{'_'.join(columns)}"
+
+
+def _existing_indexes(connection):
+    return {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+
+
+def ensure_indexes(connection):
+    """Create any missing INDEXES; returns the names created"""
+    existing = _existing_indexes(connection)
+    created = []
+    for model, columns in INDEXES:
+        name = index_name(model, columns)
+        if name in existing:
+            continue
+        table = model.__table__
+        missing = [column for column in columns if column not in table.c]
+        if missing:
+            print(f"Skipping index {name}: {table.name} has no {', '.join(missing)}")
+            continue
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table.name} ({', '.join(columns)})"))
+        created.append(name)
+    return created
+
+
+def run_migrations(db):
+    """Bring the database behind db up to SCHEMA_VERSION and check its indexes"""
+    connection = db.connection()
+    if connection.dialect.name != "sqlite":
+        return
+
+    start = time.perf_counter()
+    try:
+        version = connection.execute(text("PRAGMA user_version")).scalar()
+        created = ensure_indexes(connection)
+        if created:
+            connection.execute(text("ANALYZE"))
+        triggers = ensure_revisions(connection) + ensure_search_index(connection)
+        sequences = ensure_sequences(connection)
+        if version < SCHEMA_VERSION:
+            connection.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Database migration failed: {e}")
+        return
+
+    if created or triggers or sequences or version < SCHEMA_VERSION:
+        print(f"Database schema {version} -> {SCHEMA_VERSION}, created {len(created)} indexes, "
+              f"{len(triggers)} triggers and {len(sequences)} number sequences in {time.perf_counter() - start:.2f}s")
+
+
+# (screen, query(db)) - the main query behind each screen
+SCREEN_QUERIES = [
+    ("Jobs", lambda db: db.query(Job).filter(Job.is_archived == False).order_by(Job.due_date)),
+    ("Quotes", lambda db: db.query(Quote).filter(Quote.is_archived == False).order_by(Quote.quote_date.desc())),
+    ("Tasks", lambda db: db.query(Task).filter(Task.is_archived == False).order_by(Task.due_date)),
+    ("Purchase Orders", lambda db: db.query(PurchaseOrder).filter(PurchaseOrder.is_archived == False)
+        .order_by(PurchaseOrder.created_at.desc())),
+    ("Customers", lambda db: db.query(Customer).filter(Customer.is_archived == False)),
+    ("Suppliers", lambda db: db.query(Supplier).filter(Supplier.is_archived == False)),
+    ("Dashboard job statuses", lambda db: db.query(Job.status, func.count()).filter(Job.is_archived == False)
+        .group_by(Job.status)),
+    ("Job archive", lambda db: db.query(Job).filter(Job.is_archived == True)
+        .order_by(Job.due_date.is_(None), Job.due_date.desc(), Job.id.desc()).limit(50)),
+    ("Customer search", lambda db: db.query(Customer).filter(Customer.is_archived == False,
+        Customer.company_name.like("%smith%") | Customer.email.like("%smith%"))),
+    ("Quote line items", lambda db: db.query(QuoteItem).filter(QuoteItem.quote_id == 1)),
+    ("PO line items", lambda db: db.query(POItem).filter(POItem.po_id == 1)),
+]
+
+
+def explain(db):
+    """Print EXPLAIN QUERY PLAN for each of SCREEN_QUERIES"""
+    dialect = sqlite.dialect(paramstyle="named")
+    for screen, build in SCREEN_QUERIES:
+        compiled = build(db).statement.compile(dialect=dialect)
+        print(f"{screen}:")
+        for _id, _parent, _unused, detail in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"), compiled.params):
+            print(f"    {detail}")
+
+
+if __name__ == "__main__":
+    if "--explain" not in sys.argv[1:]:
+        print(__doc__)
+        sys.exit(1)
+
+    from db_session import open_session
+
+    db = open_session()
+    try:
+        run_migrations(db)
+        explain(db)
+    finally:
+        db.close()
@@ -0,0 +1,158 @@
+"""
+Document numbers (JN000123, QN000045, TN..., CN..., PO00012).
+
+Every number series has a row in a small sequence table. A number is
+taken with a single UPDATE ... RETURNING on that row (an UPDATE then a
+SELECT on SQLite before 3.35), inside the same transaction as the insert
+that uses it, so two stations saving at the same time can never get the
+same number and a rolled back save gives its number back. The number
+columns also get unique indexes as a backstop.
+
+A station can instead reserve a block of numbers at a time (set
+PRINTSHOP_NUMBER_BLOCK to the block size). Each block is taken in its own
+short transaction, so saves never wait on the sequence row, at the cost
+of gaps and of numbers not being strictly in creation order across
+stations.
+
+The table is created at startup by migrations.run_migrations, and each
+sequence is seeded from the highest number already in use.
+"""
+import os
+import sqlite3
+import threading
+from sqlalchemy import text
+from models import Job, Quote, Task, PurchaseOrder, Customer
+
+TABLE_NAME = "document_sequences"
+
+# series -> (model, number column, prefix, digits)
+SEQUENCES = {
+    "job": (Job, "job_number", "JN", 6),
+    "quote": (Quote, "quote_number", "QN", 6),
+    "task": (Task, "task_number", "TN", 6),
+    "customer": (Customer, "customer_number", "CN", 6),
+    "purchase_order": (PurchaseOrder, "po_number", "PO", 5),
+}
+
+# Numbers reserved per block; 1 takes each number in the saving transaction
+BLOCK_ENV = "PRINTSHOP_NUMBER_BLOCK"
+
+CREATE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+        name TEXT PRIMARY KEY,
+        next_value INTEGER NOT NULL
+    )
+"""
+
+# (database URL, series) -> [next, end) of the block this station holds
+_blocks = {}
+_lock = threading.Lock()
+
+
+def format_number(name, value):
+    _model, _column, prefix, digits = SEQUENCES[name]
+    return f"{prefix}{value:0{digits}d}"
+
+
+def block_size():
+    try:
+        return max(1, int(os.environ.get(BLOCK_ENV, "1")))
+    except ValueError:
+        return 1
+
+
+def ensure_sequences(connection):
+    """
+    Create the sequence table, seed any missing series and add the unique
+    number indexes; returns the names of the series seeded. Run from
+    migrations.run_migrations, in its transaction.
+    """
+    if connection.dialect.name != "sqlite":
+        return []
+
+    connection.execute(text(CREATE_SQL))
+    existing = {row[0] for row in connection.execute(text(f"SELECT name FROM {TABLE_NAME}"))}
+    indexes = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    seeded = []
+    for name, (model, column, prefix, _digits) in SEQUENCES.items():
+        table = model.__table__.name
+        if name not in existing:
+            # Highest number already handed out by the old "latest + 1" code
+            connection.execute(
+                text(f"""
+                    INSERT OR IGNORE INTO {TABLE_NAME} (name, next_value)
+                    SELECT :name, coalesce(max(CAST(substr({column}, :start) AS INTEGER)), 0) + 1
+                    FROM {table}
+                    WHERE {column} GLOB :pattern
+                """),
+                {"name": name, "start": len(prefix) + 1, "pattern": f"{prefix}[0-9]*"}
+            )
+            seeded.append(name)
+
+        index = f"uq_{table}_{column}"
+        if index in indexes:
+            continue
+        duplicate = connection.execute(text(
+            f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL GROUP BY {column} HAVING count(*) > 1 LIMIT 1"
+        )).first()
+        if duplicate is not None:
+            # From before the allocator existed; numbering still works without the index
+            print(f"Could not add unique index on {table}.{column}: {duplicate[0]} is used more than once")
+            continue
+        connection.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({column})"))
+    return seeded
+
+
+def _has_returning(connection):
+    # RETURNING arrived in SQLite 3.35; older builds still ship with some Pythons
+    return connection.dialect.name != "sqlite" or sqlite3.sqlite_version_info >= (3, 35)
+
+
+def _take(connection, name, count):
+    """Advance the series by count and return the first value taken"""
+    params = {"name": name, "count": count}
+    if _has_returning(connection):
+        return connection.execute(
+            text(f"""
+                UPDATE {TABLE_NAME} SET next_value = next_value + :count
+                WHERE name = :name
+                RETURNING next_value - :count
+            """),
+            params
+        ).scalar_one()
+
+    # The UPDATE holds the write lock until commit, so the SELECT sees our own value
+    connection.execute(
+        text(f"UPDATE {TABLE_NAME} SET next_value = next_value + :count WHERE name = :name"), params
+    )
+    return connection.execute(
+        text(f"SELECT next_value - :count FROM {TABLE_NAME} WHERE name = :name"), params
+    ).scalar_one()
+
+
+def reserve_block(engine, name, size):
+    """Take size numbers for this station in their own transaction; returns (first, end)"""
+    with engine.begin() as connection:
+        first = _take(connection, name, size)
+    return first, first + size
+
+
+def next_number(db, name):
+    """
+    Allocate the next number of a series ("job", "quote", ...) for a row
+    about to be added in db. Call it before writing anything else in db.
+    """
+    engine = db.get_bind()
+    size = block_size()
+    if size == 1:
+        return format_number(name, _take(db.connection(), name, 1))
+
+    with _lock:
+        key = (str(engine.url), name)
+        block = _blocks.get(key)
+        if block is None or block[0] >= block[1]:
+            block = list(reserve_block(engine, name, size))
+            _blocks[key] = block
+        value = block[0]
+        block[0] += 1
+    return format_number(name, value)
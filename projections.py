@@ -0,0 +1,174 @@
+"""
+Compact rows for the list pages.
+
+The pages and their cards show a handful of fields per record. Loading
+whole entities kept every record's notes, descriptions and ORM state in
+memory for as long as the page was open. A projection row selects only
+the fields a page shows into a __slots__ object:
+
+    jobs = JobRow.all(db.query(Job).filter(...))
+
+Long text a card previews (a task's description, a supplier's services)
+is cut to PREVIEW_CHARS in the query. Editors and printing need the whole
+record; load_entity() and load_entities() fetch it by id when they open.
+"""
+import sys
+from sqlalchemy import func
+from models import Job, Quote, Task, PurchaseOrder, Customer, Supplier, POItem
+from db_session import session_scope
+
+# Characters of long text loaded for card previews (cards show up to ~60)
+PREVIEW_CHARS = 80
+
+# Ids per query when loading full entities
+LOAD_BATCH = 500
+
+
+class ProjectionRow:
+    """
+    Base for the rows. fields are read from the model's columns of the same
+    name unless previews lists them; computed slots are filled in after the
+    query. Strings in shared fields (statuses and the like, repeated across
+    thousands of rows) are interned so every row points at one copy.
+    """
+    __slots__ = ()
+    model = None
+    fields = ()
+    previews = ()
+    shared = ()
+    computed = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.fields, values):
+            if name in self.shared and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
+        for name in self.computed:
+            setattr(self, name, ())
+
+    @classmethod
+    def columns(cls):
+        return [
+            func.substr(getattr(cls.model, name), 1, PREVIEW_CHARS).label(name) if name in cls.previews
+            else getattr(cls.model, name)
+            for name in cls.fields
+        ]
+
+    @classmethod
+    def all(cls, query):
+        """Run query (over cls.model) selecting only the row fields"""
+        return [cls(*values) for values in query.with_entities(*cls.columns())]
+
+    @classmethod
+    def first(cls, query):
+        values = query.with_entities(*cls.columns()).first()
+        return None if values is None else cls(*values)
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.id}>"
+
+
+class JobRow(ProjectionRow):
+    fields = ("id", "job_number", "customer_name", "order_type", "due_date", "priority", "status",
+              "order_source", "assigned_to")
+    __slots__ = fields
+    model = Job
+    shared = ("order_type", "priority", "status", "order_source", "assigned_to")
+
+
+class QuoteRow(ProjectionRow):
+    fields = ("id", "quote_number", "customer_name", "quote_date", "expiry_date", "status", "total")
+    __slots__ = fields
+    model = Quote
+    shared = ("status",)
+
+
+class TaskRow(ProjectionRow):
+    fields = ("id", "task_number", "title", "description", "due_date", "priority", "status", "assigned_to")
+    __slots__ = fields
+    model = Task
+    previews = ("description",)
+    shared = ("priority", "status", "assigned_to")
+
+
+class PORow(ProjectionRow):
+    """linked_jobs holds 'job number - customer' for the jobs the PO's items are for"""
+    fields = ("id", "po_number", "supplier_name", "status", "due_date", "received_date", "created_at")
+    computed = ("linked_jobs",)
+    __slots__ = fields + computed
+    model = PurchaseOrder
+    shared = ("supplier_name", "status")
+
+    @classmethod
+    def all(cls, query):
+        rows = super().all(query)
+        if rows:
+            ids = query.order_by(None).with_entities(PurchaseOrder.id).scalar_subquery()
+            _add_linked_jobs(query.session, rows, ids)
+        return rows
+
+    @classmethod
+    def first(cls, query):
+        row = super().first(query)
+        if row is not None:
+            _add_linked_jobs(query.session, [row], [row.id])
+        return row
+
+
+def _add_linked_jobs(db, rows, po_ids):
+    labels = {}
+    query = (
+        db.query(POItem.po_id, POItem.job_id, Job.job_number, Job.customer_name)
+        .outerjoin(Job, Job.id == POItem.job_id)
+        .filter(POItem.po_id.in_(po_ids), POItem.job_id.isnot(None))
+        .order_by(POItem.po_id, POItem.id)
+    )
+    for po_id, job_id, job_number, customer_name in query:
+        label = f"{job_number} - {customer_name}" if job_number else f"Job #{job_id}"
+        labels.setdefault(po_id, {})[label] = None # Ordered set
+    for row in rows:
+        row.linked_jobs = tuple(labels.get(row.id, ()))
+
+
+class CustomerRow(ProjectionRow):
+    fields = ("id", "company_name", "contact_name", "email", "phone", "mobile", "status")
+    __slots__ = fields
+    model = Customer
+    shared = ("status",)
+
+
+class SupplierRow(ProjectionRow):
+    fields = ("id", "supplier_name", "contact_name", "email", "phone", "account_type", "services_supplies")
+    __slots__ = fields
+    model = Supplier
+    previews = ("services_supplies",)
+    shared = ("account_type",)
+
+
+def load_entity(obj):
+    """
+    The full entity behind a projection row, for an editor; None if it has
+    been deleted since. Entities are returned as they are.
+    """
+    if not isinstance(obj, ProjectionRow):
+        return obj
+    with session_scope() as db:
+        return db.get(obj.model, obj.id)
+
+
+def load_entities(rows):
+    """Full entities for rows of one model, in the same order, leaving out deleted ones"""
+    rows = list(rows)
+    if not rows or not isinstance(rows[0], ProjectionRow):
+        return rows
+    model = rows[0].model
+    ids = [row.id for row in rows]
+    loaded = {}
+    with session_scope() as db:
+        for start in range(0, len(ids), LOAD_BATCH):
+            for entity in db.query(model).filter(model.id.in_(ids[start:start + LOAD_BATCH])):
+                loaded[entity.id] = entity
+    return [loaded[entity_id] for entity_id in ids if entity_id in loaded]
@@ -0,0 +1,180 @@
+"""
+Per-table revision numbers, for noticing other stations' changes.
+
+table_revisions holds one counter per watched table, and triggers add one
+to it for every row inserted, updated or deleted, whoever writes it. A
+station compares the numbers with the ones it last saw to tell which
+tables changed; ui/change_detector.py only reads them when PRAGMA
+data_version says another connection has committed.
+
+This station's own writes are already shown through the change bus. The
+ORM events below note the revision each of its row writes produced (and
+note_writes() those of Core statements, which the events don't see), and
+changed_tables() leaves a table out when every revision since it last
+looked is one of those.
+"""
+import threading
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, object_session
+from models import POItem
+import search_index
+
+TABLE_NAME = "table_revisions"
+
+# Watched table -> the entity (change bus name) whose pages show it
+TABLES = {model.__table__.name: entity for entity, model, _fields in search_index.ENTITIES}
+TABLES[POItem.__table__.name] = "purchase_order" # Line items show on the PO cards
+
+# Session.info key for revisions this station wrote but hasn't committed
+PENDING_KEY = "pending_table_revisions"
+
+CREATE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+        table_name TEXT PRIMARY KEY,
+        revision INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+TRIGGER_SQL = """
+    CREATE TRIGGER IF NOT EXISTS {name} AFTER {kind} ON {table}
+    BEGIN
+        UPDATE {revisions} SET revision = revision + 1 WHERE table_name = '{table}';
+    END
+"""
+
+KINDS = ("insert", "update", "delete")
+
+# Whether the table exists, per database URL
+_available = {}
+
+
+def trigger_name(table, kind):
+    return f"trg_{table}_{kind}_revision"
+
+
+def _is_ready(connection):
+    key = str(connection.engine.url)
+    if key not in _available:
+        _available[key] = connection.dialect.name == "sqlite" and connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": TABLE_NAME}
+        ).first() is not None
+    return _available[key]
+
+
+def ensure_revisions(connection):
+    """Create the table and any missing triggers; returns the names of the triggers created"""
+    connection.execute(text(CREATE_SQL))
+    _available[str(connection.engine.url)] = True
+    connection.execute(
+        text(f"INSERT OR IGNORE INTO {TABLE_NAME} (table_name, revision) VALUES (:table, 0)"),
+        [{"table": table} for table in TABLES]
+    )
+    existing = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))}
+    created = []
+    for table in TABLES:
+        for kind in KINDS:
+            name = trigger_name(table, kind)
+            if name in existing:
+                continue
+            connection.execute(text(TRIGGER_SQL.format(name=name, kind=kind.upper(), table=table,
+                                                       revisions=TABLE_NAME)))
+            created.append(name)
+    return created
+
+
+def read_revisions(cursor):
+    """{table: revision} through a DB-API cursor"""
+    cursor.execute(f"SELECT table_name, revision FROM {TABLE_NAME}")
+    return {table: revision for table, revision in cursor.fetchall() if table in TABLES}
+
+
+# Revisions produced by this station's committed writes, per table
+_local_lock = threading.Lock()
+_local = {}
+
+
+def changed_tables(seen, current):
+    """
+    Tables whose revision moved from seen to current because of another
+    station (or a write outside the ORM). Forgets the local revisions up to
+    current.
+    """
+    changed = []
+    with _local_lock:
+        for table, revision in current.items():
+            ours = _local.get(table, set())
+            before = seen.get(table, revision)
+            if revision != before:
+                own = sum(1 for value in ours if before < value <= revision)
+                if revision - before != own:
+                    changed.append(table)
+            _local[table] = {value for value in ours if value > revision}
+    return changed
+
+
+def _read_revision(connection, table):
+    return connection.execute(
+        text(f"SELECT revision FROM {TABLE_NAME} WHERE table_name = :table"), {"table": table}
+    ).scalar()
+
+
+def _note_revision(connection, target):
+    # Our statement holds the write lock until commit, so the number is the one our row produced
+    table = target.__table__.name
+    revision = _read_revision(connection, table)
+    session = object_session(target)
+    if revision is not None and session is not None:
+        session.info.setdefault(PENDING_KEY, []).append((table, revision))
+
+
+def note_writes(session, table, count):
+    """
+    Note the revisions of count rows just written to table with Core
+    statements in session's transaction. The trigger added one per row, and
+    nobody else can write while we hold the lock, so they are the latest
+    count revisions.
+    """
+    if not count or table not in TABLES:
+        return
+    connection = session.connection()
+    if not _is_ready(connection):
+        return
+    revision = _read_revision(connection, table)
+    if revision is not None:
+        session.info.setdefault(PENDING_KEY, []).extend(
+            (table, value) for value in range(revision - count + 1, revision + 1)
+        )
+
+
+def _after_write(mapper, connection, target):
+    if _is_ready(connection):
+        _note_revision(connection, target)
+
+
+def _after_update(mapper, connection, target):
+    # Flushed objects without column changes issue no UPDATE, so the trigger didn't run
+    session = object_session(target)
+    if _is_ready(connection) and session is not None and session.is_modified(target, include_collections=False):
+        _note_revision(connection, target)
+
+
+def _after_commit(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    with _local_lock:
+        for table, revision in pending:
+            _local.setdefault(table, set()).add(revision)
+
+
+def _after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+for _model in list(search_index.ENTITY_MODELS.values()) + [POItem]:
+    event.listen(_model, "after_insert", _after_write)
+    event.listen(_model, "after_update", _after_update)
+    event.listen(_model, "after_delete", _after_write)
+
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,255 @@
+"""
+Full-text search index for the Search and Archive Search pages.
+
+One SQLite FTS5 table holds the searched fields of every job, quote, task,
+purchase order, customer and supplier. migrations.run_migrations creates
+it at startup, building it from the existing rows the first time, along
+with triggers that keep it in sync with every write - whichever station
+or program makes it - in the writer's own transaction. The rowid encodes
+entity and id, which keeps updates and deletes on the index a primary key
+lookup.
+
+Rebuild the index for an existing database with:
+
+    python search_index.py --rebuild
+"""
+import re
+import sys
+import time
+from sqlalchemy import Integer, or_, text
+from models import Job, Quote, Task, PurchaseOrder, Customer, Supplier
+
+TABLE_NAME = "search_index"
+
+# (entity, model, searched fields) - the same fields the Search page used to ILIKE.
+# The position in this list is part of the rowid, so only ever append.
+ENTITIES = [
+    ("job", Job, ["job_number", "customer_name", "order_type", "notes"]),
+    ("quote", Quote, ["quote_number", "customer_name", "notes"]),
+    ("task", Task, ["task_number", "title", "description", "assigned_to"]),
+    ("purchase_order", PurchaseOrder, ["po_number", "supplier_name", "notes"]),
+    ("customer", Customer, ["customer_number", "company_name", "contact_name", "email"]),
+    ("supplier", Supplier, ["supplier_name", "contact_name", "email", "services_supplies"]),
+]
+ENTITY_SLOTS = 8
+
+ENTITY_CODES = {entity: code for code, (entity, _model, _fields) in enumerate(ENTITIES)}
+ENTITY_MODELS = {entity: model for entity, model, _fields in ENTITIES}
+MODEL_ENTITIES = {model: entity for entity, model, _fields in ENTITIES}
+ENTITY_FIELDS = {entity: fields for entity, _model, fields in ENTITIES}
+
+CREATE_SQL = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE_NAME} USING fts5(
+        entity UNINDEXED,
+        entity_id UNINDEXED,
+        is_archived UNINDEXED,
+        content,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+"""
+
+TRIGGER_SQL = {
+    "insert": """
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER INSERT ON {table}
+        BEGIN
+            {insert_new}
+        END
+    """,
+    # Only when a searched field or the archive flag changes
+    "update": """
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER UPDATE OF {columns} ON {table}
+        BEGIN
+            DELETE FROM {index} WHERE rowid = OLD.id * {slots} + {code};
+            {insert_new}
+        END
+    """,
+    "delete": """
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM {index} WHERE rowid = OLD.id * {slots} + {code};
+        END
+    """,
+}
+
+# Database URLs whose index exists; a missing one is checked again each time
+_available = set()
+
+
+def _content_sql(fields, row=""):
+    """SQL for a row's indexed text: the fields joined by spaces, as the index stores them"""
+    return " || ' ' || ".join(f"coalesce({row}{field}, '')" for field in fields)
+
+
+def trigger_name(table, kind):
+    return f"trg_{table}_{kind}_search"
+
+
+def _index_exists(connection):
+    if connection.dialect.name != "sqlite":
+        return False
+    row = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": TABLE_NAME}
+    ).first()
+    return row is not None
+
+
+def index_available(db):
+    """Whether the database behind db has the index; if not, callers fall back to LIKE queries"""
+    connection = db.connection()
+    key = str(connection.engine.url)
+    if key not in _available and _index_exists(connection):
+        _available.add(key)
+    return key in _available
+
+
+def ensure_search_index(connection):
+    """
+    Create the index and any missing triggers, and build the index from the
+    existing rows when either was added (an index from before the triggers
+    may have missed other stations' writes). Returns the names of the
+    triggers created. Run from migrations.run_migrations, in its
+    transaction. Without FTS5 this prints why and changes nothing.
+    """
+    if connection.dialect.name != "sqlite":
+        return []
+
+    new_index = not _index_exists(connection)
+    if new_index:
+        try:
+            connection.execute(text(CREATE_SQL))
+        except Exception as e:
+            # No FTS5 in this SQLite build
+            print(f"Full-text search unavailable, using LIKE search: {e}")
+            return []
+
+    existing = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))}
+    created = []
+    for code, (entity, model, fields) in enumerate(ENTITIES):
+        table = model.__table__.name
+        insert_new = f"""
+            INSERT INTO {TABLE_NAME} (rowid, entity, entity_id, is_archived, content)
+            VALUES (NEW.id * {ENTITY_SLOTS} + {code}, '{entity}', NEW.id, coalesce(NEW.is_archived, 0),
+                    {_content_sql(fields, "NEW.")});
+        """
+        for kind, sql in TRIGGER_SQL.items():
+            name = trigger_name(table, kind)
+            if name in existing:
+                continue
+            connection.execute(text(sql.format(
+                name=name, table=table, index=TABLE_NAME, slots=ENTITY_SLOTS, code=code,
+                columns=", ".join(fields + ["is_archived"]), insert_new=insert_new
+            )))
+            created.append(name)
+
+    if new_index or created:
+        rebuild(connection)
+    return created
+
+
+def rebuild(connection):
+    """Repopulate the whole index from the entity tables"""
+    connection.execute(text(f"DELETE FROM {TABLE_NAME}"))
+    for code, (entity, model, fields) in enumerate(ENTITIES):
+        table = model.__table__.name
+        connection.execute(
+            text(f"""
+                INSERT INTO {TABLE_NAME} (rowid, entity, entity_id, is_archived, content)
+                SELECT id * {ENTITY_SLOTS} + {code}, :entity, id, coalesce(is_archived, 0), {_content_sql(fields)}
+                FROM {table}
+            """),
+            {"entity": entity}
+        )
+    connection.execute(text(f"INSERT INTO {TABLE_NAME} ({TABLE_NAME}) VALUES ('optimize')"))
+
+
+def build_match(query):
+    """Turn user input into an FTS5 query: every word must match as a prefix"""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def matching_ids(entity, query, archived=False):
+    """Select of the ids of one entity matching query, for model.id.in_(...)"""
+    return text(f"""
+        SELECT entity_id FROM {TABLE_NAME}
+        WHERE {TABLE_NAME} MATCH :match AND entity = :entity AND is_archived = :archived
+    """).bindparams(
+        match=build_match(query), entity=entity, archived=1 if archived else 0
+    ).columns(entity_id=Integer)
+
+
+def like_filter(entity, query):
+    """ILIKE filter over the indexed fields, for databases without FTS5"""
+    model = ENTITY_MODELS[entity]
+    return or_(*[getattr(model, field).ilike(f"%{query}%") for field in ENTITY_FIELDS[entity]])
+
+
+def search(db, query, entities=None, archived=False, limit=None):
+    """Return (entity, id) pairs matching query, best bm25 match first"""
+    match = build_match(query)
+    if not match:
+        return []
+
+    sql = f"""
+        SELECT entity, entity_id FROM {TABLE_NAME}
+        WHERE {TABLE_NAME} MATCH :match AND is_archived = :archived
+    """
+    params = {"match": match, "archived": 1 if archived else 0}
+    if entities:
+        names = ", ".join(f":entity_{i}" for i in range(len(entities)))
+        sql += f" AND entity IN ({names})"
+        params.update({f"entity_{i}": entity for i, entity in enumerate(entities)})
+    sql += f" ORDER BY bm25({TABLE_NAME})"
+    if limit:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+
+    return [(entity, int(entity_id)) for entity, entity_id in db.execute(text(sql), params)]
+
+
+def search_objects(db, query, entities=None, archived=False, limit=None, load_options=None):
+    """
+    Like search(), but loads the matching ORM objects, still in rank order,
+    with the loader options load_options(model) if given
+    """
+    hits = search(db, query, entities, archived, limit)
+
+    ids_by_entity = {}
+    for entity, entity_id in hits:
+        ids_by_entity.setdefault(entity, []).append(entity_id)
+
+    loaded = {}
+    for entity, ids in ids_by_entity.items():
+        model = ENTITY_MODELS[entity]
+        objects = db.query(model).filter(model.id.in_(ids))
+        if load_options:
+            objects = objects.options(*load_options(model))
+        for obj in objects:
+            loaded[(entity, obj.id)] = obj
+
+    return [loaded[hit] for hit in hits if hit in loaded]
+
+
+if __name__ == "__main__":
+    if "--rebuild" not in sys.argv[1:]:
+        print(__doc__)
+        sys.exit(1)
+
+    from db_session import open_session
+
+    db = open_session()
+    try:
+        start = time.perf_counter()
+        ensure_search_index(db.connection())
+        if index_available(db):
+            rebuild(db.connection())
+            db.commit()
+            count = db.execute(text(f"SELECT count(*) FROM {TABLE_NAME}")).scalar()
+            print(f"Rebuilt {TABLE_NAME}: {count} rows in {time.perf_counter() - start:.2f}s")
+        else:
+            print("Full-text search is not available for this database.")
+            sys.exit(1)
+    finally:
+        db.close()
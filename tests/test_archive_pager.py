@@ -0,0 +1,124 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("sqlalchemy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import search_index
+from models import Job, Customer
+from ui.archive_pager import ArchivePager
+
+
+@pytest.fixture(params=[False, True], ids=["like", "fts"])
+def db(request):
+    """An in-memory database with the searched tables; params: whether to use the search index"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    for model in search_index.ENTITY_MODELS.values():
+        model.__table__.create(engine)
+    use_index = request.param
+    if use_index:
+        with engine.begin() as connection:
+            if not search_index.ensure_search_index(connection):
+                pytest.skip("SQLite was built without FTS5")
+    session = Session(engine)
+    session.use_index = use_index
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_jobs(db, due_dates, customer_name="Acme Printing", is_archived=True):
+    jobs = [Job(job_number=f"J{len(due_dates)}-{i}", customer_name=customer_name, due_date=due_date,
+                is_archived=is_archived) for i, due_date in enumerate(due_dates)]
+    db.add_all(jobs)
+    db.commit()
+    return [job.id for job in jobs]
+
+
+def fetch_all(db, pager):
+    """Every page's ids, fetching until the pager stops"""
+    pages = []
+    while pager.can_fetch_more():
+        page = pager.fetch_more(db)
+        pages.append([row.id for row in page])
+        if not page:
+            break
+    return pages
+
+
+def make_pager(db, query="acme", entities=("job",), **kwargs):
+    return ArchivePager(query, list(entities), use_index=db.use_index, **kwargs)
+
+
+def test_ties_on_date_are_ordered_by_id(db):
+    ids = add_jobs(db, [date(2024, 5, 1)] * 10)
+    pages = fetch_all(db, make_pager(db, page_size=3))
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert sum(pages, []) == sorted(ids, reverse=True)
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 3, 4, 7])
+def test_null_dates_come_last_across_page_boundaries(db, page_size):
+    dated = add_jobs(db, [date(2024, 1, 1), date(2024, 3, 1), date(2024, 2, 1)])
+    undated = add_jobs(db, [None] * 4)
+    pages = fetch_all(db, make_pager(db, page_size=page_size))
+    assert all(len(page) <= page_size for page in pages)
+    assert sum(pages, []) == [dated[1], dated[2], dated[0]] + sorted(undated, reverse=True)
+
+
+def test_only_archived_matches(db):
+    wanted = add_jobs(db, [date(2024, 1, 1)])
+    add_jobs(db, [date(2024, 1, 2)], is_archived=False)
+    add_jobs(db, [date(2024, 1, 3)], customer_name="Other Co")
+    assert sum(fetch_all(db, make_pager(db)), []) == wanted
+
+
+def test_moves_on_to_the_next_entity(db):
+    job_ids = add_jobs(db, [date(2024, 1, 1), None])
+    customers = [Customer(company_name="Acme Printing", is_archived=True) for _ in range(3)]
+    db.add_all(customers)
+    db.commit()
+    pager = make_pager(db, entities=("job", "customer"), page_size=4)
+    page = pager.fetch_more(db)
+    assert [(type(row), row.id) for row in page] == (
+        [(Job, job_ids[0]), (Job, job_ids[1])]
+        + [(Customer, customer.id) for customer in reversed(customers)][:2]
+    )
+    assert [row.id for row in pager.fetch_more(db)] == [customers[0].id]
+    assert not pager.can_fetch_more()
+
+
+def test_stops_at_max_results(db):
+    ids = add_jobs(db, [date(2024, 1, day) for day in range(1, 26)])
+    pager = make_pager(db, page_size=4, max_results=10)
+    pages = fetch_all(db, pager)
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert sum(pages, []) == sorted(ids, reverse=True)[:10]
+    assert not pager.can_fetch_more()
+    assert pager.limit_reached()
+
+
+def test_limit_not_reached_when_matches_run_out(db):
+    add_jobs(db, [date(2024, 1, day) for day in range(1, 8)])
+    pager = make_pager(db, page_size=4, max_results=10)
+    assert [len(page) for page in fetch_all(db, pager)] == [4, 3]
+    assert not pager.can_fetch_more()
+    assert not pager.limit_reached()
+
+
+def test_query_without_words_matches_nothing(db):
+    if not db.use_index:
+        pytest.skip("only the index needs words")
+    add_jobs(db, [date(2024, 1, 1)])
+    pager = make_pager(db, query="-*")
+    assert not pager.can_fetch_more()
+    assert not pager.limit_reached()
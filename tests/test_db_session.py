@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_session
+from db_session import journal_mode
+
+_mount_type = db_session._mount_type
+
+MOUNTS = """\
+/dev/sda1 / ext4 rw,relatime 0 0
+proc /proc proc rw,nosuid,nodev,noexec,relatime 0 0
+//server/shop /mnt/shop cifs rw,relatime,vers=3.0 0 0
+server:/export /mnt/nfs nfs4 rw,relatime 0 0
+/dev/sdb1 /mnt/shop/local ext4 rw,relatime 0 0
+//server/my\\040docs /mnt/my\\040docs cifs rw 0 0
+"""
+
+
+@pytest.fixture
+def mounts(tmp_path, monkeypatch):
+    """Read mounts from MOUNTS instead of /proc/mounts"""
+    path = tmp_path / "mounts"
+    path.write_text(MOUNTS)
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setattr(db_session, "_mount_type", lambda p, mounts=str(path): _mount_type(p, mounts))
+    monkeypatch.delenv("PRINTSHOP_SQLITE_JOURNAL", raising=False)
+
+
+@pytest.mark.parametrize("path, mode", [
+    ("/home/shop/printshop.db", "WAL"),
+    ("/mnt/shop/printshop.db", "DELETE"),
+    ("/mnt/nfs/data/printshop.db", "DELETE"),
+    ("/mnt/shop/local/printshop.db", "WAL"), # A local disk mounted inside the share
+    ("/mnt/shopfloor/printshop.db", "WAL"),
+    ("/mnt/my docs/printshop.db", "DELETE"),
+    ("\\\\server\\shop\\printshop.db", "DELETE"),
+    ("//server/shop/printshop.db", "DELETE"),
+])
+def test_journal_mode_on_linux(mounts, path, mode):
+    assert journal_mode(path) == mode
+
+
+def test_journal_mode_on_windows(monkeypatch):
+    monkeypatch.delenv("PRINTSHOP_SQLITE_JOURNAL", raising=False)
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.setattr(db_session.os.path, "abspath", lambda path: path)
+    monkeypatch.setattr(db_session, "_drive_is_remote", lambda path: path.upper().startswith("Z:"))
+    assert journal_mode("C:\\PrintShop\\printshop.db") == "WAL"
+    assert journal_mode("Z:\\PrintShop\\printshop.db") == "DELETE"
+    assert journal_mode("\\\\server\\shop\\printshop.db") == "DELETE"
+
+
+def test_journal_mode_setting_wins(mounts, monkeypatch):
+    monkeypatch.setenv("PRINTSHOP_SQLITE_JOURNAL", "wal")
+    assert journal_mode("/mnt/shop/printshop.db") == "WAL"
+    monkeypatch.setenv("PRINTSHOP_SQLITE_JOURNAL", "truncate")
+    assert journal_mode("/home/shop/printshop.db") == "TRUNCATE"
+
+
+def test_unreadable_mounts_mean_local(tmp_path):
+    assert _mount_type("/mnt/shop/printshop.db", str(tmp_path / "missing")) is None
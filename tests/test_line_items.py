@@ -0,0 +1,172 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+import revisions
+import search_index
+from line_items import LineItem, PO_ITEM_FIELDS, diff_line_items, save_po_items, save_quote_items
+from models import POItem, QuoteItem
+
+FIELDS = ["description", "quantity"]
+
+
+def row(id, description, quantity=1):
+    return {"id": id, "description": description, "quantity": quantity}
+
+
+STORED = {1: ("Paper", 1), 2: ("Ink", 2), 3: ("Toner", 3)}
+
+
+def test_diff_unchanged():
+    rows = [row(1, "Paper"), row(2, "Ink", 2), row(3, "Toner", 3)]
+    assert diff_line_items(STORED, rows, FIELDS) == ([], [], [])
+
+
+def test_diff_reordered_lines_are_not_written():
+    rows = [row(3, "Toner", 3), row(1, "Paper"), row(2, "Ink", 2)]
+    assert diff_line_items(STORED, rows, FIELDS) == ([], [], [])
+
+
+def test_diff_edited():
+    rows = [row(1, "Paper"), row(2, "Ink", 5), row(3, "Black toner", 3)]
+    assert diff_line_items(STORED, rows, FIELDS) == ([], [rows[1], rows[2]], [])
+
+
+def test_diff_deleted():
+    rows = [row(2, "Ink", 2)]
+    assert diff_line_items(STORED, rows, FIELDS) == ([], [], [1, 3])
+
+
+def test_diff_added():
+    rows = [row(1, "Paper"), row(None, "Staples", 4), row(2, "Ink", 2), row(3, "Toner", 3)]
+    assert diff_line_items(STORED, rows, FIELDS) == ([{"description": "Staples", "quantity": 4}], [], [])
+
+
+def test_diff_unknown_id_is_added():
+    # A line deleted meanwhile (by another station) is written again rather than lost
+    rows = [row(1, "Paper"), row(2, "Ink", 2), row(3, "Toner", 3), row(9, "Glue")]
+    assert diff_line_items(STORED, rows, FIELDS) == ([{"description": "Glue", "quantity": 1}], [], [])
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(revisions, "_local", {})
+    engine = create_engine(f"sqlite:///{tmp_path / 'items.db'}")
+    for model in list(search_index.ENTITY_MODELS.values()) + [POItem, QuoteItem]:
+        model.__table__.create(engine)
+    with engine.begin() as connection:
+        revisions.ensure_revisions(connection)
+    yield engine
+    engine.dispose()
+
+
+def stored_items(engine, model, parent_column, parent_id):
+    """[(rowid, description, quantity, unit_price)] in rowid order"""
+    table = model.__table__
+    with engine.connect() as connection:
+        return [tuple(item) for item in connection.execute(
+            select(table.c.id, table.c.description, table.c.quantity, table.c.unit_price)
+            .where(table.c[parent_column] == parent_id).order_by(table.c.id)
+        )]
+
+
+def save(engine, rows, po_id=1):
+    with Session(engine) as db:
+        written = save_po_items(db, po_id, [item.as_row() for item in rows])
+        db.commit()
+    return written
+
+
+def load(engine, po_id=1):
+    with Session(engine) as db:
+        items = db.query(POItem).filter(POItem.po_id == po_id).order_by(POItem.id).all()
+        return [LineItem.from_record(item) for item in items]
+
+
+def revision(engine, table):
+    with engine.connect() as connection:
+        return revisions.read_revisions(connection.connection.cursor())[table]
+
+
+def test_save_new_lines(engine):
+    assert save(engine, [LineItem(description=" Paper ", quantity=2, unit_price=150), LineItem(description="Ink")])
+    assert stored_items(engine, POItem, "po_id", 1) == [(1, "Paper", 2, 150), (2, "Ink", 1, 0)]
+
+
+def test_save_unchanged_writes_nothing(engine):
+    save(engine, [LineItem(description="Paper"), LineItem(description="Ink")])
+    before = revision(engine, "po_items")
+    assert not save(engine, load(engine))
+    assert not save(engine, list(reversed(load(engine))))
+    assert revision(engine, "po_items") == before
+
+
+def test_save_writes_only_the_difference(engine):
+    save(engine, [LineItem(description=name) for name in ("Paper", "Ink", "Toner", "Glue")])
+    save(engine, [LineItem(description="Other PO")], po_id=2)
+    paper, ink, toner, glue = load(engine)
+    ink.quantity = 5
+    before = revision(engine, "po_items")
+
+    # Edit Ink, delete Toner, add Staples, keep Paper and Glue (moved)
+    assert save(engine, [glue, ink, LineItem(description="Staples"), paper])
+    assert stored_items(engine, POItem, "po_id", 1) == [
+        (1, "Paper", 1, 0), (2, "Ink", 5, 0), (4, "Glue", 1, 0), (6, "Staples", 1, 0),
+    ]
+    assert stored_items(engine, POItem, "po_id", 2) == [(5, "Other PO", 1, 0)]
+    # One trigger run per row written: an update, a delete and an insert
+    assert revision(engine, "po_items") == before + 3
+
+
+def test_save_quote_items(engine):
+    with Session(engine) as db:
+        save_quote_items(db, 7, [{"id": None, "description": "Flyers", "quantity": 100, "unit_price": 25,
+                                  "total": 2500}])
+        db.commit()
+    assert stored_items(engine, QuoteItem, "quote_id", 7) == [(1, "Flyers", 100, 25)]
+
+
+def test_own_saves_are_not_reported_as_remote_changes(engine):
+    save(engine, [LineItem(description=name) for name in ("Paper", "Ink", "Toner")])
+    seen = {"po_items": revision(engine, "po_items")}
+    paper, ink, toner = load(engine)
+    paper.quantity = 3
+    save(engine, [paper, ink, LineItem(description="Staples")])
+    current = {"po_items": revision(engine, "po_items")}
+    assert current["po_items"] == seen["po_items"] + 3
+    assert revisions.changed_tables(seen, current) == []
+
+
+def test_rolled_back_save_notes_nothing(engine):
+    with Session(engine) as db:
+        save_po_items(db, 1, [LineItem(description="Paper").as_row()])
+        db.rollback()
+    assert revisions._local == {}
+
+
+def test_other_writes_are_still_reported(engine):
+    save(engine, [LineItem(description="Paper")])
+    seen = {"po_items": revision(engine, "po_items")}
+    (paper,) = load(engine)
+    paper.quantity = 2
+    save(engine, [paper])
+    # Another station's write, straight to the table
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE po_items SET quantity = 9"))
+    current = {"po_items": revision(engine, "po_items")}
+    assert revisions.changed_tables(seen, current) == ["po_items"]
+
+
+def test_po_item_fields_round_trip(engine):
+    item = LineItem(description="Card", quantity=3, unit_price=199, is_stock=False, job_id=4)
+    save(engine, [item])
+    (loaded,) = load(engine)
+    assert [getattr(loaded, field) for field in PO_ITEM_FIELDS] == [getattr(item, field) for field in PO_ITEM_FIELDS]
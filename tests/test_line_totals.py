@@ -0,0 +1,86 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from line_totals import LineItemTotals
+
+
+def test_empty_order_is_zero():
+    totals = LineItemTotals(1000)
+    assert (totals.subtotal, totals.tax, totals.total) == (0, 0, 0)
+
+
+def test_reset_sums_the_lines():
+    totals = LineItemTotals(1000)
+    totals.reset([("a", 1250), ("b", 4999)])
+    assert totals.subtotal == 6249
+    assert totals.lines == {"a": 1250, "b": 4999}
+
+
+def test_reset_replaces_previous_lines():
+    totals = LineItemTotals()
+    totals.reset([("a", 100)])
+    totals.reset([("b", 300)])
+    assert totals.subtotal == 300
+    assert totals.lines == {"b": 300}
+
+
+def test_set_line_adds_then_replaces():
+    totals = LineItemTotals()
+    totals.set_line("a", 1000)
+    totals.set_line("b", 250)
+    assert totals.subtotal == 1250
+    totals.set_line("a", 400)
+    assert totals.subtotal == 650
+
+
+def test_remove_line():
+    totals = LineItemTotals()
+    totals.reset([("a", 1000), ("b", 250)])
+    totals.remove_line("a")
+    assert totals.subtotal == 250
+    totals.remove_line("missing")
+    assert totals.subtotal == 250
+
+
+def test_running_subtotal_matches_a_full_sum():
+    totals = LineItemTotals(1000)
+    lines = {}
+    for step in range(500):
+        key = step % 37
+        cents = (step * 7919) % 100000
+        totals.set_line(key, cents)
+        lines[key] = cents
+        if step % 11 == 0:
+            totals.remove_line(key)
+            del lines[key]
+    assert totals.subtotal == sum(lines.values())
+
+
+def test_tax_rounds_half_up_to_the_cent():
+    totals = LineItemTotals(1000) # 10%
+    totals.set_line("a", 1005) # 100.5 cents of tax
+    assert totals.tax == 101
+    totals.set_line("a", 1004) # 100.4 cents
+    assert totals.tax == 100
+
+
+def test_fractional_rate():
+    totals = LineItemTotals(825) # 8.25%
+    totals.set_line("a", 10000)
+    assert totals.tax == 825
+    assert totals.total == 10825
+
+
+def test_no_tax():
+    totals = LineItemTotals()
+    totals.set_line("a", 12345)
+    assert totals.tax == 0
+    assert totals.total == 12345
+
+
+def test_rate_text():
+    assert LineItemTotals(1000).rate_text == "10%"
+    assert LineItemTotals(825).rate_text == "8.25%"
+    assert LineItemTotals(0).rate_text == "0%"
@@ -0,0 +1,104 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+import loaders
+from loaders import QueryBudget, QueryBudgetExceeded, card_options
+from models import Job, POItem, PurchaseOrder
+from projections import PORow
+
+
+@pytest.fixture
+def budget_mode(monkeypatch):
+    """Turn on PRINTSHOP_QUERY_BUDGET for one test; returns a function setting the mode"""
+    listening = event.contains(Engine, "before_cursor_execute", loaders._count_statement)
+    if not listening:
+        event.listen(Engine, "before_cursor_execute", loaders._count_statement)
+
+    def set_mode(mode):
+        monkeypatch.setenv(loaders.BUDGET_ENV, mode)
+        monkeypatch.setattr(loaders, "BUDGET_MODE", mode)
+
+    set_mode("strict")
+    yield set_mode
+    if not listening:
+        event.remove(Engine, "before_cursor_execute", loaders._count_statement)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Five jobs, each with a PO of three items for it"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'loaders.db'}")
+    Job.metadata.create_all(engine)
+    with Session(engine) as db:
+        for i in range(5):
+            job = Job(job_number=f"JN{i:06d}", customer_name=f"Customer {i}")
+            po = PurchaseOrder(po_number=f"PO{i:05d}", supplier_name="Paper Co")
+            po.jobs.append(job)
+            db.add_all([job, po])
+            db.flush()
+            db.add_all([POItem(po_id=po.id, description=f"Item {n}", job_id=job.id) for n in range(3)])
+        db.commit()
+    with Session(engine) as db:
+        yield db
+    engine.dispose()
+
+
+def test_job_cards_stay_within_budget(budget_mode, db):
+    with QueryBudget("job cards", 2) as budget:
+        jobs = db.query(Job).options(*card_options(Job)).all()
+        badges = [len(job.purchase_orders) for job in jobs]
+    assert badges == [1] * 5
+    assert budget.count == 2
+
+
+def test_po_cards_stay_within_budget(budget_mode, db):
+    with QueryBudget("PO cards", 2):
+        pos = db.query(PurchaseOrder).options(*card_options(PurchaseOrder)).all()
+        jobs = [{item.job.job_number for item in po.items} for po in pos]
+    assert jobs == [{f"JN{i:06d}"} for i in range(5)]
+
+
+def test_po_rows_stay_within_budget(budget_mode, db):
+    with QueryBudget("PO page", 2):
+        rows = PORow.all(db.query(PurchaseOrder).order_by(PurchaseOrder.id))
+    assert [row.linked_jobs for row in rows] == [(f"JN{i:06d} - Customer {i}",) for i in range(5)]
+
+
+def test_lazy_loads_over_budget_raise(budget_mode, db):
+    with pytest.raises(QueryBudgetExceeded, match=r"lazy job cards issued 6 queries \(budget 2\)"):
+        with QueryBudget("lazy job cards", 2):
+            jobs = db.query(Job).all()
+            for job in jobs:
+                len(job.purchase_orders)
+
+
+def test_warn_mode_prints(budget_mode, db, capsys):
+    budget_mode("warn")
+    with QueryBudget("lazy job cards", 2):
+        for job in db.query(Job).all():
+            len(job.purchase_orders)
+    assert "Query budget: lazy job cards issued 6 queries (budget 2)" in capsys.readouterr().out
+
+
+def test_errors_are_not_reported_as_over_budget(budget_mode, db):
+    with pytest.raises(ZeroDivisionError):
+        with QueryBudget("failing load", 0):
+            db.query(Job).all()
+            1 / 0
+
+
+def test_budgets_off_by_default(db, monkeypatch):
+    monkeypatch.setattr(loaders, "BUDGET_MODE", "")
+    with QueryBudget("lazy job cards", 0) as budget:
+        db.query(Job).all()
+    assert budget.count == 0
@@ -0,0 +1,122 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("sqlalchemy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, Qt
+
+from ui.model_diff import sync_rows
+
+
+class FakeModel(QAbstractListModel):
+    """A list model over (key, value) rows that records the signals it emits"""
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = list(rows)
+        self.events = []
+        self.rowsAboutToBeRemoved.connect(lambda parent, first, last: self.events.append(("beginRemove", first, last)))
+        self.rowsRemoved.connect(lambda parent, first, last: self.events.append(("endRemove", first, last)))
+        self.rowsAboutToBeInserted.connect(lambda parent, first, last: self.events.append(("beginInsert", first, last)))
+        self.rowsInserted.connect(lambda parent, first, last: self.events.append(("endInsert", first, last)))
+        self.layoutChanged.connect(lambda *args: self.events.append(("layoutChanged",)))
+        self.dataChanged.connect(
+            lambda top_left, bottom_right, roles: self.events.append(("dataChanged", top_left.row(), bottom_right.row()))
+        )
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return self.rows[index.row()][1]
+        return None
+
+    def sync(self, new_rows):
+        sync_rows(self, self.rows, list(new_rows), key=lambda row: row[0], signature=lambda row: row)
+
+
+ROWS = [(1, "a"), (2, "b"), (3, "c"), (4, "d"), (5, "e")]
+
+
+def test_unchanged_rows_emit_nothing():
+    model = FakeModel(ROWS)
+    model.sync(ROWS)
+    assert model.rows == ROWS
+    assert model.events == []
+
+
+def test_insert():
+    model = FakeModel(ROWS)
+    new_rows = [(0, "z")] + ROWS[:2] + [(6, "f"), (7, "g")] + ROWS[2:]
+    model.sync(new_rows)
+    assert model.rows == new_rows
+    assert model.events == [
+        ("beginInsert", 0, 0), ("endInsert", 0, 0),
+        ("beginInsert", 3, 4), ("endInsert", 3, 4),
+    ]
+
+
+def test_remove():
+    model = FakeModel(ROWS)
+    new_rows = [ROWS[0], ROWS[3]]
+    model.sync(new_rows)
+    assert model.rows == new_rows
+    # Last run first, so the first run's positions are still valid
+    assert model.events == [
+        ("beginRemove", 4, 4), ("endRemove", 4, 4),
+        ("beginRemove", 1, 2), ("endRemove", 1, 2),
+    ]
+
+
+def test_reorder_moves_persistent_indexes():
+    model = FakeModel(ROWS)
+    persistent = {key: QPersistentModelIndex(model.index(i)) for i, (key, value) in enumerate(ROWS)}
+    new_rows = [ROWS[4], ROWS[2], ROWS[0], ROWS[1], ROWS[3]]
+    model.sync(new_rows)
+    assert model.rows == new_rows
+    assert model.events == [("layoutChanged",)]
+    assert {key: index.row() for key, index in persistent.items()} == {5: 0, 3: 1, 1: 2, 2: 3, 4: 4}
+
+
+def test_update():
+    model = FakeModel(ROWS)
+    new_rows = [(1, "a"), (2, "B"), (3, "C"), (4, "d"), (5, "E")]
+    model.sync(new_rows)
+    assert model.rows == new_rows
+    assert model.events == [("dataChanged", 1, 2), ("dataChanged", 4, 4)]
+
+
+def test_mixed_changes():
+    model = FakeModel(ROWS)
+    persistent = {key: QPersistentModelIndex(model.index(i)) for i, (key, value) in enumerate(ROWS)}
+    # Drop 2 and 4, move 5 to the front, add 6 and 7, change 3
+    new_rows = [(5, "e"), (6, "f"), (1, "a"), (3, "C"), (7, "g")]
+    model.sync(new_rows)
+    assert model.rows == new_rows
+    assert model.events == [
+        ("beginRemove", 3, 3), ("endRemove", 3, 3),
+        ("beginRemove", 1, 1), ("endRemove", 1, 1),
+        ("layoutChanged",),
+        ("beginInsert", 1, 1), ("endInsert", 1, 1),
+        ("beginInsert", 4, 4), ("endInsert", 4, 4),
+        ("dataChanged", 3, 3),
+    ]
+    assert not persistent[2].isValid()
+    assert not persistent[4].isValid()
+    assert {key: persistent[key].row() for key in (1, 3, 5)} == {5: 0, 1: 2, 3: 3}
+
+
+def test_each_signal_sees_a_consistent_row_count():
+    model = FakeModel(ROWS)
+    counts = []
+    model.rowsRemoved.connect(lambda *args: counts.append(model.rowCount()))
+    model.rowsInserted.connect(lambda *args: counts.append(model.rowCount()))
+    model.sync([(6, "f"), (5, "e"), (7, "g")])
+    assert model.rows == [(6, "f"), (5, "e"), (7, "g")]
+    # After removing 1..4 one row is left, then 6 and 7 go in one at a time
+    assert counts == [1, 2, 3]
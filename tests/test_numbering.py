@@ -0,0 +1,148 @@
+import os
+import sys
+import sqlite3
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import numbering
+from models import Job
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """A fresh database file with the numbered tables (blocks take their own connection)"""
+    monkeypatch.delenv(numbering.BLOCK_ENV, raising=False)
+    monkeypatch.setattr(numbering, "_blocks", {})
+    engine = create_engine(f"sqlite:///{tmp_path / 'numbers.db'}")
+    for model, _column, _prefix, _digits in numbering.SEQUENCES.values():
+        model.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def add_jobs(engine, *job_numbers):
+    with Session(engine) as db:
+        db.add_all([Job(job_number=job_number, customer_name="Acme") for job_number in job_numbers])
+        db.commit()
+
+
+def ensure(engine):
+    with engine.begin() as connection:
+        return numbering.ensure_sequences(connection)
+
+
+def indexes(engine):
+    with engine.connect() as connection:
+        return {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+
+
+def take(engine, name="job", count=1, commit=True):
+    numbers = []
+    with Session(engine) as db:
+        for _ in range(count):
+            numbers.append(numbering.next_number(db, name))
+        if commit:
+            db.commit()
+    return numbers
+
+
+@pytest.fixture(params=["returning", "update_then_select"])
+def allocator(request, monkeypatch):
+    """Run a test with UPDATE ... RETURNING and with the pre-3.35 UPDATE then SELECT"""
+    if request.param == "returning":
+        if sqlite3.sqlite_version_info < (3, 35):
+            pytest.skip("SQLite older than 3.35 has no RETURNING")
+    else:
+        monkeypatch.setattr(numbering, "_has_returning", lambda connection: False)
+    return request.param
+
+
+def test_format_number():
+    assert numbering.format_number("job", 123) == "JN000123"
+    assert numbering.format_number("purchase_order", 12) == "PO00012"
+
+
+def test_ensure_seeds_from_the_highest_number(engine):
+    add_jobs(engine, "JN000007", "JN000012", "JN000003", "legacy", None)
+    assert ensure(engine) == list(numbering.SEQUENCES)
+    with engine.connect() as connection:
+        values = dict(connection.execute(text(f"SELECT name, next_value FROM {numbering.TABLE_NAME}")).all())
+    assert values["job"] == 13
+    assert values["quote"] == 1
+
+
+def test_ensure_runs_once(engine):
+    ensure(engine)
+    take(engine, count=3)
+    assert ensure(engine) == []
+    assert take(engine) == ["JN000004"]
+
+
+def test_next_number(engine, allocator):
+    add_jobs(engine, "JN000041")
+    ensure(engine)
+    assert take(engine, count=3) == ["JN000042", "JN000043", "JN000044"]
+    assert take(engine, "purchase_order") == ["PO00001"]
+
+
+def test_rolled_back_save_gives_its_number_back(engine, allocator):
+    ensure(engine)
+    assert take(engine, commit=False) == ["JN000001"]
+    assert take(engine) == ["JN000001"]
+    assert take(engine) == ["JN000002"]
+
+
+def test_block_reservation(engine, allocator, monkeypatch):
+    ensure(engine)
+    monkeypatch.setenv(numbering.BLOCK_ENV, "5")
+    assert take(engine, count=2) == ["JN000001", "JN000002"]
+    # Another station reserves the next block meanwhile
+    assert numbering.reserve_block(engine, "job", 5) == (6, 11)
+    assert take(engine, count=4) == ["JN000003", "JN000004", "JN000005", "JN000011"]
+
+
+def test_block_survives_a_rolled_back_save(engine, monkeypatch):
+    ensure(engine)
+    monkeypatch.setenv(numbering.BLOCK_ENV, "3")
+    assert take(engine, commit=False) == ["JN000001"]
+    # The block was committed on its own; the rolled back number is a gap
+    assert take(engine) == ["JN000002"]
+    monkeypatch.setenv(numbering.BLOCK_ENV, "1")
+    assert take(engine) == ["JN000004"]
+
+
+def test_invalid_block_size_takes_single_numbers(monkeypatch):
+    monkeypatch.setenv(numbering.BLOCK_ENV, "lots")
+    assert numbering.block_size() == 1
+    monkeypatch.setenv(numbering.BLOCK_ENV, "0")
+    assert numbering.block_size() == 1
+
+
+def test_unique_indexes(engine):
+    ensure(engine)
+    assert "uq_jobs_job_number" in indexes(engine)
+    add_jobs(engine, "JN000001")
+    with pytest.raises(IntegrityError):
+        add_jobs(engine, "JN000001")
+
+
+def test_duplicates_skip_the_unique_index(engine, capsys):
+    add_jobs(engine, "JN000005", "JN000005", "JN000006")
+    ensure(engine)
+    assert "jobs.job_number: JN000005 is used more than once" in capsys.readouterr().out
+    assert "uq_jobs_job_number" not in indexes(engine)
+    assert "uq_quotes_quote_number" in indexes(engine)
+    # Numbering still works, and the index is added once the duplicate is fixed
+    assert take(engine) == ["JN000007"]
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE jobs SET job_number = 'JN000004' WHERE id = 1"))
+    ensure(engine)
+    assert "uq_jobs_job_number" in indexes(engine)
@@ -0,0 +1,150 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import search_index
+from search_index import build_match, like_filter
+from models import Job, Customer
+
+
+@pytest.mark.parametrize("query, match", [
+    ("acme", '"acme"*'),
+    ("  Acme   Print ", '"Acme"* "Print"*'),
+    ("o'brien", '"o"* "brien"*'),
+    ('"acme', '"acme"*'),
+    ('say "hi" there', '"say"* "hi"* "there"*'),
+    ("acme AND print", '"acme"* "AND"* "print"*'),
+    ("NOT acme", '"NOT"* "acme"*'),
+    ("acme OR", '"acme"* "OR"*'),
+    ("acme*", '"acme"*'),
+    ("-acme", '"acme"*'),
+    ("content:acme", '"content"* "acme"*'),
+    ("NEAR(a b)", '"NEAR"* "a"* "b"*'),
+    ("JN000123", '"JN000123"*'),
+    ("café", '"café"*'),
+])
+def test_build_match(query, match):
+    assert build_match(query) == match
+
+
+@pytest.mark.parametrize("query", ["", "   ", '"', "*", "-", "()", '" * -'])
+def test_build_match_without_words(query):
+    assert build_match(query) == ""
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A database with the searched tables, the index and its triggers"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Job.metadata.create_all(engine)
+    with engine.begin() as connection:
+        if not search_index.ensure_search_index(connection):
+            pytest.skip("SQLite was built without FTS5")
+    with Session(engine) as db:
+        db.add_all([
+            Job(job_number="JN000001", customer_name="Acme Printing", notes="Rush order AND a proof"),
+            Job(job_number="JN000002", customer_name="O'Brien & Sons", notes="Café menus"),
+            Job(job_number="JN000003", customer_name="Acme Printing", notes="-offset", is_archived=True),
+            Customer(company_name="Acme Printing", contact_name="Ann"),
+        ])
+        db.commit()
+        yield db
+    engine.dispose()
+
+
+def job_numbers(db, query, archived=False):
+    return sorted(
+        db.get(Job, entity_id).job_number
+        for entity, entity_id in search_index.search(db, query, ["job"], archived=archived)
+    )
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("acme", ["JN000001"]),
+    ("ac", ["JN000001"]),
+    ("acme print", ["JN000001"]),
+    ("acme menus", []),
+    ("JN000002", ["JN000002"]),
+    ("jn00000", ["JN000001", "JN000002"]),
+    ("o'brien", ["JN000002"]),
+    ("brien & sons", ["JN000002"]),
+    ('"acme', ["JN000001"]),
+    ("acme AND", ["JN000001"]), # AND is a word in the notes, not an operator
+    ("NOT acme", []),
+    ("acme*", ["JN000001"]),
+    ("-acme", ["JN000001"]),
+    ("cafe", ["JN000002"]),
+    ("CAFÉ", ["JN000002"]),
+    ("rush OR menus", []),
+])
+def test_match_against_the_index(db, query, expected):
+    assert job_numbers(db, query) == expected
+
+
+def test_archived_rows_are_searched_separately(db):
+    assert job_numbers(db, "acme", archived=True) == ["JN000003"]
+    assert job_numbers(db, "offset") == []
+
+
+def test_empty_query_searches_nothing(db):
+    assert search_index.search(db, "  ") == []
+    assert search_index.search(db, '"*-') == []
+
+
+def test_search_all_entities(db):
+    assert sorted(entity for entity, _id in search_index.search(db, "acme")) == ["customer", "job"]
+
+
+def test_triggers_follow_edits(db):
+    job = db.query(Job).filter(Job.job_number == "JN000002").one()
+    job.customer_name = "Zenith Print"
+    db.commit()
+    assert job_numbers(db, "brien") == []
+    assert job_numbers(db, "zenith") == ["JN000002"]
+    job.is_archived = True
+    db.commit()
+    assert job_numbers(db, "zenith") == []
+    assert job_numbers(db, "zenith", archived=True) == ["JN000002"]
+    db.delete(job)
+    db.commit()
+    assert job_numbers(db, "zenith", archived=True) == []
+
+
+def like_jobs(db, query):
+    rows = db.query(Job).filter(like_filter("job", query)).all()
+    return sorted(job.job_number for job in rows)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("acme", ["JN000001", "JN000003"]),
+    ("ACME PRINT", ["JN000001", "JN000003"]),
+    ("o'brien", ["JN000002"]),
+    ("AND a proof", ["JN000001"]), # Any one field, as typed
+    ("000002", ["JN000002"]),
+    ("-offset", ["JN000003"]),
+    ("acme menus", []),
+])
+def test_like_filter(db, query, expected):
+    assert like_jobs(db, query) == expected
+
+
+def test_like_filter_searches_each_entitys_fields(db):
+    rows = db.query(Customer).filter(like_filter("customer", "ann")).all()
+    assert [row.company_name for row in rows] == ["Acme Printing"]
+
+
+def test_index_available(db):
+    search_index._available.clear()
+    assert search_index.index_available(db)
+    db.execute(text(f"DROP TABLE {search_index.TABLE_NAME}"))
+    db.commit()
+    search_index._available.clear()
+    assert not search_index.index_available(db)
@@ -0,0 +1,108 @@
+from sqlalchemy import and_, or_
+import search_index
+
+# Results per fetch (ten rows of four cards)
+ARCHIVE_PAGE_SIZE = 40
+
+# Most results one search hands out; older ones need a narrower search
+ARCHIVE_MAX_RESULTS = 600
+
+# Column archived results are ordered by, newest first (then id). Customers
+# and suppliers have no meaningful date, so they are ordered by id alone.
+ARCHIVE_ORDER = {
+    "job": "due_date",
+    "quote": "quote_date",
+    "task": "due_date",
+    "purchase_order": "created_at",
+    "customer": None,
+    "supplier": None,
+}
+
+
+class ArchivePager:
+    """
+    Keyset pagination over archived search results.
+
+    Walks the requested entity types one after the other, each ordered by
+    date then id (newest first, undated last). Only the position of the
+    last row handed out is kept, so every page is an index range scan
+    however deep into the archive it is. load_options(model) gives the
+    loader options the rows are loaded with.
+
+    At most max_results rows are handed out, which bounds the cards the
+    Search page holds. limit_reached() then tells whether there may be
+    older matches that a narrower search would find.
+    """
+    def __init__(self, query, entities=None, use_index=True, page_size=ARCHIVE_PAGE_SIZE, load_options=None,
+                 max_results=ARCHIVE_MAX_RESULTS):
+        self.query = query
+        self.load_options = load_options
+        self.entities = list(entities or search_index.ENTITY_MODELS)
+        self.use_index = use_index
+        self.page_size = page_size
+        self.max_results = max_results
+        self.fetched = 0
+        self.cursor = None # (date, id) of the last row of the current entity
+
+        # Nothing can match a query without words
+        if use_index and not search_index.build_match(query):
+            self.entities = []
+
+    def can_fetch_more(self):
+        return bool(self.entities) and self.fetched < self.max_results
+
+    def limit_reached(self):
+        """Whether fetching stopped at max_results rather than at the end of the matches"""
+        return bool(self.entities) and self.fetched >= self.max_results
+
+    def fetch_more(self, db):
+        """Return the next page of results, moving on to the next entity type when one runs out"""
+        results = []
+        page_size = min(self.page_size, self.max_results - self.fetched)
+        while self.entities and len(results) < page_size:
+            wanted = page_size - len(results)
+            rows = self._page(db, self.entities[0], wanted)
+            results.extend(rows)
+            if len(rows) < wanted:
+                # Exhausted this entity type
+                self.entities.pop(0)
+                self.cursor = None
+            else:
+                self.cursor = self._position(self.entities[0], rows[-1])
+        self.fetched += len(results)
+        return results
+
+    def _position(self, entity, row):
+        column = ARCHIVE_ORDER[entity]
+        return (getattr(row, column) if column else None, row.id)
+
+    def _page(self, db, entity, limit):
+        model = search_index.ENTITY_MODELS[entity]
+        if self.use_index:
+            match = model.id.in_(search_index.matching_ids(entity, self.query, archived=True))
+        else:
+            match = search_index.like_filter(entity, self.query)
+        query = db.query(model).filter(model.is_archived == True, match)
+        if self.load_options:
+            query = query.options(*self.load_options(model))
+
+        column = ARCHIVE_ORDER[entity]
+        if column is None:
+            if self.cursor:
+                query = query.filter(model.id < self.cursor[1])
+            query = query.order_by(model.id.desc())
+        else:
+            date = getattr(model, column)
+            if self.cursor:
+                last_date, last_id = self.cursor
+                if last_date is None:
+                    query = query.filter(date.is_(None), model.id < last_id)
+                else:
+                    query = query.filter(or_(
+                        date < last_date,
+                        and_(date == last_date, model.id < last_id),
+                        date.is_(None)
+                    ))
+            query = query.order_by(date.is_(None), date.desc(), model.id.desc())
+
+        return query.limit(limit).all()
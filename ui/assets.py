@@ -1,9 +1,10 @@
 import os
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor
+from collections import OrderedDict
+from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor, QGuiApplication
 import qtawesome as qta
 
 from PySide6.QtMultimedia import QSoundEffect
-from PySide6.QtCore import QUrl
+from PySide6.QtCore import Qt, QUrl
 
 # Path to assets directory
 ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
@@ -11,66 +12,186 @@ ICONS_DIR = os.path.join(ASSETS_DIR, "icons")
 IMAGES_DIR = os.path.join(ASSETS_DIR, "images")
 SOUNDS_DIR = os.path.join(ASSETS_DIR, "sounds")
 
-def get_icon(name, color=None):
+# Extra icon set on the design workstation; local assets take priority
+GOOGLE_ICONS_DIR = r"C:\Users\PC\Downloads\Antigravity\Assets\Google Icons"
+
+# Maximum number of distinct (name, color, size, dpr) icons kept in memory
+ICON_CACHE_SIZE = 512
+
+_icon_manifest = None
+_icon_cache = OrderedDict()
+_icon_cache_stats = {"hits": 0, "misses": 0}
+
+def _scan_icon_dir(directory):
+    """Map icon names to PNG paths for a single directory"""
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return {}
+    return {
+        entry[:-4]: os.path.join(directory, entry)
+        for entry in entries if entry.lower().endswith(".png")
+    }
+
+def build_icon_manifest():
+    """
+    Scan the icon directories once and remember every PNG found.
+    Called automatically on first use; call again if icons change on disk.
+    """
+    global _icon_manifest
+    manifest = _scan_icon_dir(GOOGLE_ICONS_DIR)
+    manifest.update(_scan_icon_dir(ICONS_DIR))
+    _icon_manifest = manifest
+    _icon_cache.clear()
+    return manifest
+
+def _colorized_pixmap(path, color, size, dpr):
+    """Load a PNG and paint it in a single color"""
+    pixmap = QPixmap(path)
+    if size:
+        pixmap = pixmap.scaled(int(size * dpr), int(size * dpr), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pixmap.setDevicePixelRatio(dpr)
+    painter = QPainter(pixmap)
+    painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+    painter.fillRect(pixmap.rect(), QColor(color))
+    painter.end()
+    return pixmap
+
+def _load_icon(name, color, size, dpr):
+    path = _icon_manifest.get(name)
+    if path:
+        if color:
+            return QIcon(_colorized_pixmap(path, color, size, dpr))
+        return QIcon(path)
+    
+    # Fallback to qtawesome
+    if color:
+        return qta.icon(name, color=color)
+    return qta.icon(name)
+
+def get_icon(name, color=None, size=None):
     """
     Load an icon by name.
     First checks for a local PNG in assets/icons.
     Then checks in Google Icons directory.
     If not found, falls back to qtawesome (FontAwesome).
+    Icons are cached, so repeated calls never touch the filesystem.
     
     Args:
         name (str): Filename (without extension) or FontAwesome name (e.g. "fa5s.home")
-        color (str): Hex color for FontAwesome icons. Ignored for PNGs.
+        color (str): Hex color used to tint the icon.
+        size (int): Optional logical size to pre-render colorized PNGs at.
     """
-    # Check for local PNG in assets/icons first
-    png_path = os.path.join(ICONS_DIR, f"{name}.png")
-    if os.path.exists(png_path):
-        if color:
-            # Manually colorize the PNG
-            pixmap = QPixmap(png_path)
-            painter = QPainter(pixmap)
-            painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
-            painter.fillRect(pixmap.rect(), QColor(color))
-            painter.end()
-            return QIcon(pixmap)
-        return QIcon(png_path)
+    if _icon_manifest is None:
+        build_icon_manifest()
     
-    # Check for Google Icons
-    google_icons_dir = r"C:\Users\PC\Downloads\Antigravity\Assets\Google Icons"
-    google_icon_path = os.path.join(google_icons_dir, f"{name}.png")
-    if os.path.exists(google_icon_path):
-        if color:
-            # Manually colorize the PNG
-            pixmap = QPixmap(google_icon_path)
-            painter = QPainter(pixmap)
-            painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
-            painter.fillRect(pixmap.rect(), QColor(color))
-            painter.end()
-            return QIcon(pixmap)
-        return QIcon(google_icon_path)
-        
-    # Fallback to qtawesome
-    if color:
-        return qta.icon(name, color=color)
-    return qta.icon(name)
+    app = QGuiApplication.instance()
+    dpr = app.devicePixelRatio() if app else 1.0
+    key = (name, color, size, dpr)
+    
+    icon = _icon_cache.get(key)
+    if icon is not None:
+        _icon_cache_stats["hits"] += 1
+        _icon_cache.move_to_end(key)
+        return icon
+    
+    _icon_cache_stats["misses"] += 1
+    icon = _load_icon(name, color, size, dpr)
+    _icon_cache[key] = icon
+    if len(_icon_cache) > ICON_CACHE_SIZE:
+        _icon_cache.popitem(last=False)
+    return icon
+
+def icon_cache_stats():
+    """Return hit/miss counters for the icon cache"""
+    return {
+        "hits": _icon_cache_stats["hits"],
+        "misses": _icon_cache_stats["misses"],
+        "cached": len(_icon_cache),
+        "manifest": len(_icon_manifest or {}),
+    }
 
 def get_image_path(name):
     """Get absolute path to an image in assets/images"""
     return os.path.join(IMAGES_DIR, name)
 
+# Reusable effects kept per sound so overlapping plays don't allocate
+SOUND_POOL_SIZE = 3
+
+class SoundManager:
+    """
+    Loads each sound effect once and plays it from a small pool.
+    Sounds are decoded on first use, or up front with preload().
+    """
+    def __init__(self, pool_size=SOUND_POOL_SIZE, volume=0.5):
+        self.pool_size = pool_size
+        self.volume = volume
+        self._paths = None
+        self._pools = {}
+        self._next = {}
+
+    def _sound_paths(self):
+        """Map sound names to WAV paths, scanning assets/sounds once"""
+        if self._paths is None:
+            try:
+                entries = os.listdir(SOUNDS_DIR)
+            except OSError:
+                entries = []
+            self._paths = {
+                entry[:-4]: os.path.join(SOUNDS_DIR, entry)
+                for entry in entries if entry.lower().endswith(".wav")
+            }
+        return self._paths
+
+    def _pool(self, name):
+        pool = self._pools.get(name)
+        if pool is None:
+            path = self._sound_paths().get(name)
+            if path is None:
+                return None
+            url = QUrl.fromLocalFile(path)
+            pool = []
+            for _ in range(self.pool_size):
+                effect = QSoundEffect()
+                effect.setSource(url)
+                effect.setVolume(self.volume)
+                pool.append(effect)
+            self._pools[name] = pool
+            self._next[name] = 0
+        return pool
+
+    def preload(self, names=None):
+        """Decode sounds ahead of time (every sound in assets/sounds by default)"""
+        for name in names or list(self._sound_paths()):
+            self._pool(name)
+
+    def play(self, name):
+        pool = self._pool(name)
+        if not pool:
+            return None
+        # Round-robin, so a busy pool restarts the effect that started longest ago
+        index = self._next[name]
+        self._next[name] = (index + 1) % len(pool)
+        effect = pool[index]
+        if effect.isPlaying():
+            effect.stop()
+        effect.play()
+        return effect
+
+_sound_manager = None
+
+def get_sound_manager():
+    """Return the shared SoundManager, creating it on first use"""
+    global _sound_manager
+    if _sound_manager is None:
+        _sound_manager = SoundManager()
+    return _sound_manager
+
 def play_sound(name):
     """
     Play a sound effect from assets/sounds.
     Args:
         name (str): Filename without extension (e.g. "select")
+    Returns the QSoundEffect playing the sound, or None if it doesn't exist.
     """
-    path = os.path.join(SOUNDS_DIR, f"{name}.wav")
-    if os.path.exists(path):
-        effect = QSoundEffect()
-        effect.setSource(QUrl.fromLocalFile(path))
-        effect.setVolume(0.5)
-        effect.play()
-        # Keep reference to prevent garbage collection while playing
-        # In a real app, we might want a SoundManager class to handle this better
-        return effect 
-    return None
+    return get_sound_manager().play(name)
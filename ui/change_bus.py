@@ -0,0 +1,81 @@
+from PySide6.QtCore import QObject, Signal
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from models import POItem
+import search_index
+
+# Session.info key for changes flushed but not committed yet
+PENDING_KEY = "pending_entity_changes"
+
+
+class ChangeBus(QObject):
+    """
+    Application-wide notifications of committed entity changes.
+
+    entity_changed(entity, id, kind) is emitted once per changed row after
+    its transaction commits; entity is one of the search_index entity names
+    ("job", "quote", ...) and kind is "insert", "update" or "delete". Commits
+    made on worker threads are delivered to widgets on the UI thread.
+    """
+    entity_changed = Signal(str, int, str)
+
+
+_change_bus = None
+
+
+def get_change_bus():
+    """The bus singleton; first called from the main window so it lives on the UI thread"""
+    global _change_bus
+    if _change_bus is None:
+        _change_bus = ChangeBus()
+    return _change_bus
+
+
+def record_change(session, entity, entity_id, kind="update"):
+    """Queue a change for after session commits; for writes that bypass the ORM events"""
+    if session is None or entity_id is None:
+        return
+    pending = session.info.setdefault(PENDING_KEY, {})
+    previous = pending.get((entity, entity_id))
+    if previous == "insert" and kind == "update":
+        return # Still an insert as far as anyone else can tell
+    if previous == "insert" and kind == "delete":
+        del pending[(entity, entity_id)] # Never visible outside the transaction
+        return
+    pending[(entity, entity_id)] = kind
+
+
+def _make_listener(kind):
+    def listener(mapper, connection, target):
+        entity = search_index.MODEL_ENTITIES[mapper.class_]
+        record_change(object_session(target), entity, target.id, kind)
+    return listener
+
+
+def _po_item_changed(mapper, connection, target):
+    # Line items show on the PO card, so report them as a change to their PO
+    record_change(object_session(target), "purchase_order", target.po_id, "update")
+
+
+def _after_commit(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    bus = get_change_bus()
+    for (entity, entity_id), kind in pending.items():
+        bus.entity_changed.emit(entity, entity_id, kind)
+
+
+def _after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+for _entity, _model, _fields in search_index.ENTITIES:
+    for _kind in ("insert", "update", "delete"):
+        event.listen(_model, f"after_{_kind}", _make_listener(_kind))
+
+for _kind in ("insert", "update", "delete"):
+    event.listen(POItem, f"after_{_kind}", _po_item_changed)
+
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,108 @@
+import sqlite3
+from PySide6.QtCore import QObject, QTimer, QEvent, Signal
+from db_session import get_engine
+import revisions
+
+# How often to ask SQLite whether another connection has committed
+POLL_INTERVAL_MS = 2000
+
+
+class ChangeDetector(QObject):
+    """
+    Notices commits other stations make to the shared database.
+
+    A timer polls PRAGMA data_version on a connection of its own. That reads
+    no pages and only changes when another connection has committed, so an
+    idle database costs nothing more; only then are the table revisions
+    (revisions.py) read. entities_changed(entities) lists the entities
+    (change bus names) with changes this station didn't make.
+    """
+    entities_changed = Signal(list)
+
+    def __init__(self, interval_ms=POLL_INTERVAL_MS):
+        super().__init__()
+        self.connection = None
+        self.data_version = None
+        self.revisions = {}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+
+        url = get_engine().url
+        if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+            return # Only this station's changes are shown, through the change bus
+
+        try:
+            # Autocommit so no read transaction stays open between polls, and never wait on a writer
+            self.connection = sqlite3.connect(url.database, timeout=0, isolation_level=None)
+            cursor = self.connection.cursor()
+            try:
+                self.data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+                self.revisions = revisions.read_revisions(cursor)
+            finally:
+                cursor.close()
+        except sqlite3.Error as e:
+            print(f"Change detection disabled: {e}")
+            self.connection = None
+            return
+        self.timer.start()
+
+    def poll(self):
+        cursor = self.connection.cursor()
+        try:
+            version = cursor.execute("PRAGMA data_version").fetchone()[0]
+            if version == self.data_version:
+                return
+            current = revisions.read_revisions(cursor)
+        except sqlite3.Error:
+            return # Locked by a writer (rollback journal); try again on the next tick
+        finally:
+            cursor.close()
+
+        self.data_version = version
+        changed = revisions.changed_tables(self.revisions, current)
+        self.revisions = current
+        entities = sorted({revisions.TABLES[table] for table in changed})
+        if entities:
+            self.entities_changed.emit(entities)
+
+
+_change_detector = None
+
+
+def get_change_detector():
+    """The detector singleton; first called from the main window so it lives on the UI thread"""
+    global _change_detector
+    if _change_detector is None:
+        _change_detector = ChangeDetector()
+    return _change_detector
+
+
+class PageRefresher(QObject):
+    """
+    Reloads a page when other stations change the entities it shows: at
+    once if the page is on screen, otherwise the next time it is shown.
+    """
+    def __init__(self, page, entities, refresh):
+        super().__init__(page)
+        self.page = page
+        self.entities = set(entities)
+        self.refresh = refresh
+        self.stale = False
+        page.installEventFilter(self)
+        get_change_detector().entities_changed.connect(self.on_entities_changed)
+
+    def on_entities_changed(self, entities):
+        if self.entities.isdisjoint(entities):
+            return
+        if self.page.isVisible():
+            self.refresh()
+        else:
+            self.stale = True
+
+    def eventFilter(self, watched, event):
+        if watched is self.page and event.type() == QEvent.Show and self.stale:
+            self.stale = False
+            self.refresh()
+        return False
@@ -0,0 +1,91 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+from PySide6.QtCore import QObject, QTimer, Signal
+from ui.data_service import get_data_service
+from ui.change_bus import get_change_bus
+from ui.change_detector import get_change_detector
+import counters
+
+# A save can commit several rows at once, so reload once they have all arrived
+RELOAD_DELAY_MS = 300
+
+# Reload this long after midnight, when the due-date buckets roll over
+MIDNIGHT_GRACE_MS = 1000
+
+
+class CounterBoard(QObject):
+    """
+    The entity_counters table (counters.py) for the page headers and the
+    dashboard. counts(entity) answers from memory; changed is emitted after
+    every reload. Reloads follow committed changes (this station's and, via
+    the change detector, other stations') and midnight, when the first read
+    of the day rebuilds the due-date buckets.
+    """
+    changed = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._counts = {}
+        self.call = None
+
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(RELOAD_DELAY_MS)
+        self.reload_timer.timeout.connect(self.reload)
+
+        self.midnight_timer = QTimer(self)
+        self.midnight_timer.setSingleShot(True)
+        self.midnight_timer.timeout.connect(self.on_midnight)
+        self.schedule_midnight()
+
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+        get_change_detector().entities_changed.connect(self.on_entities_changed)
+        self.reload()
+
+    def counts(self, entity):
+        """Counter of counter name -> active rows for entity ("job", "task", ...)"""
+        return self._counts.get(entity) or Counter()
+
+    def on_entity_changed(self, entity, entity_id, kind):
+        if entity in counters.ENTITY_NAMES:
+            self.reload_timer.start()
+
+    def on_entities_changed(self, entities):
+        if not set(counters.ENTITY_NAMES).isdisjoint(entities):
+            self.reload_timer.start()
+
+    def reload(self):
+        if self.call is not None:
+            self.call.cancel()
+        self.call = get_data_service().run(counters.read_counts, label="counters", commit=True)
+        self.call.finished.connect(self.apply_counts)
+        self.call.failed.connect(self.on_load_failed)
+
+    def apply_counts(self, counts):
+        self.call = None
+        self._counts = counts
+        self.changed.emit()
+
+    def on_load_failed(self, message):
+        # Keep the last counts; the next change or midnight reloads
+        self.call = None
+
+    def schedule_midnight(self):
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        self.midnight_timer.start(int((midnight - now).total_seconds() * 1000) + MIDNIGHT_GRACE_MS)
+
+    def on_midnight(self):
+        self.schedule_midnight()
+        self.reload()
+
+
+_counter_board = None
+
+
+def get_counter_board():
+    """The board singleton; first called from the main window so it lives on the UI thread"""
+    global _counter_board
+    if _counter_board is None:
+        _counter_board = CounterBoard()
+    return _counter_board
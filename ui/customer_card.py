@@ -2,6 +2,7 @@ from PySide6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushBu
 from PySide6.QtCore import Qt, Signal, QSize, QUrl
 from PySide6.QtGui import QDesktopServices
 from ui.assets import get_icon
+from ui.theme import status_key, styled
 from models import Customer
 
 class CustomerCardWidget(QFrame):
@@ -15,26 +16,8 @@ class CustomerCardWidget(QFrame):
         self.setFixedWidth(280)
         self.setFixedHeight(180)
         
-        # Card background
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: #D5EEF2;
-                border: 1px solid #B8D8DD;
-                border-radius: 8px;
-            }}
-            QLabel {{ border: none; background: transparent; }}
-            QPushButton {{
-                border: none;
-                background: transparent;
-                color: #2c3e50;
-                font-size: 11px;
-                padding: 4px 8px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(0, 0, 0, 0.05);
-                border-radius: 4px;
-            }}
-        """)
+        # Colours come from the application theme (ui/theme.py)
+        styled(self, "card", kind="customer")
         
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(12, 12, 12, 12)
@@ -45,29 +28,25 @@ class CustomerCardWidget(QFrame):
         left_layout.setSpacing(4)
         
         # Company Name
-        company = QLabel(customer.company_name)
-        company.setStyleSheet("font-weight: bold; font-size: 14px; color: #2c3e50;")
+        company = styled(QLabel(customer.company_name), "cardTitle")
         company.setWordWrap(True)
         left_layout.addWidget(company)
         
         # Contact Name
         if customer.contact_name:
-            contact = QLabel(customer.contact_name)
-            contact.setStyleSheet("color: #546E7A; font-size: 12px;")
+            contact = styled(QLabel(customer.contact_name), "cardContact")
             left_layout.addWidget(contact)
         
         # Email
         if customer.email:
-            email = QLabel(customer.email)
-            email.setStyleSheet("color: #546E7A; font-size: 10px;")
+            email = styled(QLabel(customer.email), "cardDetail")
             email.setWordWrap(True)
             left_layout.addWidget(email)
         
         # Phone
         if customer.phone or customer.mobile:
             phone_text = customer.phone or customer.mobile
-            phone = QLabel(f"☎ {phone_text}")
-            phone.setStyleSheet("color: #546E7A; font-size: 10px;")
+            phone = styled(QLabel(f"☎ {phone_text}"), "cardDetail")
             left_layout.addWidget(phone)
         
         left_layout.addStretch()
@@ -107,16 +86,7 @@ class CustomerCardWidget(QFrame):
         right_layout.setAlignment(Qt.AlignTop)
         
         # Status badge
-        status_badge = QLabel(customer.status.upper())
-        status_bg, status_text = self._get_status_colors(customer.status)
-        status_badge.setStyleSheet(f"""
-            background-color: {status_bg};
-            color: {status_text};
-            padding: 4px 8px;
-            border-radius: 8px;
-            font-size: 9px;
-            font-weight: bold;
-        """)
+        status_badge = styled(QLabel(customer.status.upper()), "pill", status=status_key("customer", customer.status))
         status_badge.setAlignment(Qt.AlignCenter)
         right_layout.addWidget(status_badge)
         right_layout.addStretch()
@@ -131,15 +101,4 @@ class CustomerCardWidget(QFrame):
     
     def _on_email_clicked(self):
         QDesktopServices.openUrl(QUrl(f"mailto:{self.customer.email}"))
-    
-    def _get_status_colors(self, status):
-        if status == "Active":
-            return "#27ae60", "#FFFFFF"  # Green
-        elif status == "On Hold":
-            return "#f39c12", "#FFFFFF"  # Orange
-        elif status == "Archived":
-            return "#95a5a6", "#FFFFFF"  # Grey
-        elif status == "Banned":
-            return "#e74c3c", "#FFFFFF"  # Red
-        else:
-            return "#95a5a6", "#FFFFFF"  # Default grey
+
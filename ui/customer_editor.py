@@ -3,7 +3,8 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
 from PySide6.QtCore import Qt, QUrl
 from PySide6.QtGui import QDesktopServices
 from ui.assets import play_sound, get_icon
-from database import get_db
+from db_session import session_scope
+from numbering import next_number
 from models import Customer
 
 class CustomerEditorDialog(QDialog):
@@ -147,48 +148,41 @@ class CustomerEditorDialog(QDialog):
             company_name = contact_name
             
         try:
-            db = next(get_db())
+            with session_scope() as db:
             
-            if self.is_new:
-                # Generate Customer Number
-                last_customer = db.query(Customer).filter(Customer.customer_number.like("CN%")).order_by(Customer.id.desc()).first()
-                
-                if last_customer and last_customer.customer_number:
-                    try:
-                        last_num = int(last_customer.customer_number[2:])
-                        new_num = last_num + 1
-                    except ValueError:
-                        new_num = 1
-                else:
-                    new_num = 1
-                
-                customer_number = f"CN{new_num:06d}"
+                if self.is_new:
+                    customer_number = next_number(db, "customer")
 
-                customer = Customer(
-                    customer_number=customer_number,
-                    company_name=company_name,
-                    contact_name=self.contact_input.text().strip() or None,
-                    email=self.email_input.text().strip() or None,
-                    phone=self.phone_input.text().strip() or None,
-                    mobile=self.mobile_input.text().strip() or None,
-                    address=self.address_input.toPlainText().strip() or None,
-                    status=self.status_input.currentText(),
-                    notes=self.notes_input.toPlainText().strip() or None
-                )
-                db.add(customer)
-            else:
-                self.customer.company_name = company_name
-                self.customer.contact_name = self.contact_input.text().strip() or None
-                self.customer.email = self.email_input.text().strip() or None
-                self.customer.phone = self.phone_input.text().strip() or None
-                self.customer.mobile = self.mobile_input.text().strip() or None
-                self.customer.address = self.address_input.toPlainText().strip() or None
-                self.customer.status = self.status_input.currentText()
-                self.customer.notes = self.notes_input.toPlainText().strip() or None
+                    customer = Customer(
+                        customer_number=customer_number,
+                        company_name=company_name,
+                        contact_name=self.contact_input.text().strip() or None,
+                        email=self.email_input.text().strip() or None,
+                        phone=self.phone_input.text().strip() or None,
+                        mobile=self.mobile_input.text().strip() or None,
+                        address=self.address_input.toPlainText().strip() or None,
+                        status=self.status_input.currentText(),
+                        notes=self.notes_input.toPlainText().strip() or None
+                    )
+                    db.add(customer)
+                else:
+                    # Re-query to get attached object
+                    customer = db.get(Customer, self.customer.id)
+                    customer.company_name = company_name
+                    customer.contact_name = self.contact_input.text().strip() or None
+                    customer.email = self.email_input.text().strip() or None
+                    customer.phone = self.phone_input.text().strip() or None
+                    customer.mobile = self.mobile_input.text().strip() or None
+                    customer.address = self.address_input.toPlainText().strip() or None
+                    customer.status = self.status_input.currentText()
+                    customer.notes = self.notes_input.toPlainText().strip() or None
                 
-            db.commit()
-            play_sound("celebration")
-            self.accept()
+                db.commit()
+                # The saved customer, loaded so it can be read after the session closes
+                db.refresh(customer)
+                self.customer = customer
+                play_sound("celebration")
+                self.accept()
             
         except Exception as e:
             play_sound("caution")
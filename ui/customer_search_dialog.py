@@ -2,8 +2,9 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
                                QTableView, QHeaderView, QLabel, QAbstractItemView, QLineEdit, QMessageBox)
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QColor
-from database import get_db
+from db_session import session_scope
 from models import Customer
+from ui.model_diff import sync_rows
 
 class CustomerSearchTableModel(QAbstractTableModel):
     def __init__(self, customers=None):
@@ -42,9 +43,7 @@ class CustomerSearchTableModel(QAbstractTableModel):
         return None
         
     def update_data(self, customers):
-        self.beginResetModel()
-        self.customers = customers
-        self.endResetModel()
+        sync_rows(self, self.customers, customers)
 
 class CustomerSearchDialog(QDialog):
     def __init__(self, parent=None):
@@ -94,21 +93,20 @@ class CustomerSearchDialog(QDialog):
         self.refresh_data(search=text)
         
     def refresh_data(self, search=""):
-        db = next(get_db())
-        query = db.query(Customer).filter(Customer.is_archived == False)
-        
-        if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                (Customer.company_name.like(search_filter)) |
-                (Customer.contact_name.like(search_filter)) |
-                (Customer.email.like(search_filter)) |
-                (Customer.phone.like(search_filter))
-            )
-        
-        customers = query.all()
-        self.model.update_data(customers)
-        db.close()
+        with session_scope() as db:
+            query = db.query(Customer).filter(Customer.is_archived == False)
+        
+            if search:
+                search_filter = f"%{search}%"
+                query = query.filter(
+                    (Customer.company_name.like(search_filter)) |
+                    (Customer.contact_name.like(search_filter)) |
+                    (Customer.email.like(search_filter)) |
+                    (Customer.phone.like(search_filter))
+                )
+        
+            customers = query.all()
+            self.model.update_data(customers)
         
     def select_customer(self):
         indexes = self.table.selectionModel().selectedRows()
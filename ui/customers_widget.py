@@ -1,42 +1,21 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                               QLabel, QScrollArea, QFrame, QGridLayout, QLineEdit, QMessageBox)
+                               QLabel, QScrollArea, QLineEdit, QMessageBox)
 from PySide6.QtCore import Qt, QSize
 from ui.assets import get_icon, play_sound
-from database import get_db
 from models import Customer
+from ui.search_controller import SearchController
 from ui.customer_card import CustomerCardWidget
-
-class FlowLayout(QFrame):
-    """Simple flow layout for cards"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setStyleSheet("QFrame { background-color: #F0F0F0; border: none; }")
-        self.grid = QGridLayout(self)
-        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.grid.setContentsMargins(10, 10, 10, 10)
-        self.grid.setSpacing(20)
-
-    def clear(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-    def add_cards(self, customers, on_view, on_edit):
-        self.clear()
-        cols = 5
-        for i, customer in enumerate(customers):
-            card = CustomerCardWidget(customer)
-            card.clicked.connect(on_view)
-            card.edit_clicked.connect(on_edit)
-            row = i // cols
-            col = i % cols
-            self.grid.addWidget(card, row, col)
+from ui.flow_layout import FlowLayout
+from ui.change_bus import get_change_bus
+from ui.change_detector import PageRefresher
+from ui.counter_board import get_counter_board
+from ui.data_service import get_data_service
+from projections import CustomerRow, load_entity
 
 class CustomersWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("QWidget { background-color: #F0F0F0; }")
+        self.setObjectName("page") # Grey background, from the application theme
         layout = QVBoxLayout(self)
         
         # Header
@@ -97,6 +76,7 @@ class CustomersWidget(QWidget):
         self.search_box.setPlaceholderText("Search customers...")
         self.search_box.setFixedWidth(300)
         self.search_box.textChanged.connect(self.on_search)
+        self.search_controller = SearchController(self.query_customers, self.apply_customers, self)
         self.search_box.setStyleSheet("""
             QLineEdit {
                 padding: 8px;
@@ -132,63 +112,94 @@ class CustomersWidget(QWidget):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: transparent; }")
-        self.cards_container = FlowLayout()
+        self.cards_container = FlowLayout(self.make_card)
         self.scroll_area.setWidget(self.cards_container)
         layout.addWidget(self.scroll_area)
         
         self.new_customer_btn.clicked.connect(self.open_new_customer_dialog)
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+        self.refresher = PageRefresher(self, ["customer"], self.refresh_data) # Other stations' changes
+        get_counter_board().changed.connect(self.update_counts)
+        self.update_counts()
         self.refresh_data()
 
     def on_search(self, text):
-        self.refresh_data(search=text)
+        self.search_controller.search(text)
 
     def open_new_customer_dialog(self):
         from ui.customer_editor import CustomerEditorDialog
         dialog = CustomerEditorDialog(self)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
 
     def edit_customer(self, customer):
         from ui.customer_editor import CustomerEditorDialog
+        customer = load_entity(customer)
+        if customer is None:
+            return # Deleted elsewhere; the change bus drops its card
         dialog = CustomerEditorDialog(self, customer)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
             
     def view_customer(self, customer):
         self.edit_customer(customer)
 
-    def refresh_data(self, search=""):
-        db = next(get_db())
-        try:
-            query = db.query(Customer).filter(Customer.is_archived == False)
-            
-            if search:
-                search_filter = f"%{search}%"
-                query = query.filter(
-                    (Customer.company_name.like(search_filter)) |
-                    (Customer.contact_name.like(search_filter)) |
-                    (Customer.email.like(search_filter)) |
-                    (Customer.phone.like(search_filter))
-                )
-            
-            customers = query.all()
-            
-            # Calculate status counts
-            status_counts = {
-                "Active": 0,
-                "On Hold": 0,
-                "Banned": 0
-            }
-            
-            for customer in customers:
-                if customer.status in status_counts:
-                    status_counts[customer.status] += 1
-            
-            self.status_active_count.setText(str(status_counts["Active"]))
-            self.status_hold_count.setText(str(status_counts["On Hold"]))
-            self.status_banned_count.setText(str(status_counts["Banned"]))
-            
-            self.cards_container.add_cards(customers, self.view_customer, self.edit_customer)
-            
-        finally:
-            db.close()
+    def refresh_data(self, search=None):
+        """Reload the page in the background, keeping the current search text"""
+        if search is None:
+            search = self.search_box.text()
+        self.search_controller.refresh(search)
+
+    def customers_query(self, db, search):
+        query = db.query(Customer).filter(Customer.is_archived == False)
+        
+        if search:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                (Customer.company_name.like(search_filter)) |
+                (Customer.contact_name.like(search_filter)) |
+                (Customer.email.like(search_filter)) |
+                (Customer.phone.like(search_filter))
+            )
+        return query
+
+    def query_customers(self, db, search):
+        """Load the customers to show; runs on a search worker thread"""
+        return CustomerRow.all(self.customers_query(db, search))
+
+    def query_one_customer(self, db, customer_id, search):
+        """Load one customer if it belongs on the page, else None"""
+        return CustomerRow.first(self.customers_query(db, search).filter(Customer.id == customer_id))
+
+    def make_card(self, customer):
+        card = CustomerCardWidget(customer)
+        card.clicked.connect(self.view_customer)
+        card.edit_clicked.connect(self.edit_customer)
+        return card
+
+    def apply_customers(self, customers):
+        self.cards_container.add_cards(customers)
+
+    def update_counts(self):
+        """Header counts over all active customers, whatever the search"""
+        counts = get_counter_board().counts("customer")
+        self.status_active_count.setText(str(counts["Active"]))
+        self.status_hold_count.setText(str(counts["On Hold"]))
+        self.status_banned_count.setText(str(counts["Banned"]))
+
+    def on_entity_changed(self, entity, entity_id, kind):
+        """Patch the one changed card instead of reloading the page"""
+        if entity != "customer":
+            return
+        if kind == "delete":
+            self.cards_container.remove_card(entity_id)
+            return
+        call = get_data_service().run(self.query_one_customer, entity_id, self.search_box.text(),
+                                      label="query_one_customer")
+        call.finished.connect(lambda customer: self.apply_customer(entity_id, customer))
+        call.failed.connect(lambda message: self.refresh_data())
+
+    def apply_customer(self, customer_id, customer):
+        if customer is None:
+            # Archived, or no longer matches the search
+            self.cards_container.remove_card(customer_id)
+        else:
+            self.cards_container.upsert_card(customer)
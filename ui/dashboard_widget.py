@@ -1,8 +1,6 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QGridLayout, QPushButton)
 from PySide6.QtCore import Qt, Signal, QSize
-from database import get_db
-from models import Job, Quote, PurchaseOrder, Task, QuoteStatus, POStatus, TaskStatus
-from datetime import datetime
+from ui.counter_board import get_counter_board
 from ui.assets import get_icon
 from settings_manager import get_settings
 
@@ -42,9 +40,9 @@ class StatCard(QFrame):
         layout.addLayout(top_row)
         
         # Big number
-        count_lbl = QLabel(str(total_count))
-        count_lbl.setStyleSheet("color: #2c3e50; font-size: 42px; font-weight: bold;")
-        layout.addWidget(count_lbl)
+        self.count_lbl = QLabel()
+        self.count_lbl.setStyleSheet("color: #2c3e50; font-size: 42px; font-weight: bold;")
+        layout.addWidget(self.count_lbl)
         
         layout.addSpacing(5)
         
@@ -53,17 +51,15 @@ class StatCard(QFrame):
         lights_row.setSpacing(12)
         lights_row.setContentsMargins(0, 0, 0, 0)
         
+        # Standard 3 lights, plus blue for POs
+        colors = ["#e74c3c", "#f39c12", "#27ae60"]
         if blue_count >= 0:
-            # Show all 4 colors for POs
-            lights_row.addWidget(self.create_dot_with_count("#e74c3c", red_count))
-            lights_row.addWidget(self.create_dot_with_count("#f39c12", orange_count))
-            lights_row.addWidget(self.create_dot_with_count("#27ae60", green_count))
-            lights_row.addWidget(self.create_dot_with_count("#3498db", blue_count))
-        else:
-            # Standard 3 lights
-            lights_row.addWidget(self.create_dot_with_count("#e74c3c", red_count))
-            lights_row.addWidget(self.create_dot_with_count("#f39c12", orange_count))
-            lights_row.addWidget(self.create_dot_with_count("#27ae60", green_count))
+            colors.append("#3498db")
+        self.dot_counts = []
+        for color in colors:
+            widget, count = self.create_dot_with_count(color)
+            lights_row.addWidget(widget)
+            self.dot_counts.append(count)
         
         lights_row.addStretch()
         layout.addLayout(lights_row)
@@ -75,8 +71,17 @@ class StatCard(QFrame):
         view_all.setStyleSheet(f"color: {border_color}; font-size: 11px; font-weight: bold;")
         view_all.setCursor(Qt.PointingHandCursor)
         layout.addWidget(view_all)
+        
+        self.update_counts(total_count, red_count, orange_count, green_count, blue_count)
+    
+    def update_counts(self, total_count, red_count, orange_count, green_count, blue_count=-1):
+        """Update the numbers in place"""
+        self.count_lbl.setText(str(total_count))
+        counts = [red_count, orange_count, green_count, blue_count]
+        for label, count in zip(self.dot_counts, counts):
+            label.setText(str(count))
     
-    def create_dot_with_count(self, color, count):
+    def create_dot_with_count(self, color):
         widget = QWidget()
         container = QHBoxLayout(widget)
         container.setSpacing(5)
@@ -88,13 +93,13 @@ class StatCard(QFrame):
         dot.setStyleSheet(f"background-color: {color}; border-radius: 12px;")
         
         # Count
-        count_lbl = QLabel(str(count))
+        count_lbl = QLabel("0")
         count_lbl.setStyleSheet("color: #2c3e50; font-size: 16px; font-weight: bold;")
         
         container.addWidget(dot)
         container.addWidget(count_lbl)
         
-        return widget
+        return widget, count_lbl
 
 class DashboardWidget(QWidget):
     # Signals for Quick Actions
@@ -135,6 +140,17 @@ class DashboardWidget(QWidget):
         self.cards_layout.setAlignment(Qt.AlignLeft | Qt.AlignTop)
         layout.addLayout(self.cards_layout)
         
+        # Built once, refresh_stats only updates the numbers
+        self.jobs_card = StatCard("Active Jobs", 0, 0, 0, 0, -1, "apparel", "#3498db")
+        self.quotes_card = StatCard("Pending Quotes", 0, 0, 0, 0, -1, "order_approve", "#9b59b6")
+        self.tasks_card = StatCard("Active Tasks", 0, 0, 0, 0, -1, "pending_actions", "#27ae60")
+        self.pos_card = StatCard("Active PO's", 0, 0, 0, 0, 0, "add_business", "#e67e22")
+        self.cards_layout.addWidget(self.jobs_card, 0, 0)
+        self.cards_layout.addWidget(self.quotes_card, 0, 1)
+        self.cards_layout.addWidget(self.tasks_card, 0, 2)
+        self.cards_layout.addWidget(self.pos_card, 0, 3)
+        get_counter_board().changed.connect(self.refresh_stats)
+        
         # ===== QUICK ACTIONS =====
         
         # Container
@@ -210,115 +226,15 @@ class DashboardWidget(QWidget):
         self.welcome_label.setText(f"Welcome {org_name} to PrintShop Pilot")
 
     def refresh_stats(self):
-        # Clear existing
-        while self.cards_layout.count():
-            item = self.cards_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        db = next(get_db())
-        today = datetime.now().date()
-        
-        # ===== JOBS =====
-        all_jobs = db.query(Job).filter(Job.is_archived == False).all()
-        jobs_total = len(all_jobs)
-        jobs_green = 0
-        jobs_orange = 0
-        jobs_red = 0
-        
-        for job in all_jobs:
-            if job.due_date:
-                days_until_due = (job.due_date - today).days
-                if days_until_due < 0:
-                    jobs_red += 1
-                elif days_until_due <= 3:
-                    jobs_orange += 1
-                else:
-                    jobs_green += 1
-            else:
-                jobs_green += 1
-        
-        self.cards_layout.addWidget(
-            StatCard("Active Jobs", jobs_total, jobs_red, jobs_orange, jobs_green, -1, "apparel", "#3498db"),
-            0, 0
-        )
-        
-        # ===== QUOTES =====
-        all_quotes = db.query(Quote).filter(Quote.is_archived == False).all()
-        quotes_total = len(all_quotes)
-        quotes_green = 0
-        quotes_orange = 0
-        quotes_red = 0
-        
-        for quote in all_quotes:
-            if quote.status == QuoteStatus.ACCEPTED:
-                quotes_green += 1
-            elif quote.status == QuoteStatus.REJECTED:
-                quotes_red += 1
-            elif quote.expiry_date:
-                days_until_expiry = (quote.expiry_date - today).days
-                if days_until_expiry < 0:
-                    quotes_red += 1
-                elif days_until_expiry <= 7:
-                    quotes_orange += 1
-                else:
-                    quotes_green += 1
-            else:
-                quotes_green += 1
-        
-        self.cards_layout.addWidget(
-            StatCard("Pending Quotes", quotes_total, quotes_red, quotes_orange, quotes_green, -1, "order_approve", "#9b59b6"),
-            0, 1
-        )
-        
-        # ===== TASKS =====
-        all_tasks = db.query(Task).filter(Task.is_archived == False).all()
-        tasks_total = len(all_tasks)
-        tasks_green = 0
-        tasks_orange = 0
-        tasks_red = 0
-        
-        for task in all_tasks:
-            if task.status == TaskStatus.COMPLETED:
-                tasks_green += 1
-            elif task.due_date:
-                days_until_due = (task.due_date - today).days
-                if days_until_due < 0:
-                    tasks_red += 1
-                elif days_until_due <= 3:
-                    tasks_orange += 1
-                else:
-                    tasks_green += 1
-            else:
-                tasks_green += 1
-        
-        self.cards_layout.addWidget(
-            StatCard("Active Tasks", tasks_total, tasks_red, tasks_orange, tasks_green, -1, "pending_actions", "#27ae60"),
-            0, 2
-        )
-        
-        # ===== PURCHASE ORDERS =====
-        all_pos = db.query(PurchaseOrder).filter(PurchaseOrder.is_archived == False).all()
-        po_total = len(all_pos)
-        po_blue = 0
-        po_green = 0
-        po_orange = 0
-        po_red = 0
-        
-        for po in all_pos:
-            if po.status == POStatus.TO_ORDER:
-                po_blue += 1
-            elif po.status == POStatus.RECEIVED:
-                po_orange += 1
-            elif po.status == POStatus.WAITING_STOCK:
-                if po.due_date and po.due_date < today:
-                    po_red += 1
-                else:
-                    po_green += 1
-            else:
-                po_green += 1
-        
-        self.cards_layout.addWidget(
-            StatCard("Active PO's", po_total, po_red, po_orange, po_green, po_blue, "add_business", "#e67e22"),
-            0, 3
-        )
+        """Show the counts from the counter board"""
+        board = get_counter_board()
+        
+        def buckets(entity, colors=("red", "orange", "green")):
+            counts = board.counts(entity)
+            values = [counts[color] for color in colors]
+            return [sum(values)] + values
+        
+        self.jobs_card.update_counts(*buckets("job"))
+        self.quotes_card.update_counts(*buckets("quote"))
+        self.tasks_card.update_counts(*buckets("task"))
+        self.pos_card.update_counts(*buckets("purchase_order", ("red", "orange", "green", "blue")))
@@ -0,0 +1,141 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from db_session import open_session
+from loaders import QueryBudget
+import os
+import time
+
+# Worker threads for database calls. SQLite serialises writers anyway, so a
+# couple of threads is enough to keep reads from queueing behind a save.
+DATA_THREADS = 2
+
+# Set to print every call with its timing
+TIMINGS_ENV = "PRINTSHOP_DATA_TIMINGS"
+
+
+class DataCall(QObject):
+    """
+    Handle for one queued database call. finished(result) or failed(message)
+    is delivered on the UI thread; elapsed_ms and queued_ms are set first.
+    """
+    finished = Signal(object)
+    failed = Signal(str)
+    _done = Signal(object, str) # result, error - emitted from the worker
+
+    def __init__(self, label, service):
+        super().__init__()
+        self.label = label
+        self.service = service
+        self.cancelled = False
+        self.queued_ms = None
+        self.elapsed_ms = None
+        self.created = time.perf_counter()
+
+    def cancel(self):
+        """Don't deliver the result (and skip the call if it hasn't started)"""
+        self.cancelled = True
+
+    def _on_done(self, result, error):
+        # Queued to the UI thread, where this object lives
+        self.service._finish(self)
+        if self.cancelled:
+            return
+        if error:
+            print(f"Error in {self.label}: {error}")
+            self.failed.emit(error)
+        else:
+            self.finished.emit(result)
+
+
+class _DataTask(QRunnable):
+    def __init__(self, call, fn, args, commit, budget):
+        super().__init__()
+        self.call = call
+        self.fn = fn
+        self.args = args
+        self.commit = commit
+        self.budget = budget
+
+    def run(self):
+        call = self.call
+        start = time.perf_counter()
+        call.queued_ms = (start - call.created) * 1000
+        if call.cancelled:
+            call.elapsed_ms = 0.0
+            call._done.emit(None, "")
+            return
+
+        db = None
+        result, error = None, ""
+        try:
+            db = open_session()
+            if self.budget is None:
+                result = self.fn(db, *self.args)
+            else:
+                with QueryBudget(call.label, self.budget):
+                    result = self.fn(db, *self.args)
+            if self.commit:
+                db.commit()
+        except Exception as e:
+            if db is not None:
+                db.rollback()
+            error = str(e) or e.__class__.__name__
+        finally:
+            if db is not None:
+                db.close()
+        call.elapsed_ms = (time.perf_counter() - start) * 1000
+        call._done.emit(result, error)
+
+
+class DataService(QObject):
+    """
+    Runs database work off the UI thread.
+
+    run(fn, *args) calls fn(db, *args) on a worker with its own session and
+    returns a DataCall whose signals deliver the result on the UI thread.
+    The session is closed before the result is delivered, so fn must return
+    plain values or fully loaded (detached) objects. With commit=True the
+    session is committed after fn returns and rolled back if it raises.
+    budget is the most queries fn should need (see loaders.QueryBudget).
+    """
+    def __init__(self, max_threads=DATA_THREADS):
+        super().__init__()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.active = set()
+        self.stats = {} # label -> {"calls", "total_ms", "max_ms"}
+        self.print_timings = bool(os.environ.get(TIMINGS_ENV))
+
+    def run(self, fn, *args, label=None, commit=False, budget=None):
+        call = DataCall(label or getattr(fn, "__name__", "query"), self)
+        call._done.connect(call._on_done)
+        self.active.add(call)
+        self.pool.start(_DataTask(call, fn, args, commit, budget))
+        return call
+
+    def _finish(self, call):
+        self.active.discard(call)
+        stats = self.stats.setdefault(call.label, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["calls"] += 1
+        stats["total_ms"] += call.elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], call.elapsed_ms)
+        if self.print_timings:
+            print(f"data: {call.label} {call.elapsed_ms:.1f} ms (queued {call.queued_ms:.1f} ms)"
+                  f"{' cancelled' if call.cancelled else ''}")
+
+    def timing_report(self):
+        """Per-label call counts and timings, slowest total first"""
+        lines = []
+        for label, stats in sorted(self.stats.items(), key=lambda item: -item[1]["total_ms"]):
+            average = stats["total_ms"] / stats["calls"]
+            lines.append(f"{label}: {stats['calls']} calls, avg {average:.1f} ms, max {stats['max_ms']:.1f} ms")
+        return "\n".join(lines)
+
+
+_data_service = None
+
+
+def get_data_service():
+    global _data_service
+    if _data_service is None:
+        _data_service = DataService()
+    return _data_service
@@ -0,0 +1,123 @@
+from PySide6.QtWidgets import QFrame, QGridLayout
+from PySide6.QtCore import Qt
+from ui.theme import styled
+
+
+def primary_key(item):
+    return item.id
+
+
+class FlowLayout(QFrame):
+    """
+    Flow layout for cards, one per item, kept in order and patched in place.
+
+    make_card(item) builds the card for an item. Items are ordered by
+    sort_key (None keeps the load order, new items go last). The theme
+    paints the page background behind the cards unless transparent.
+    """
+    def __init__(self, make_card, sort_key=None, descending=False,
+                 key=primary_key, cols=5, transparent=False, parent=None):
+        super().__init__(parent)
+        styled(self, "cardGrid", transparent=transparent)
+
+        # Use GridLayout for card arrangement
+        self.grid = QGridLayout(self)
+        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.grid.setContentsMargins(10, 10, 10, 10)
+        self.grid.setSpacing(20)
+
+        self.make_card = make_card
+        self.sort_key = sort_key
+        self.descending = descending
+        self.key = key
+        self.cols = cols
+
+        self.items = [] # In display order
+        self.cards = {} # key -> card widget
+
+    def clear(self):
+        while self.grid.count():
+            item = self.grid.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        self.items = []
+        self.cards = {}
+
+    def add_cards(self, items, append=False):
+        """Show items (already in display order), replacing the current cards unless append"""
+        if not append:
+            self.clear()
+        for item in items:
+            self.cards[self.key(item)] = self.make_card(item)
+            self.items.append(item)
+            self._place(len(self.items) - 1)
+
+    def get(self, item_key):
+        for item in self.items:
+            if self.key(item) == item_key:
+                return item
+        return None
+
+    def upsert_card(self, item):
+        """Add or replace the card for item in its sorted position. Returns the replaced item."""
+        item_key = self.key(item)
+        old = None
+        start = len(self.items)
+        position = None
+        if item_key in self.cards:
+            start = self._index(item_key)
+            old = self.items[start]
+            self._take(start)
+            if self.sort_key is None:
+                position = start
+
+        if position is None:
+            position = self._position_for(item)
+
+        self.items.insert(position, item)
+        self.cards[item_key] = self.make_card(item)
+        self._shift(min(start, position))
+        return old
+
+    def remove_card(self, item_key):
+        """Drop the card for item_key, if shown. Returns the removed item."""
+        if item_key not in self.cards:
+            return None
+        position = self._index(item_key)
+        old = self.items[position]
+        self._take(position)
+        self._shift(position)
+        return old
+
+    def _index(self, item_key):
+        for i, item in enumerate(self.items):
+            if self.key(item) == item_key:
+                return i
+        raise KeyError(item_key)
+
+    def _position_for(self, item):
+        if self.sort_key is None:
+            return len(self.items)
+        new_key = self.sort_key(item)
+        for i, other in enumerate(self.items):
+            other_key = self.sort_key(other)
+            if (other_key < new_key) if self.descending else (other_key > new_key):
+                return i
+        return len(self.items)
+
+    def _take(self, position):
+        item = self.items.pop(position)
+        card = self.cards.pop(self.key(item))
+        self.grid.removeWidget(card)
+        card.deleteLater()
+
+    def _place(self, position):
+        card = self.cards[self.key(self.items[position])]
+        self.grid.addWidget(card, position // self.cols, position % self.cols)
+
+    def _shift(self, start):
+        """Re-place the cards from start onwards after an insert or removal"""
+        for position in range(start, len(self.items)):
+            card = self.cards[self.key(self.items[position])]
+            self.grid.removeWidget(card)
+            self._place(position)
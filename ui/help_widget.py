@@ -98,7 +98,7 @@ class HelpWidget(QWidget):
                     <li><strong>Create Jobs:</strong> Click "New Job" to add a new print job</li>
                     <li><strong>Job Statuses:</strong> Job Created → Awaiting Stock → In Queue → Out Queue → Customer Notified → Complete</li>
                     <li><strong>Search:</strong> Use the search box to find jobs by job number, customer name, order type, or notes</li>
-                    <li><strong>Print:</strong> Print individual job cards or the entire jobs page</li>
+                    <li><strong>Print:</strong> Print a job's ticket, export the jobs page as a PDF, or select several jobs (Ctrl+click or Shift+click) and click "Print Tickets" to print their tickets four to a sheet</li>
                     <li><strong>Archive:</strong> Completed jobs are automatically archived</li>
                 </ul>
             </div>
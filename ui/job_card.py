@@ -1,9 +1,11 @@
 from PySide6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                               QWidget, QSizePolicy)
-from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QPainter, QColor, QPen
+                               QWidget, QSizePolicy, QStyledItemDelegate, QStyle)
+from PySide6.QtCore import Qt, Signal, QSize, QRect, QRectF, QEvent
+from PySide6.QtGui import QPainter, QColor, QPen, QFont, QFontMetrics
 from ui.assets import get_icon
+from ui.theme import TRAFFIC_COLORS, PRIORITY_COLORS, STATUS_COLORS, priority_key, status_key, styled
 from models import Job
+from datetime import date
 
 class JobCardWidget(QFrame):
     clicked = Signal(object) # Emits the job object for viewing
@@ -16,26 +18,8 @@ class JobCardWidget(QFrame):
         self.setFixedWidth(280)
         self.setFixedHeight(200)
         
-        # Card background - light blue/cyan like mockup
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: #D5EEF2;
-                border: 1px solid #B8D8DD;
-                border-radius: 8px;
-            }}
-            QLabel {{ border: none; background: transparent; }}
-            QPushButton {{
-                border: none;
-                background: transparent;
-                color: #2c3e50;
-                font-size: 11px;
-                padding: 4px 8px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(0, 0, 0, 0.05);
-                border-radius: 4px;
-            }}
-        """)
+        # Colours come from the application theme (ui/theme.py)
+        styled(self, "card", kind="job")
         
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(12, 12, 12, 12)
@@ -46,27 +30,19 @@ class JobCardWidget(QFrame):
         left_layout.setSpacing(4)
         
         # Traffic light circle
-        traffic_color = self._get_traffic_light_color()
-        circle_widget = QWidget()
+        traffic = get_traffic_state(job)
+        circle_widget = styled(QWidget(), "trafficLight", traffic=traffic)
+        circle_widget.setAttribute(Qt.WA_StyledBackground, True)
         circle_widget.setFixedSize(35, 35)
-        circle_widget.setStyleSheet(f"""
-            QWidget {{
-                background-color: {traffic_color};
-                border-radius: 17px;
-                border: none;
-            }}
-        """)
         left_layout.addWidget(circle_widget)
         
         # Customer name
-        customer = QLabel(job.customer_name)
-        customer.setStyleSheet("font-weight: bold; font-size: 14px; color: #2c3e50;")
+        customer = styled(QLabel(job.customer_name), "cardTitle")
         customer.setWordWrap(True)
         left_layout.addWidget(customer)
         
         # Order type
-        type_label = QLabel(job.order_type)
-        type_label.setStyleSheet("color: #546E7A; font-size: 11px;")
+        type_label = styled(QLabel(job.order_type), "cardSubtitle")
         type_label.setWordWrap(True)
         left_layout.addWidget(type_label)
         
@@ -74,8 +50,7 @@ class JobCardWidget(QFrame):
         
         # Due date (colored to match traffic light)
         due_date_text = job.due_date.strftime("%b %d, %Y") if job.due_date else "No Due Date"
-        date_label = QLabel(f"DUE DATE\n{due_date_text}")
-        date_label.setStyleSheet(f"color: {traffic_color}; font-size: 10px; font-weight: bold; line-height: 1.2;")
+        date_label = styled(QLabel(f"DUE DATE\n{due_date_text}"), "cardDate", traffic=traffic)
         left_layout.addWidget(date_label)
         
         # Bottom buttons row
@@ -130,44 +105,24 @@ class JobCardWidget(QFrame):
         right_layout.setAlignment(Qt.AlignTop)
         
         # Priority badge
-        priority_badge = QLabel(job.priority.upper())
-        priority_bg, priority_text = self._get_priority_colors(job.priority)
-        priority_badge.setStyleSheet(f"""
-            background-color: {priority_bg};
-            color: {priority_text};
-            padding: 4px 8px;
-            border-radius: 8px;
-            font-size: 9px;
-            font-weight: bold;
-        """)
+        priority_badge = styled(QLabel(job.priority.upper()), "pill", priority=priority_key(job.priority))
         priority_badge.setAlignment(Qt.AlignCenter)
         right_layout.addWidget(priority_badge)
         
         # Status badge
-        status_badge = QLabel(job.status.upper())
-        status_bg, status_text = self._get_status_colors(job.status)
-        status_badge.setStyleSheet(f"""
-            background-color: {status_bg};
-            color: {status_text};
-            padding: 4px 8px;
-            border-radius: 8px;
-            font-size: 9px;
-            font-weight: bold;
-        """)
+        status_badge = styled(QLabel(job.status.upper()), "pill", status=status_key("job", job.status))
         status_badge.setAlignment(Qt.AlignCenter)
         status_badge.setWordWrap(True)
         right_layout.addWidget(status_badge)
         
         # Source
-        source_label = QLabel(f"SOURCE\n{job.order_source}")
-        source_label.setStyleSheet("color: #546E7A; font-size: 10px; line-height: 1.2;")
+        source_label = styled(QLabel(f"SOURCE\n{job.order_source}"), "cardDetail")
         source_label.setAlignment(Qt.AlignCenter)
         right_layout.addWidget(source_label)
         
         # Shop (using assigned_to field or default)
         shop_text = job.assigned_to if job.assigned_to else "Main"
-        shop_label = QLabel(f"SHOP\n{shop_text}")
-        shop_label.setStyleSheet("color: #546E7A; font-size: 10px; line-height: 1.2;")
+        shop_label = styled(QLabel(f"SHOP\n{shop_text}"), "cardDetail")
         shop_label.setAlignment(Qt.AlignCenter)
         right_layout.addWidget(shop_label)
         
@@ -189,45 +144,222 @@ class JobCardWidget(QFrame):
     
     def _get_traffic_light_color(self):
         """Get color for traffic light based on due date"""
-        from datetime import date
-        
-        if not self.job.due_date:
-            return "#2196F3"  # Blue if no due date
-        
-        today = date.today()
-        due_date = self.job.due_date
-        
-        if due_date < today:
-            return "#F44336"  # Red - Overdue
-        elif due_date == today:
-            return "#FF9800"  # Orange - Due Today
-        else:
-            return "#4CAF50"  # Green - On Time
+        return get_traffic_light_color(self.job)
     
     def _get_priority_colors(self, priority):
         """Get background and text colors for priority badge"""
-        priority_lower = priority.lower()
-        if "miracle" in priority_lower:
-            return "#FF0000", "#FFFFFF"  # Bright Red, White Writing
-        elif "express" in priority_lower:
-            return "#FF8C00", "#FFFFFF"  # Dark Orange, White Writing
-        else:  # Normal
-            return "#00FF00", "#FFFFFF"  # Bright Green, White Writing
+        return get_priority_colors(priority)
     
     def _get_status_colors(self, status):
         """Get background and text colors for status badge"""
-        status_lower = status.lower()
-        if "job created" in status_lower or "created" in status_lower:
-            return "#00BFFF", "#FFFFFF"  # Bright Blue, White Writing
-        elif "awaiting stock" in status_lower or "waiting stock" in status_lower:
-            return "#9C27B0", "#FFFFFF"  # Bright Purple, White Writing
-        elif "in queue" in status_lower:
-            return "#00FF00", "#FFFFFF"  # Bright Green, White Writing
-        elif "out queue" in status_lower:
-            return "#FFD700", "#000000"  # Daisy Yellow, Black Writing
-        elif "customer notified" in status_lower or "notified" in status_lower:
-            return "#000000", "#FFFFFF"  # Black, White Writing
-        elif "complete" in status_lower:
-            return "#FFFFFF", "#000000"  # White, Black Writing
-        else:
-            return "#607D8B", "#FFFFFF"  # Default Blue-gray, White Writing
+        return get_status_colors(status)
+
+
+def get_traffic_state(job):
+    """Traffic light state based on due date"""
+    if not job.due_date:
+        return "blue"  # No due date
+    
+    today = date.today()
+    due_date = job.due_date
+    
+    if due_date < today:
+        return "red"  # Overdue
+    elif due_date == today:
+        return "orange"  # Due Today
+    else:
+        return "green"  # On Time
+
+def get_traffic_light_color(job):
+    """Get color for traffic light based on due date"""
+    return TRAFFIC_COLORS["job"][get_traffic_state(job)]
+
+def get_priority_colors(priority):
+    """Get background and text colors for priority badge"""
+    return PRIORITY_COLORS[priority_key(priority)]
+
+def get_status_colors(status):
+    """Get background and text colors for status badge"""
+    return STATUS_COLORS["job"][status_key("job", status)]
+
+
+# Item data roles used by JobsTableModel to feed JobCardDelegate
+JOB_ROLE = Qt.UserRole + 1
+PO_COUNT_ROLE = Qt.UserRole + 2
+
+CARD_WIDTH = 280
+CARD_HEIGHT = 200
+CARD_PADDING = 12
+RIGHT_COLUMN_WIDTH = 92
+
+
+class JobCardDelegate(QStyledItemDelegate):
+    """
+    Paints a job card for each row of a list view, so only visible cards
+    cost anything. Draws the same content as JobCardWidget and turns clicks
+    on the View / Edit / Print areas into signals.
+    """
+    clicked = Signal(object) # Emits the job object for viewing
+    edit_clicked = Signal(object) # Emits the job object for editing
+    print_clicked = Signal(object) # Emits the job object for printing
+
+    BUTTONS = [
+        ("view", " View", "folder_eye_24dp_1F1F1F_FILL0_wght400_GRAD0_opsz24", 14),
+        ("edit", " Edit", "fa5s.edit", 14),
+        ("print", " Print", "print_24dp_1F1F1F_FILL0_wght400_GRAD0_opsz24", 16),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hover = None # (row, button name) under the mouse
+
+    def sizeHint(self, option, index):
+        return QSize(CARD_WIDTH, CARD_HEIGHT)
+
+    def _card_rect(self, option):
+        return QRect(option.rect.topLeft(), QSize(CARD_WIDTH, CARD_HEIGHT))
+
+    def _font(self, option, pixel_size, bold=False):
+        font = QFont(option.font)
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+    def _button_rects(self, option, po_count=0):
+        """Hit areas of the bottom button row, in view coordinates"""
+        card = self._card_rect(option)
+        font = self._font(option, 11)
+        metrics = QFontMetrics(font)
+        x = card.left() + CARD_PADDING
+        y = card.bottom() - CARD_PADDING - 24
+        rects = []
+        buttons = list(self.BUTTONS)
+        if po_count > 0:
+            buttons.append(("po", f" {po_count} PO", "fa5s.shopping-cart", 14))
+        for name, text, icon_name, icon_size in buttons:
+            width = icon_size + metrics.horizontalAdvance(text) + 16
+            rects.append((name, text, icon_name, icon_size, QRect(x, y, width, 24)))
+            x += width + 5
+        return rects
+
+    def paint(self, painter, option, index):
+        job = index.data(JOB_ROLE)
+        if job is None:
+            return
+        po_count = index.data(PO_COUNT_ROLE) or 0
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Card background - light blue/cyan like mockup
+        card = self._card_rect(option)
+        painter.setPen(QPen(QColor("#B8D8DD"), 1))
+        painter.setBrush(QColor("#D5EEF2"))
+        painter.drawRoundedRect(QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), 8, 8)
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(QColor("#3498db"), 3))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(QRectF(card).adjusted(1.5, 1.5, -1.5, -1.5), 8, 8)
+        
+        inner = card.adjusted(CARD_PADDING, CARD_PADDING, -CARD_PADDING, -CARD_PADDING)
+        left = QRect(inner.left(), inner.top(), inner.width() - RIGHT_COLUMN_WIDTH - 10, inner.height())
+        right = QRect(inner.right() - RIGHT_COLUMN_WIDTH + 1, inner.top(), RIGHT_COLUMN_WIDTH, inner.height())
+        
+        # Traffic light circle
+        traffic_color = get_traffic_light_color(job)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(traffic_color))
+        painter.drawEllipse(QRect(left.left(), left.top(), 35, 35))
+        
+        # Customer name
+        y = left.top() + 39
+        painter.setFont(self._font(option, 14, bold=True))
+        painter.setPen(QColor("#2c3e50"))
+        name_rect = QRect(left.left(), y, left.width(), 36)
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, job.customer_name or "")
+        y += painter.boundingRect(name_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, job.customer_name or "").height() + 4
+        
+        # Order type
+        painter.setFont(self._font(option, 11))
+        painter.setPen(QColor("#546E7A"))
+        painter.drawText(QRect(left.left(), y, left.width(), 30), Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, job.order_type or "")
+        
+        # Due date (colored to match traffic light), just above the buttons
+        due_date_text = job.due_date.strftime("%b %d, %Y") if job.due_date else "No Due Date"
+        painter.setFont(self._font(option, 10, bold=True))
+        painter.setPen(QColor(traffic_color))
+        painter.drawText(QRect(left.left(), inner.bottom() - 24 - 30, left.width(), 28),
+                         Qt.AlignLeft | Qt.AlignBottom, f"DUE DATE\n{due_date_text}")
+        
+        # Bottom buttons row
+        painter.setFont(self._font(option, 11))
+        for name, text, icon_name, icon_size, rect in self._button_rects(option, po_count):
+            if self._hover == (index.row(), name) and name != "po":
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(QColor(0, 0, 0, 13))
+                painter.drawRoundedRect(rect, 4, 4)
+            icon = get_icon(icon_name, color="#2c3e50") if name == "po" else get_icon(icon_name)
+            icon_rect = QRect(rect.left() + 8, rect.center().y() - icon_size // 2, icon_size, icon_size)
+            icon.paint(painter, icon_rect)
+            painter.setPen(QColor("#2c3e50"))
+            painter.drawText(rect.adjusted(8 + icon_size, 0, 0, 0), Qt.AlignLeft | Qt.AlignVCenter, text)
+        
+        # RIGHT COLUMN - priority and status pills, source and shop
+        y = right.top()
+        y = self._paint_pill(painter, option, right, y, (job.priority or "").upper(), get_priority_colors(job.priority or ""))
+        y = self._paint_pill(painter, option, right, y + 6, (job.status or "").upper(), get_status_colors(job.status or ""))
+        
+        painter.setFont(self._font(option, 10))
+        painter.setPen(QColor("#546E7A"))
+        painter.drawText(QRect(right.left(), y + 6, right.width(), 28), Qt.AlignHCenter | Qt.AlignTop, f"SOURCE\n{job.order_source}")
+        shop_text = job.assigned_to if job.assigned_to else "Main"
+        painter.drawText(QRect(right.left(), y + 40, right.width(), 28), Qt.AlignHCenter | Qt.AlignTop, f"SHOP\n{shop_text}")
+        
+        painter.restore()
+
+    def _paint_pill(self, painter, option, column, y, text, colors):
+        """Draw a rounded badge across the column and return the y below it"""
+        background, foreground = colors
+        font = self._font(option, 9, bold=True)
+        painter.setFont(font)
+        text_rect = painter.boundingRect(QRect(column.left() + 8, y + 4, column.width() - 16, 100),
+                                         Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap, text)
+        pill = QRect(column.left(), y, column.width(), text_rect.height() + 8)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(pill, 8, 8)
+        painter.setPen(QColor(foreground))
+        painter.drawText(pill.adjusted(8, 4, -8, -4), Qt.AlignCenter | Qt.TextWordWrap, text)
+        return pill.bottom()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseMove, QEvent.MouseButtonRelease):
+            return False
+        
+        pos = event.position().toPoint()
+        hit = None
+        for name, _text, _icon, _size, rect in self._button_rects(option, index.data(PO_COUNT_ROLE) or 0):
+            if name != "po" and rect.contains(pos):
+                hit = name
+                break
+        
+        view = self.parent()
+        if event.type() == QEvent.MouseMove:
+            hover = (index.row(), hit) if hit else None
+            if hover != self._hover:
+                self._hover = hover
+                if view is not None:
+                    view.viewport().setCursor(Qt.PointingHandCursor if hit else Qt.ArrowCursor)
+                    view.viewport().update()
+            return False
+        
+        if event.button() != Qt.LeftButton or hit is None:
+            return False
+        job = index.data(JOB_ROLE)
+        if hit == "view":
+            self.clicked.emit(job)
+        elif hit == "edit":
+            self.edit_clicked.emit(job)
+        elif hit == "print":
+            self.print_clicked.emit(job)
+        return True
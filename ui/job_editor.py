@@ -5,7 +5,10 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit,
 from PySide6.QtCore import Qt, QDate, QUrl
 from PySide6.QtGui import QDesktopServices
 from models import Job, Priority, JobStatus
-from database import get_db
+from db_session import open_session
+from numbering import next_number
+from ui.data_service import get_data_service
+from loaders import JOB_EDITOR
 from settings_manager import get_settings
 from ui.customer_editor import CustomerEditorDialog
 from ui.customer_search_dialog import CustomerSearchDialog
@@ -347,6 +350,7 @@ class JobEditorDialog(QDialog):
         
         layout.addWidget(self.buttons)
         
+        self.po_call = None
         if job:
             self.load_job_data()
 
@@ -374,23 +378,27 @@ class JobEditorDialog(QDialog):
         # I will not add it to the model for now to avoid migration issues, unless requested. 
         # It might just be for display/reference from the customer.
         
-        # Load POs
-        db = next(get_db())
-        try:
-            # Re-query job to ensure relationships
-            current_job = db.query(Job).get(self.job.id)
-            if current_job:
-                pos = current_job.purchase_orders
-                self.po_table.setRowCount(len(pos))
-                for i, po in enumerate(pos):
-                    self.po_table.setItem(i, 0, QTableWidgetItem(po.po_number))
-                    self.po_table.setItem(i, 1, QTableWidgetItem(po.supplier_name))
-                    self.po_table.setItem(i, 2, QTableWidgetItem(po.status))
-                    self.po_table.setItem(i, 3, QTableWidgetItem(f"${po.total/100:.2f}"))
-                    # Store PO ID
-                    self.po_table.item(i, 0).setData(Qt.UserRole, po.id)
-        finally:
-            db.close()
+        # Load POs in the background
+        if self.po_call is not None:
+            self.po_call.cancel()
+        self.po_call = get_data_service().run(query_job_pos, self.job.id, label="job editor POs", budget=1)
+        self.po_call.finished.connect(self.load_pos)
+        self.po_call.failed.connect(self.on_pos_failed)
+
+    def load_pos(self, pos):
+        self.po_call = None
+        self.po_table.setRowCount(len(pos))
+        for i, (po_id, po_number, supplier_name, status, total) in enumerate(pos):
+            self.po_table.setItem(i, 0, QTableWidgetItem(po_number))
+            self.po_table.setItem(i, 1, QTableWidgetItem(supplier_name))
+            self.po_table.setItem(i, 2, QTableWidgetItem(status))
+            self.po_table.setItem(i, 3, QTableWidgetItem(f"${total/100:.2f}"))
+            # Store PO ID
+            self.po_table.item(i, 0).setData(Qt.UserRole, po_id)
+
+    def on_pos_failed(self, message):
+        self.po_call = None
+        QMessageBox.warning(self, "Purchase Orders", f"Could not load this job's purchase orders:\n{message}")
 
     def open_po(self, index):
         po_id = self.po_table.item(index.row(), 0).data(Qt.UserRole)
@@ -398,7 +406,7 @@ class JobEditorDialog(QDialog):
         from ui.po_editor import POEditorDialog
         from models import PurchaseOrder
         
-        db = next(get_db())
+        db = open_session()
         try:
             po = db.query(PurchaseOrder).get(po_id)
             if po:
@@ -412,19 +420,7 @@ class JobEditorDialog(QDialog):
     def add_customer(self):
         dialog = CustomerEditorDialog(self)
         if dialog.exec():
-            # Get the new customer (it's the last one added, or we could modify CustomerEditor to return it)
-            # For now, let's just find the latest customer
-            db = next(get_db())
-            customer = db.query(Job).order_by(Job.id.desc()).first() # Wait, this is Job.
-            # We need Customer.
-            # Actually, let's just use the search dialog logic or ask the user to find it.
-            # Better: Modify CustomerEditorDialog to return the created customer? 
-            # Or just query the latest customer.
-            from models import Customer
-            customer = db.query(Customer).order_by(Customer.id.desc()).first()
-            if customer:
-                self.populate_customer(customer)
-            db.close()
+            self.populate_customer(dialog.customer)
 
     def find_customer(self):
         dialog = CustomerSearchDialog(self)
@@ -481,7 +477,7 @@ class JobEditorDialog(QDialog):
             QMessageBox.warning(self, "Validation Error", "Customer Name is required.")
             return
 
-        db = next(get_db())
+        db = open_session()
         try:
             data = {
                 "customer_name": self.customer_name.text(),
@@ -501,33 +497,19 @@ class JobEditorDialog(QDialog):
             }
             
             if self.job:
-                # Update existing
+                # Update existing; self.job came from a closed session
+                job = db.get(Job, self.job.id)
                 for key, value in data.items():
-                    setattr(self.job, key, value)
+                    setattr(job, key, value)
                 
                 # Auto-archive if status is Complete
                 if data["status"] == "Complete":
-                    self.job.is_archived = True
+                    job.is_archived = True
                 
                 db.commit()
             else:
                 # Create new
-                # Generate Job Number
-                # Find the latest job number starting with "JN"
-                last_job = db.query(Job).filter(Job.job_number.like("JN%")).order_by(Job.id.desc()).first()
-                
-                if last_job and last_job.job_number:
-                    try:
-                        # Extract number part
-                        last_num = int(last_job.job_number[2:])
-                        new_num = last_num + 1
-                    except ValueError:
-                        # Fallback if parsing fails
-                        new_num = 1
-                else:
-                    new_num = 1
-                
-                data["job_number"] = f"JN{new_num:06d}"
+                data["job_number"] = next_number(db, "job")
                 
                 new_job = Job(**data)
                 db.add(new_job)
@@ -538,3 +520,11 @@ class JobEditorDialog(QDialog):
             QMessageBox.critical(self, "Error", str(e))
         finally:
             db.close()
+
+
+def query_job_pos(db, job_id):
+    """PO rows for the job editor's Purchase Orders table"""
+    current_job = db.get(Job, job_id, options=JOB_EDITOR)
+    if not current_job:
+        return []
+    return [(po.id, po.po_number, po.supplier_name, po.status, po.total) for po in current_job.purchase_orders]
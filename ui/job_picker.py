@@ -0,0 +1,162 @@
+from PySide6.QtWidgets import QComboBox, QCompleter
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from models import Job
+from ui.change_bus import get_change_bus
+from ui.data_service import get_data_service
+from ui.model_diff import sync_rows
+
+# Wait for a burst of job saves to finish before reloading
+RELOAD_DELAY_MS = 300
+
+
+def query_active_jobs(db):
+    """(id, job number, customer) of every active job, newest number first"""
+    return [
+        tuple(row) for row in
+        db.query(Job.id, Job.job_number, Job.customer_name)
+        .filter(Job.is_archived == False)
+        .order_by(Job.job_number.desc())
+        .all()
+    ]
+
+
+class ActiveJobsModel(QAbstractListModel):
+    """
+    Active jobs for the job selectors, shared by every selector in the app.
+
+    Loaded in the background the first time a selector needs it and kept
+    up to date from the change bus. Reloads are applied as row inserts,
+    removals and data changes, so open selectors keep their selection.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = [] # (id, job_number, customer_name)
+        self.labels = {} # id -> display text
+        self.loaded = False
+        self.call = None
+
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(RELOAD_DELAY_MS)
+        self.reload_timer.timeout.connect(self.load)
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.jobs)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job_id = self.jobs[index.row()][0]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.labels.get(job_id, "")
+        if role == Qt.UserRole:
+            return job_id
+        return None
+
+    def label(self, job_id):
+        """Display text for an active job, or None"""
+        return self.labels.get(job_id)
+
+    def ensure_loaded(self):
+        if not self.loaded and self.call is None:
+            self.load()
+
+    def load(self):
+        if self.call is not None:
+            self.call.cancel()
+        self.call = get_data_service().run(query_active_jobs, label="active jobs")
+        self.call.finished.connect(self.apply_jobs)
+        self.call.failed.connect(self.on_load_failed)
+
+    def apply_jobs(self, jobs):
+        self.call = None
+        self.loaded = True
+        self.labels = {job_id: f"{job_number} - {customer_name}" for job_id, job_number, customer_name in jobs}
+        sync_rows(self, self.jobs, jobs, key=lambda job: job[0], signature=lambda job: job)
+
+    def on_load_failed(self, message):
+        # Keep the jobs shown so far; the next selector to ask for them tries again
+        self.call = None
+
+    def on_entity_changed(self, entity, entity_id, kind):
+        # Nothing to keep fresh until a selector has asked for the jobs
+        if entity == "job" and self.loaded:
+            self.reload_timer.start()
+
+
+_active_jobs_model = None
+
+
+def get_active_jobs_model():
+    global _active_jobs_model
+    if _active_jobs_model is None:
+        _active_jobs_model = ActiveJobsModel()
+    _active_jobs_model.ensure_loaded()
+    return _active_jobs_model
+
+
+class JobComboBox(QComboBox):
+    """
+    Job selector on the shared active jobs model. Type to filter by job
+    number or customer; clear the text for no job. A job that isn't active
+    (archived, or not loaded yet) shows as "Job #id" and is kept unless
+    the user changes the selection.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.NoInsert)
+        self.setModel(get_active_jobs_model())
+        # With a placeholder the first load leaves the selection empty
+        self.setPlaceholderText("Select Job...")
+        self.lineEdit().setPlaceholderText("Select Job...")
+
+        completer = QCompleter(self.model(), self)
+        completer.setFilterMode(Qt.MatchContains)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        completer.setCompletionMode(QCompleter.PopupCompletion)
+        self.setCompleter(completer)
+
+        # A job to select once the model has loaded
+        self.pending_job_id = None
+        # The job set_job_id() was given, and the text shown for it
+        self.original_job_id = None
+        self.original_text = ""
+        self.model().rowsInserted.connect(self._select_pending)
+        self.set_job_id(None)
+
+    def job_id(self):
+        """The selected job's id, or None"""
+        text = self.currentText().strip()
+        if not text:
+            return None
+        index = self.findText(text, Qt.MatchFixedString)
+        return self.itemData(index) if index >= 0 else None
+
+    def job_changed(self):
+        """Whether the user picked a different job than set_job_id() gave"""
+        if self.pending_job_id is not None:
+            return False # Still waiting for the jobs; nothing else was offered
+        if self.currentIndex() == -1 and self.currentText() == self.original_text:
+            return False
+        return self.job_id() != self.original_job_id
+
+    def set_job_id(self, job_id):
+        self.original_job_id = job_id
+        self.pending_job_id = job_id
+        index = self.findData(job_id) if job_id is not None else -1
+        self.setCurrentIndex(index)
+        if index >= 0:
+            self.pending_job_id = None
+        elif job_id is not None and self.model().loaded:
+            self.pending_job_id = None # Not an active job any more
+            self.setEditText(f"Job #{job_id}")
+        self.original_text = self.currentText()
+
+    def _select_pending(self):
+        # Unless the user has picked something in the meantime
+        if self.pending_job_id is not None and self.currentIndex() == -1 and not self.currentText():
+            self.set_job_id(self.pending_job_id)
+        if self.model().loaded:
+            self.pending_job_id = None
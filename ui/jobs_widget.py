@@ -1,18 +1,29 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                                QTableView, QHeaderView, QLabel, QAbstractItemView,
-                               QScrollArea, QFrame, QButtonGroup, QGridLayout, QDialogButtonBox)
+                               QListView, QLineEdit, QDialogButtonBox, QMessageBox)
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSize
 from PySide6.QtGui import QColor
 import qtawesome as qta
-from database import get_db
-from models import Job, JobStatus
+from sqlalchemy import func
+from models import Job, JobStatus, PurchaseOrder
 from datetime import date
 from ui.assets import get_icon
+from ui.search_controller import SearchController
+from ui.model_diff import sync_rows, row_signature
+from ui.job_card import JobCardDelegate, JOB_ROLE, PO_COUNT_ROLE, CARD_WIDTH, CARD_HEIGHT
+from ui.change_bus import get_change_bus
+from ui.change_detector import PageRefresher
+from ui.counter_board import get_counter_board
+from ui.data_service import get_data_service
+from ui.report_export import export_report, format_date
+from ui.ticket_printer import print_tickets
+from projections import JobRow, LOAD_BATCH, load_entity, load_entities
 
 class JobsTableModel(QAbstractTableModel):
     def __init__(self, jobs=None):
         super().__init__()
         self.jobs = jobs or []
+        self.po_counts = {}
         self.headers = ["Job #", "Customer", "Type", "Due Date", "Status", "Priority"]
 
     def rowCount(self, parent=QModelIndex()):
@@ -28,6 +39,11 @@ class JobsTableModel(QAbstractTableModel):
         job = self.jobs[index.row()]
         col = index.column()
 
+        if role == JOB_ROLE:
+            return job
+        if role == PO_COUNT_ROLE:
+            return self.po_counts.get(job.id, 0)
+
         if role == Qt.DisplayRole:
             if col == 0: return job.job_number
             if col == 1: return job.customer_name
@@ -43,60 +59,37 @@ class JobsTableModel(QAbstractTableModel):
             return self.headers[section]
         return None
 
-    def update_data(self, jobs):
-        self.beginResetModel()
-        self.jobs = jobs
-        self.endResetModel()
-
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                               QTableView, QHeaderView, QLabel, QAbstractItemView, 
-                               QScrollArea, QFrame, QButtonGroup, QLineEdit)
-from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSize
-from PySide6.QtGui import QColor
-import qtawesome as qta
-from database import get_db
-from models import Job
-from ui.job_card import JobCardWidget
-
-# ... (JobsTableModel remains the same, assuming it's above or imported)
-
-class FlowLayout(QFrame):
-    """Simple flow layout for cards"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        # Grey background
-        self.setStyleSheet("QFrame { background-color: #F0F0F0; border: none; }")
-        
-        # Use GridLayout for card arrangement
-        self.grid = QGridLayout(self)
-        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.grid.setContentsMargins(10, 10, 10, 10)
-        self.grid.setSpacing(20)
-
-    def clear(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-    def add_cards(self, jobs, on_view, on_edit, on_print):
-        self.clear()
-        cols = 5 # Number of columns (5 cards wide)
-        for i, job in enumerate(jobs):
-            card = JobCardWidget(job)
-            card.clicked.connect(on_view)
-            card.edit_clicked.connect(on_edit)
-            card.print_clicked.connect(on_print)
-            row = i // cols
-            col = i % cols
-            self.grid.addWidget(card, row, col)
+    def update_data(self, jobs, po_counts=None):
+        old_counts = self.po_counts
+        self.po_counts = po_counts or {}
+        sync_rows(
+            self, self.jobs, jobs,
+            signature=lambda job: (row_signature(job), self.po_counts.get(job.id, 0)),
+            old_signature=lambda job: (row_signature(job), old_counts.get(job.id, 0))
+        )
+
+def job_sort_key(job):
+    # Earliest due first, undated last
+    return (job.due_date is None, job.due_date or date.max)
+
+# Columns of the exported jobs report: (header, relative width, value)
+JOB_REPORT_COLUMNS = [
+    ("Job #", 1.2, lambda job: job.job_number),
+    ("Customer", 3, lambda job: job.customer_name),
+    ("Type", 2, lambda job: job.order_type),
+    ("Due Date", 1.2, lambda job: format_date(job.due_date)),
+    ("Status", 1.8, lambda job: job.status),
+    ("Priority", 1, lambda job: job.priority),
+    ("Assigned To", 1.5, lambda job: job.assigned_to),
+]
 
 class JobsWidget(QWidget):
     def __init__(self):
         super().__init__()
+        self.ticket_run = None
         
-        # Set grey background
-        self.setStyleSheet("QWidget { background-color: #F0F0F0; }")
+        # Grey background, from the application theme
+        self.setObjectName("page")
         
         layout = QVBoxLayout(self)
         
@@ -226,6 +219,7 @@ class JobsWidget(QWidget):
         self.search_box.setPlaceholderText("Search jobs...")
         self.search_box.setFixedWidth(300)
         self.search_box.textChanged.connect(self.on_search)
+        self.search_controller = SearchController(self.query_jobs, self.apply_jobs, self)
         self.search_box.setStyleSheet("""
             QLineEdit {
                 padding: 8px;
@@ -255,6 +249,28 @@ class JobsWidget(QWidget):
         header_layout.addWidget(self.print_btn)
         header_layout.addSpacing(10)
         
+        # Print Tickets button - tickets for the selected jobs
+        self.print_tickets_btn = QPushButton(" Print Tickets")
+        self.print_tickets_btn.setIcon(qta.icon("fa5s.ticket-alt", color="white"))
+        self.print_tickets_btn.setIconSize(QSize(16, 16))
+        self.print_tickets_btn.setCursor(Qt.PointingHandCursor)
+        self.print_tickets_btn.setToolTip("Print tickets for the selected jobs")
+        self.print_tickets_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2c3e50;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-weight: bold;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #34495e;
+            }
+        """)
+        header_layout.addWidget(self.print_tickets_btn)
+        header_layout.addSpacing(10)
+        
         # New Job Button
         self.new_job_btn = QPushButton(" New Job")
         self.new_job_btn.setIcon(qta.icon("fa5s.plus", color="white"))
@@ -288,6 +304,7 @@ class JobsWidget(QWidget):
         self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table.setAlternatingRowColors(True)
         self.table.setStyleSheet("""
             QTableView {
@@ -305,34 +322,55 @@ class JobsWidget(QWidget):
         """)
         self.table.doubleClicked.connect(self.on_table_double_click)
         
-        # Card View (Scroll Area)
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: transparent; }")
-        self.cards_container = FlowLayout()
-        self.scroll_area.setWidget(self.cards_container)
+        # Card View - a list view in icon mode sharing the table model, with
+        # the cards painted by a delegate so only visible cards cost anything
+        self.card_view = QListView()
+        self.card_view.setModel(self.model)
+        self.card_view.setViewMode(QListView.IconMode)
+        self.card_view.setResizeMode(QListView.Adjust)
+        self.card_view.setMovement(QListView.Static)
+        self.card_view.setUniformItemSizes(True)
+        self.card_view.setGridSize(QSize(CARD_WIDTH + 20, CARD_HEIGHT + 20))
+        self.card_view.setLayoutMode(QListView.Batched)
+        self.card_view.setBatchSize(200)
+        self.card_view.setSelectionMode(QAbstractItemView.ExtendedSelection) # For batch ticket printing
+        self.card_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.card_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.card_view.verticalScrollBar().setSingleStep(20)
+        self.card_view.setMouseTracking(True)
+        self.card_view.setStyleSheet("QListView { background-color: #F0F0F0; border: none; }")
+        
+        self.card_delegate = JobCardDelegate(self.card_view)
+        self.card_delegate.clicked.connect(self.view_job)
+        self.card_delegate.edit_clicked.connect(self.edit_job)
+        self.card_delegate.print_clicked.connect(self.print_job)
+        self.card_view.setItemDelegate(self.card_delegate)
         
         # Show card view by default
         self.table.hide()
         
         self.stack_layout.addWidget(self.table)
-        self.stack_layout.addWidget(self.scroll_area)
+        self.stack_layout.addWidget(self.card_view)
         
         layout.addWidget(self.content_stack)
         
         self.new_job_btn.clicked.connect(self.open_new_job_dialog)
         self.print_btn.clicked.connect(self.print_jobs_page)
+        self.print_tickets_btn.clicked.connect(self.print_selected_tickets)
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+        self.refresher = PageRefresher(self, ["job", "purchase_order"], self.refresh_data) # Other stations' changes
+        get_counter_board().changed.connect(self.update_counts)
+        self.update_counts()
         
         self.refresh_data()
 
     def on_search(self, text):
-        self.refresh_data(search=text)
+        self.search_controller.search(text)
 
     def open_new_job_dialog(self):
         from ui.job_editor import JobEditorDialog
         dialog = JobEditorDialog(self)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
 
     def on_table_double_click(self, index):
         job = self.model.jobs[index.row()]
@@ -340,89 +378,122 @@ class JobsWidget(QWidget):
 
     def edit_job(self, job):
         from ui.job_editor import JobEditorDialog
+        job = load_entity(job)
+        if job is None:
+            return # Deleted elsewhere; the change bus drops its row
         dialog = JobEditorDialog(self, job)
-        if dialog.exec():
-            # Refresh the data to show updated job cards
-            self.refresh_data()
-
-    def refresh_data(self, search=""):
-        db = next(get_db())
-        try:
-            query = db.query(Job).filter(Job.is_archived == False)
-            
-            if search:
-                search_filter = f"%{search}%"
-                query = query.filter(
-                    (Job.job_number.like(search_filter)) |
-                    (Job.customer_name.like(search_filter)) |
-                    (Job.order_type.like(search_filter)) |
-                    (Job.notes.like(search_filter))
-                )
-            
-            jobs = query.all()
-            
-            # Sort jobs by due date (earliest first, None at the end)
-            jobs_sorted = sorted(jobs, key=lambda j: (j.due_date is None, j.due_date))
-            
-            # Calculate counts
-            today = date.today()
-            overdue = 0
-            due_today = 0
-            on_time = 0
-            unassigned = 0
-            
-            # Status counts
-            status_counts = {
-                JobStatus.CREATED: 0,
-                JobStatus.AWAITING_STOCK: 0,
-                JobStatus.IN_QUEUE: 0,
-                JobStatus.OUT_QUEUE: 0,
-                JobStatus.CUSTOMER_NOTIFIED: 0
-            }
-            
-            for job in jobs:
-                if job.status == JobStatus.COMPLETE:
-                    continue
-                
-                if job.status == JobStatus.CREATED:
-                    unassigned += 1
-                
-                # Count by status
-                if job.status in status_counts:
-                    status_counts[job.status] += 1
-                
-                if job.due_date:
-                    if job.due_date < today:
-                        overdue += 1
-                    elif job.due_date == today:
-                        due_today += 1
-                    else:
-                        on_time += 1
-            
-            # Update Traffic Light labels
-            self.unassigned_count.setText(str(unassigned))
-            self.overdue_count.setText(str(overdue))
-            self.due_today_count.setText(str(due_today))
-            self.on_time_count.setText(str(on_time))
-            
-            # Update Status Overview labels
-            self.status_created_count.setText(str(status_counts[JobStatus.CREATED]))
-            self.status_stock_count.setText(str(status_counts[JobStatus.AWAITING_STOCK]))
-            self.status_in_queue_count.setText(str(status_counts[JobStatus.IN_QUEUE]))
-            self.status_out_queue_count.setText(str(status_counts[JobStatus.OUT_QUEUE]))
-            self.status_notified_count.setText(str(status_counts[JobStatus.CUSTOMER_NOTIFIED]))
-            
-            # Update Table
-            self.model.update_data(jobs_sorted)
-            
-            # Update Cards
-            self.cards_container.add_cards(jobs_sorted, self.view_job, self.edit_job, self.print_job)
-        finally:
-            db.close()
+        dialog.exec()
+
+    def refresh_data(self, search=None):
+        """Reload the page in the background, keeping the current search text"""
+        if search is None:
+            search = self.search_box.text()
+        self.search_controller.refresh(search)
+
+    def jobs_query(self, db, search):
+        query = db.query(Job).filter(Job.is_archived == False)
+        
+        if search:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                (Job.job_number.like(search_filter)) |
+                (Job.customer_name.like(search_filter)) |
+                (Job.order_type.like(search_filter)) |
+                (Job.notes.like(search_filter))
+            )
+        return query
+
+    def query_po_counts(self, db, job_ids):
+        """PO badge counts for the cards, in one query instead of a lazy load per card"""
+        counts = {}
+        # In batches, to stay under SQLite's bound-variable limit
+        for start in range(0, len(job_ids), LOAD_BATCH):
+            counts.update(
+                db.query(Job.id, func.count(PurchaseOrder.id))
+                .join(Job.purchase_orders)
+                .filter(Job.id.in_(job_ids[start:start + LOAD_BATCH]))
+                .group_by(Job.id)
+                .all()
+            )
+        return counts
+
+    def query_jobs(self, db, search):
+        """Load the jobs to show; runs on a search worker thread"""
+        jobs = JobRow.all(self.jobs_query(db, search))
+        
+        # Sort jobs by due date (earliest first, None at the end)
+        jobs_sorted = sorted(jobs, key=job_sort_key)
+        
+        return jobs_sorted, self.query_po_counts(db, [job.id for job in jobs])
+
+    def report_jobs(self, db, search):
+        """The page's jobs in page order, for the PDF export"""
+        return self.jobs_query(db, search).order_by(Job.due_date.is_(None), Job.due_date, Job.id)
+
+    def query_one_job(self, db, job_id, search):
+        """Load one job (and its PO count) if it belongs on the page, else None"""
+        job = JobRow.first(self.jobs_query(db, search).filter(Job.id == job_id))
+        if job is None:
+            return None
+        return job, self.query_po_counts(db, [job_id]).get(job_id, 0)
+
+    def apply_jobs(self, results):
+        jobs, po_counts = results
+        
+        # Update Table and Cards (both views share the model)
+        self.model.update_data(jobs, po_counts)
+
+    def update_counts(self):
+        """Header counts over all active jobs, whatever the search"""
+        counts = get_counter_board().counts("job")
+        
+        # Update Traffic Light labels (completed jobs aren't due)
+        self.unassigned_count.setText(str(counts["unassigned"]))
+        self.overdue_count.setText(str(counts["overdue"]))
+        self.due_today_count.setText(str(counts["due_today"]))
+        self.on_time_count.setText(str(counts["on_time"]))
+        
+        # Update Status Overview labels
+        self.status_created_count.setText(str(counts[JobStatus.CREATED.value]))
+        self.status_stock_count.setText(str(counts[JobStatus.AWAITING_STOCK.value]))
+        self.status_in_queue_count.setText(str(counts[JobStatus.IN_QUEUE.value]))
+        self.status_out_queue_count.setText(str(counts[JobStatus.OUT_QUEUE.value]))
+        self.status_notified_count.setText(str(counts[JobStatus.CUSTOMER_NOTIFIED.value]))
+
+    def on_entity_changed(self, entity, entity_id, kind):
+        """Patch the changed row instead of reloading the page"""
+        if entity == "job":
+            if kind == "delete":
+                self.apply_job(entity_id, None)
+                return
+            call = get_data_service().run(self.query_one_job, entity_id, self.search_box.text(),
+                                          label="query_one_job")
+            call.finished.connect(lambda result: self.apply_job(entity_id, result))
+            call.failed.connect(lambda message: self.refresh_data())
+        elif entity == "purchase_order" and self.model.jobs:
+            # A PO may have been linked to or unlinked from a shown job
+            call = get_data_service().run(self.query_po_counts, [job.id for job in self.model.jobs],
+                                          label="query_po_counts")
+            call.finished.connect(lambda po_counts: self.model.update_data(list(self.model.jobs), po_counts))
+            call.failed.connect(lambda message: self.refresh_data())
+
+    def apply_job(self, job_id, result):
+        jobs = [job for job in self.model.jobs if job.id != job_id]
+        po_counts = dict(self.model.po_counts)
+        if result is not None:
+            job, po_count = result
+            jobs.append(job)
+            jobs.sort(key=job_sort_key)
+            po_counts[job_id] = po_count
+        # Otherwise deleted, archived, or no longer matches the search
+        self.model.update_data(jobs, po_counts)
     
     def view_job(self, job):
         """View job in read-only mode"""
         from ui.job_editor import JobEditorDialog
+        job = load_entity(job)
+        if job is None:
+            return
         dialog = JobEditorDialog(self, job)
         # Make all fields read-only
         dialog.customer_name.setReadOnly(True)
@@ -446,83 +517,24 @@ class JobsWidget(QWidget):
         dialog.exec()
     
     def print_job(self, job):
-        """Handle printing a single job card"""
-        try:
-            from PySide6.QtPrintSupport import QPrinter, QPrintDialog
-            from PySide6.QtGui import QPainter, QFont, QPageLayout
-            from PySide6.QtCore import QRect, QMarginsF
-            from PySide6.QtWidgets import QMessageBox
-            
-            printer = QPrinter(QPrinter.HighResolution)
-            # Set margins using QMarginsF
-            margins = QMarginsF(15, 15, 15, 15)
-            printer.setPageMargins(margins, QPageLayout.Millimeter)
-            
-            dialog = QPrintDialog(printer, self)
-            if dialog.exec():
-                painter = QPainter(printer)
-                font = QFont("Arial", 12)
-                painter.setFont(font)
-                
-                y = 100
-                line_height = 50
-                
-                # Print job details
-                painter.drawText(100, y, f"Job Number: {job.job_number}")
-                y += line_height
-                painter.drawText(100, y, f"Customer: {job.customer_name}")
-                y += line_height
-                painter.drawText(100, y, f"Order Type: {job.order_type}")
-                y += line_height
-                painter.drawText(100, y, f"Due Date: {job.due_date.strftime('%b %d, %Y') if job.due_date else 'N/A'}")
-                y += line_height
-                painter.drawText(100, y, f"Priority: {job.priority}")
-                y += line_height
-                painter.drawText(100, y, f"Status: {job.status}")
-                y += line_height
-                painter.drawText(100, y, f"Source: {job.order_source}")
-                y += line_height
-                
-                if job.notes:
-                    painter.drawText(100, y, f"Notes: {job.notes}")
-                
-                painter.end()
-        except Exception as e:
-            from PySide6.QtWidgets import QMessageBox
-            QMessageBox.critical(self, "Print Error", f"Error printing job: {str(e)}")
+        """Print the ticket for a single job"""
+        self.ticket_run = print_tickets(self, load_entities([job]))
+
+    def selected_jobs(self):
+        """Jobs selected in the visible view, in page order"""
+        view = self.table if self.table.isVisible() else self.card_view
+        # The card view only selects column 0, so selectedRows() (every column) would be empty
+        rows = sorted({index.row() for index in view.selectionModel().selectedIndexes()})
+        return [self.model.jobs[row] for row in rows]
+
+    def print_selected_tickets(self):
+        jobs = self.selected_jobs()
+        if not jobs:
+            QMessageBox.information(self, "Print Tickets", "Select the jobs to print tickets for (Ctrl+click or Shift+click to select several).")
+            return
+        # Tickets print the notes the page doesn't load
+        self.ticket_run = print_tickets(self, load_entities(jobs))
     
     def print_jobs_page(self):
-        """Print the entire Jobs Management page in landscape"""
-        from PySide6.QtPrintSupport import QPrinter, QPrintDialog
-        from PySide6.QtGui import QPainter, QPageLayout, QPageSize
-        from PySide6.QtCore import QMarginsF
-        
-        printer = QPrinter(QPrinter.HighResolution)
-        # Set landscape orientation
-        printer.setPageOrientation(QPageLayout.Landscape)
-        # Set margins
-        margins = QMarginsF(10, 10, 10, 10)
-        printer.setPageMargins(margins, QPageLayout.Millimeter)
-        
-        dialog = QPrintDialog(printer, self)
-        if dialog.exec():
-            painter = QPainter(printer)
-            
-            # Get the scroll area widget (cards container)
-            widget_to_print = self.scroll_area.widget()
-            
-            # Calculate scaling to fit to page
-            page_rect = printer.pageRect(QPrinter.DevicePixel)
-            widget_rect = widget_to_print.rect()
-            
-            # Scale to fit width and height
-            scale_x = page_rect.width() / widget_rect.width()
-            scale_y = page_rect.height() / widget_rect.height()
-            scale = min(scale_x, scale_y)
-            
-            painter.scale(scale, scale)
-            
-            # Render the widget
-            widget_to_print.render(painter)
-            
-            painter.end()
+        """Export the jobs on the page (current search) as a paginated PDF"""
+        export_report(self, "Jobs", JOB_REPORT_COLUMNS, self.report_jobs, self.search_box.text())
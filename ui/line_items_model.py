@@ -0,0 +1,254 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QLineEdit, QSpinBox, QDoubleSpinBox, QStyle
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QSize, Signal
+from line_items import LineItem
+from line_totals import LineItemTotals
+from ui.assets import get_icon
+from ui.job_picker import JobComboBox, get_active_jobs_model
+
+# Column keys -> header text
+COLUMN_TITLES = {
+    "description": "Description",
+    "quantity": "Qty",
+    "is_stock": "Stock",
+    "job": "Job",
+    "unit_price": "Unit Price",
+    "total": "Total",
+    "delete": "",
+}
+
+QUOTE_COLUMNS = ["description", "quantity", "unit_price", "total", "delete"]
+PO_COLUMNS = ["description", "quantity", "is_stock", "job", "unit_price", "total", "delete"]
+
+MAX_QUANTITY = 9999
+MAX_PRICE = 999999
+
+
+def format_cents(cents):
+    return f"${cents / 100:.2f}"
+
+
+class LineItemsModel(QAbstractTableModel):
+    """
+    Line items of a quote or PO being edited, as LineItem objects.
+
+    columns picks which of COLUMN_TITLES are shown. self.totals follows
+    every edit, one line at a time; totals_changed is emitted whenever a
+    quantity or price changes or a line is added or removed.
+    """
+    totals_changed = Signal()
+
+    def __init__(self, columns, parent=None, tax_basis_points=0):
+        super().__init__(parent)
+        self.columns = columns
+        self.items = []
+        self.totals = LineItemTotals(tax_basis_points)
+
+        if "job" in columns:
+            # Job labels arrive (and change) with the shared jobs model
+            self.jobs_model = get_active_jobs_model()
+            self.jobs_model.rowsInserted.connect(self._jobs_changed)
+            self.jobs_model.dataChanged.connect(self._jobs_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMN_TITLES[self.columns[section]]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        column = self.columns[index.column()]
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if column in ("description", "quantity", "unit_price"):
+            flags |= Qt.ItemIsEditable
+        elif column == "job" and not self.items[index.row()].is_stock:
+            flags |= Qt.ItemIsEditable
+        elif column == "is_stock":
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.items[index.row()]
+        column = self.columns[index.column()]
+
+        if role == Qt.EditRole:
+            if column == "job":
+                return item.job_id
+            if column == "unit_price":
+                return item.unit_price / 100
+            return getattr(item, column, None)
+
+        if role == Qt.DisplayRole:
+            if column == "description":
+                return item.description
+            if column == "quantity":
+                return str(item.quantity)
+            if column == "unit_price":
+                return format_cents(item.unit_price)
+            if column == "total":
+                return format_cents(item.total)
+            if column == "job":
+                if item.is_stock or item.job_id is None:
+                    return ""
+                # Jobs archived since the line was saved aren't in the active list
+                return self.jobs_model.label(item.job_id) or f"Job #{item.job_id}"
+            return None
+
+        if role == Qt.CheckStateRole and column == "is_stock":
+            return Qt.Checked if item.is_stock else Qt.Unchecked
+
+        if role == Qt.TextAlignmentRole and column in ("quantity", "unit_price", "total"):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        item = self.items[index.row()]
+        column = self.columns[index.column()]
+
+        if role == Qt.CheckStateRole and column == "is_stock":
+            item.is_stock = Qt.CheckState(value) == Qt.Checked
+            if item.is_stock:
+                item.job_id = None # Stock isn't ordered for a job
+            self._row_changed(index.row())
+            return True
+
+        if role != Qt.EditRole:
+            return False
+        if column == "description":
+            item.description = value or ""
+        elif column == "quantity":
+            item.quantity = int(value)
+        elif column == "unit_price":
+            item.unit_price = round(float(value) * 100)
+        elif column == "job":
+            item.job_id = value
+        else:
+            return False
+        self._row_changed(index.row())
+        if column in ("quantity", "unit_price"):
+            self.totals.set_line(item, item.total)
+            self.totals_changed.emit()
+        return True
+
+    def set_items(self, items):
+        self.beginResetModel()
+        self.items = list(items)
+        self.totals.reset((item, item.total) for item in self.items)
+        self.endResetModel()
+        self.totals_changed.emit()
+
+    def add_item(self, item=None):
+        """Append a line and return its row"""
+        row = len(self.items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        item = item or LineItem()
+        self.items.append(item)
+        self.totals.set_line(item, item.total)
+        self.endInsertRows()
+        self.totals_changed.emit()
+        return row
+
+    def remove_item(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.totals.remove_line(self.items.pop(row))
+        self.endRemoveRows()
+        self.totals_changed.emit()
+
+    def rows(self):
+        """Lines to save (those with a description), for save_line_items"""
+        return [item.as_row() for item in self.items if item.description.strip()]
+
+    def _row_changed(self, row):
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+    def _jobs_changed(self, *args):
+        if self.items:
+            column = self.columns.index("job")
+            self.dataChanged.emit(self.index(0, column), self.index(len(self.items) - 1, column))
+
+
+class LineItemDelegate(QStyledItemDelegate):
+    """
+    Editors for LineItemsModel, created only for the cell being edited,
+    and a painted delete button instead of a widget per line.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.delete_icon = get_icon("fa5s.trash", color="#e74c3c")
+
+    def _column(self, index):
+        return index.model().columns[index.column()]
+
+    def createEditor(self, parent, option, index):
+        column = self._column(index)
+        if column == "description":
+            return QLineEdit(parent)
+        if column == "quantity":
+            editor = QSpinBox(parent)
+            editor.setRange(1, MAX_QUANTITY)
+            return editor
+        if column == "unit_price":
+            editor = QDoubleSpinBox(parent)
+            editor.setPrefix("$")
+            editor.setDecimals(2)
+            editor.setRange(0, MAX_PRICE)
+            return editor
+        if column == "job":
+            return JobComboBox(parent)
+        return None
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.EditRole)
+        column = self._column(index)
+        if column == "description":
+            editor.setText(value)
+        elif column in ("quantity", "unit_price"):
+            editor.setValue(value)
+        elif column == "job":
+            editor.set_job_id(value)
+
+    def setModelData(self, editor, model, index):
+        column = self._column(index)
+        if column == "description":
+            model.setData(index, editor.text())
+        elif column in ("quantity", "unit_price"):
+            editor.interpretText()
+            model.setData(index, editor.value())
+        elif column == "job" and editor.job_changed():
+            # An untouched editor keeps the line's job, even one that isn't active
+            model.setData(index, editor.job_id())
+
+    def paint(self, painter, option, index):
+        if self._column(index) != "delete":
+            super().paint(painter, option, index)
+            return
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        size = min(16, option.rect.height() - 4)
+        rect = QRect(0, 0, size, size)
+        rect.moveCenter(option.rect.center())
+        self.delete_icon.paint(painter, rect)
+
+    def sizeHint(self, option, index):
+        if self._column(index) == "delete":
+            return QSize(32, 24)
+        return super().sizeHint(option, index)
+
+    def editorEvent(self, event, model, option, index):
+        if self._column(index) == "delete":
+            if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+                model.remove_item(index.row())
+                return True
+            return event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick)
+        return super().editorEvent(event, model, option, index)
@@ -1,6 +1,7 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                               QPushButton, QStackedWidget, QLabel, QFrame, QSpacerItem, QSizePolicy)
-from PySide6.QtCore import Qt, QSize
+                               QPushButton, QStackedWidget, QLabel, QFrame, QSpacerItem, QSizePolicy,
+                               QApplication)
+from PySide6.QtCore import Qt, QSize, QTimer
 from ui.dashboard_widget import DashboardWidget
 from ui.jobs_widget import JobsWidget
 from ui.quotes_widget import QuotesWidget
@@ -13,13 +14,45 @@ from ui.search_widget import SearchWidget
 from ui.help_widget import HelpWidget
 from ui.about_widget import AboutWidget
 from ui.assets import get_icon, play_sound
+from ui.change_bus import get_change_bus
+from ui.change_detector import get_change_detector
+from ui.counter_board import get_counter_board
+from ui.theme import apply_theme
+from db_session import open_session
+from migrations import run_migrations
+import os
+import time
+
+# Pages built in the background once the dashboard is idle, most likely first
+PREFETCH_PAGES = ["Jobs"]
+PREFETCH_DELAY_MS = 1500
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, prefetch=True):
         super().__init__()
+        startup_started = time.perf_counter()
         self.setWindowTitle("PrintShop Pilot")
         self.resize(1200, 800)
         
+        # Card and page styles, parsed once for the whole app
+        apply_theme(QApplication.instance())
+        
+        # Create the change bus here so it lives on the UI thread
+        get_change_bus()
+        
+        # Indexes the pages rely on; only does work on the first start
+        db = open_session()
+        try:
+            run_migrations(db)
+        finally:
+            db.close()
+        
+        # Polls for other stations' changes
+        get_change_detector()
+        
+        # Header and dashboard counts, loaded in the background
+        get_counter_board()
+        
         # Main Layout
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
@@ -75,7 +108,11 @@ class MainWindow(QMainWindow):
         
         self.stack = QStackedWidget()
         
+        # Pages are built on first use; the stack holds a placeholder until then
         self.widgets = {}
+        self.page_labels = []
+        self.page_factories = {}
+        self.page_timings = {}
         
         for label, icon_name, widget_factory in nav_items:
             btn = QPushButton(f"  {label}")
@@ -107,59 +144,90 @@ class MainWindow(QMainWindow):
             sidebar_layout.addWidget(btn)
             self.nav_buttons.append(btn)
             
-            # Instantiate widget
-            if widget_factory:
-                # Check if it's a class or a lambda/function
-                if isinstance(widget_factory, type):
-                    widget_instance = widget_factory()
-                else:
-                    widget_instance = widget_factory()
-                    
-                self.stack.addWidget(widget_instance)
-                self.widgets[label] = widget_instance
-            else:
-                self.stack.addWidget(QWidget()) # Empty placeholder
+            self.page_labels.append(label)
+            self.page_factories[label] = widget_factory
+            self.stack.addWidget(QWidget()) # Placeholder until first shown
                 
         sidebar_layout.addStretch()
         
         main_layout.addWidget(self.sidebar)
         main_layout.addWidget(self.stack)
         
-        # Connect Dashboard Signals
-        if "Overview" in self.widgets:
-            dashboard = self.widgets["Overview"]
-            
-            if "Jobs" in self.widgets:
-                dashboard.new_job_signal.connect(self.widgets["Jobs"].open_new_job_dialog)
-            
-            if "Quotes" in self.widgets:
-                dashboard.new_quote_signal.connect(self.widgets["Quotes"].open_new_quote_dialog)
-                
-            if "Tasks" in self.widgets:
-                dashboard.new_task_signal.connect(self.widgets["Tasks"].open_new_task_dialog)
-                
-            if "Purchase Orders" in self.widgets:
-                dashboard.new_po_signal.connect(self.widgets["Purchase Orders"].open_new_po_dialog)
-                
-            if "Customers" in self.widgets:
-                dashboard.new_customer_signal.connect(self.widgets["Customers"].open_new_customer_dialog)
-        
-        # Connect Settings signal to dashboard
-        if "Settings" in self.widgets and "Overview" in self.widgets:
-            self.widgets["Settings"].settings_changed.connect(self.widgets["Overview"].refresh_welcome)
-        
         # Set initial page (Dashboard)
         if self.nav_buttons:
             self.nav_buttons[0].click()
+        
+        self.startup_ms = (time.perf_counter() - startup_started) * 1000
+        
+        if prefetch:
+            QTimer.singleShot(PREFETCH_DELAY_MS, self.prefetch_pages)
+        
+        if os.environ.get("PRINTSHOP_STARTUP_REPORT"):
+            print(self.startup_report())
+
+    def get_page(self, label):
+        """Return the page for a nav label, building it on first use"""
+        if label in self.widgets:
+            return self.widgets[label]
+        
+        index = self.page_labels.index(label)
+        started = time.perf_counter()
+        widget = self.page_factories[label]()
+        self.page_timings[label] = (time.perf_counter() - started) * 1000
+        
+        # Swap the placeholder for the real page
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, widget)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        
+        self.widgets[label] = widget
+        self.connect_page_signals(label, widget)
+        return widget
+
+    def connect_page_signals(self, label, widget):
+        """Wire cross-page signals for a freshly built page"""
+        if label == "Overview":
+            # Quick actions build their target page on demand
+            widget.new_job_signal.connect(lambda: self.get_page("Jobs").open_new_job_dialog())
+            widget.new_quote_signal.connect(lambda: self.get_page("Quotes").open_new_quote_dialog())
+            widget.new_task_signal.connect(lambda: self.get_page("Tasks").open_new_task_dialog())
+            widget.new_po_signal.connect(lambda: self.get_page("Purchase Orders").open_new_po_dialog())
+            widget.new_customer_signal.connect(lambda: self.get_page("Customers").open_new_customer_dialog())
+        elif label == "Settings":
+            widget.settings_changed.connect(self.on_settings_changed)
+
+    def on_settings_changed(self):
+        if "Overview" in self.widgets:
+            self.widgets["Overview"].refresh_welcome()
+
+    def prefetch_pages(self):
+        """Build the next likely page while the app is idle, one per tick"""
+        for label in PREFETCH_PAGES:
+            if label not in self.widgets:
+                self.get_page(label)
+                QTimer.singleShot(0, self.prefetch_pages)
+                return
+
+    def startup_report(self):
+        """Summarise startup time and what each built page cost"""
+        lines = [f"Startup: {self.startup_ms:.0f} ms"]
+        for label in self.page_labels:
+            if label in self.page_timings:
+                lines.append(f"  {label}: built in {self.page_timings[label]:.0f} ms")
+            else:
+                lines.append(f"  {label}: deferred")
+        return "\n".join(lines)
 
     def handle_nav_click(self, clicked_btn):
         # Play sound
-        self.sound_effect = play_sound("select") # Keep ref to prevent GC
+        play_sound("select")
         
         # Uncheck all others
         for i, btn in enumerate(self.nav_buttons):
             if btn == clicked_btn:
                 btn.setChecked(True)
+                self.get_page(self.page_labels[i])
                 self.stack.setCurrentIndex(i)
             else:
                 btn.setChecked(False)
@@ -0,0 +1,83 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex
+from sqlalchemy import inspect
+from projections import ProjectionRow
+
+
+def primary_key(obj):
+    return obj.id
+
+
+def row_signature(obj):
+    """Values of all mapped columns (or a projection row's fields), used to tell whether a row changed"""
+    if isinstance(obj, ProjectionRow):
+        return obj.values()
+    return tuple(getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs)
+
+
+def _runs(positions):
+    """Group sorted row numbers into (first, last) runs of consecutive rows"""
+    runs = []
+    for pos in positions:
+        if runs and runs[-1][1] == pos - 1:
+            runs[-1][1] = pos
+        else:
+            runs.append([pos, pos])
+    return runs
+
+
+def sync_rows(model, rows, new_rows, key=primary_key, signature=row_signature, old_signature=None):
+    """
+    Turn rows (the list backing a list/table model) into new_rows in place,
+    emitting only the model signals for what actually changed: removed rows,
+    a layout change if the surviving rows moved, inserted rows, and
+    dataChanged for rows whose signature differs. Views keep their
+    selection, scroll position and caches, unlike with a model reset.
+
+    old_signature is used for the current rows when the model's own state
+    behind signature() changes together with the rows.
+    """
+    old_signature = old_signature or signature
+    new_keys = {key(row): i for i, row in enumerate(new_rows)}
+    old_signatures = {key(row): old_signature(row) for row in rows if key(row) in new_keys}
+
+    # 1. Remove rows that are gone, last run first so positions stay valid
+    removed = [i for i, row in enumerate(rows) if key(row) not in new_keys]
+    for first, last in reversed(_runs(removed)):
+        model.beginRemoveRows(QModelIndex(), first, last)
+        del rows[first:last + 1]
+        model.endRemoveRows()
+
+    # 2. Reorder the surviving rows to match their order in new_rows
+    order = [key(row) for row in rows]
+    new_order = sorted(order, key=new_keys.get)
+    if order != new_order:
+        model.layoutAboutToBeChanged.emit()
+        new_positions = {k: i for i, k in enumerate(new_order)}
+        rows.sort(key=lambda row: new_keys[key(row)])
+        persistent = model.persistentIndexList()
+        model.changePersistentIndexList(
+            persistent,
+            [model.index(new_positions[order[index.row()]], index.column()) for index in persistent]
+        )
+        model.layoutChanged.emit()
+
+    # 3. Insert new rows; rows already holds the survivors in new order, so
+    # inserting at the final positions front to back produces new_rows
+    old_keys = set(old_signatures)
+    inserted = [i for i, row in enumerate(new_rows) if key(row) not in old_keys]
+    for first, last in _runs(inserted):
+        model.beginInsertRows(QModelIndex(), first, last)
+        rows[first:first] = new_rows[first:last + 1]
+        model.endInsertRows()
+
+    # 4. Swap in the fresh objects and report rows whose content changed
+    changed = []
+    for i, row in enumerate(new_rows):
+        k = key(row)
+        if k in old_signatures and old_signatures[k] != signature(row):
+            changed.append(i)
+        rows[i] = row
+    # List models keep columnCount private; they only have column 0
+    last_column = 0 if isinstance(model, QAbstractListModel) else model.columnCount() - 1
+    for first, last in _runs(changed):
+        model.dataChanged.emit(model.index(first, 0), model.index(last, last_column))
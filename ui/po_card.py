@@ -3,7 +3,9 @@ from PySide6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushBu
 from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtGui import QPainter, QColor, QPen
 from ui.assets import get_icon
+from ui.theme import styled
 from models import PurchaseOrder, POStatus
+from projections import PORow
 from datetime import date
 
 class POCardWidget(QFrame):
@@ -17,26 +19,8 @@ class POCardWidget(QFrame):
         self.setFixedWidth(280)
         self.setFixedHeight(180)
         
-        # Card background - light blue/cyan like mockup
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: #D5EEF2;
-                border: 1px solid #B8D8DD;
-                border-radius: 8px;
-            }}
-            QLabel {{ border: none; background: transparent; }}
-            QPushButton {{
-                border: none;
-                background: transparent;
-                color: #2c3e50;
-                font-size: 11px;
-                padding: 4px 8px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(0, 0, 0, 0.05);
-                border-radius: 4px;
-            }}
-        """)
+        # Colours come from the application theme (ui/theme.py)
+        styled(self, "card", kind="po")
         
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(12, 12, 12, 12)
@@ -47,26 +31,18 @@ class POCardWidget(QFrame):
         left_layout.setSpacing(4)
         
         # Traffic light circle
-        traffic_color = self._get_traffic_light_color()
-        circle_widget = QWidget()
+        traffic = self._get_traffic_state()
+        circle_widget = styled(QWidget(), "trafficLight", traffic=traffic)
+        circle_widget.setAttribute(Qt.WA_StyledBackground, True)
         circle_widget.setFixedSize(35, 35)
-        circle_widget.setStyleSheet(f"""
-            QWidget {{
-                background-color: {traffic_color};
-                border-radius: 17px;
-                border: none;
-            }}
-        """)
         left_layout.addWidget(circle_widget)
         
         # PO Number
-        po_num = QLabel(po.po_number)
-        po_num.setStyleSheet("font-weight: bold; font-size: 14px; color: #546E7A;")
+        po_num = styled(QLabel(po.po_number), "cardNumber")
         left_layout.addWidget(po_num)
         
         # Supplier Name
-        supplier = QLabel(po.supplier_name)
-        supplier.setStyleSheet("font-weight: bold; font-size: 14px; color: #2c3e50;")
+        supplier = styled(QLabel(po.supplier_name), "cardTitle")
         supplier.setWordWrap(True)
         left_layout.addWidget(supplier)
         
@@ -75,12 +51,10 @@ class POCardWidget(QFrame):
         # Due date / Received Date
         if po.status == POStatus.RECEIVED and po.received_date:
             date_text = po.received_date.strftime("%b %d, %Y")
-            date_label = QLabel(f"RECEIVED\n{date_text}")
-            date_label.setStyleSheet(f"color: #E67E22; font-size: 10px; font-weight: bold; line-height: 1.2;")
+            date_label = styled(QLabel(f"RECEIVED\n{date_text}"), "cardDate", traffic="orange")
         else:
             date_text = po.due_date.strftime("%b %d, %Y") if po.due_date else "No Due Date"
-            date_label = QLabel(f"DUE DATE\n{date_text}")
-            date_label.setStyleSheet(f"color: {traffic_color}; font-size: 10px; font-weight: bold; line-height: 1.2;")
+            date_label = styled(QLabel(f"DUE DATE\n{date_text}"), "cardDate", traffic=traffic)
         
         left_layout.addWidget(date_label)
         
@@ -122,42 +96,42 @@ class POCardWidget(QFrame):
         right_layout.setAlignment(Qt.AlignTop)
         
         # Linked Jobs Header
-        linked_jobs_label = QLabel("Linked Jobs")
-        linked_jobs_label.setStyleSheet("color: #7f8c8d; font-size: 11px;")
+        linked_jobs_label = styled(QLabel("Linked Jobs"), "cardCaption")
         linked_jobs_label.setAlignment(Qt.AlignRight)
         right_layout.addWidget(linked_jobs_label)
         
         # Linked Jobs List
-        # We need to aggregate jobs from items
-        linked_jobs = set()
-        if po.items:
-            for item in po.items:
-                if item.job_id:
-                     # We might need to fetch the job details if not eager loaded, 
-                     # but for now let's assume we can get basic info or just ID
-                     # Ideally the relationship is set up. 
-                     # If item.job is not available, we might just show IDs.
-                     # Let's try to access item.job if available, else just ID
-                     if hasattr(item, 'job') and item.job:
-                         linked_jobs.add(f"{item.job.job_number} - {item.job.customer_name}")
-                     else:
-                         linked_jobs.add(f"Job #{item.job_id}")
+        if isinstance(po, PORow):
+            # List page rows come with the labels
+            linked_jobs = po.linked_jobs
+        else:
+            # We need to aggregate jobs from items
+            linked_jobs = set()
+            if po.items:
+                for item in po.items:
+                    if item.job_id:
+                         # We might need to fetch the job details if not eager loaded, 
+                         # but for now let's assume we can get basic info or just ID
+                         # Ideally the relationship is set up. 
+                         # If item.job is not available, we might just show IDs.
+                         # Let's try to access item.job if available, else just ID
+                         if hasattr(item, 'job') and item.job:
+                             linked_jobs.add(f"{item.job.job_number} - {item.job.customer_name}")
+                         else:
+                             linked_jobs.add(f"Job #{item.job_id}")
 
         if linked_jobs:
             for job_str in list(linked_jobs)[:3]: # Show max 3
-                job_lbl = QLabel(job_str)
-                job_lbl.setStyleSheet("color: #546E7A; font-size: 10px;")
+                job_lbl = styled(QLabel(job_str), "cardDetail")
                 job_lbl.setAlignment(Qt.AlignRight)
                 right_layout.addWidget(job_lbl)
             
             if len(linked_jobs) > 3:
-                more_lbl = QLabel(f"+ {len(linked_jobs) - 3} more")
-                more_lbl.setStyleSheet("color: #7f8c8d; font-size: 10px; font-style: italic;")
+                more_lbl = styled(QLabel(f"+ {len(linked_jobs) - 3} more"), "cardMore")
                 more_lbl.setAlignment(Qt.AlignRight)
                 right_layout.addWidget(more_lbl)
         else:
-            no_jobs = QLabel("Stock")
-            no_jobs.setStyleSheet("color: #95a5a6; font-size: 10px; font-style: italic;")
+            no_jobs = styled(QLabel("Stock"), "cardEmpty")
             no_jobs.setAlignment(Qt.AlignRight)
             right_layout.addWidget(no_jobs)
 
@@ -174,14 +148,14 @@ class POCardWidget(QFrame):
     def _on_print_clicked(self):
         self.print_clicked.emit(self.po)
     
-    def _get_traffic_light_color(self):
+    def _get_traffic_state(self):
         if self.po.status == POStatus.TO_ORDER:
-            return "#3498db" # Blue
+            return "blue"
         elif self.po.status == POStatus.RECEIVED:
-            return "#E67E22" # Orange
+            return "orange"
         elif self.po.status == POStatus.WAITING_STOCK:
             if self.po.due_date and self.po.due_date < date.today():
-                return "#e74c3c" # Red - Overdue
+                return "red" # Overdue
             else:
-                return "#2ecc71" # Green
-        return "#95a5a6" # Grey default
+                return "green"
+        return "grey" # Default
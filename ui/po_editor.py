@@ -1,12 +1,16 @@
 
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QLineEdit, QDateEdit, 
-                               QComboBox, QTextEdit, QLabel, QTableWidget, QHeaderView, 
-                               QAbstractItemView, QPushButton, QHBoxLayout, QWidget, 
-                               QSpinBox, QCheckBox, QDoubleSpinBox, QTableWidgetItem, QMessageBox)
-from PySide6.QtCore import Qt, QDate, QUrl
+                               QComboBox, QTextEdit, QLabel, QTableView, QHeaderView, 
+                               QAbstractItemView, QPushButton, QHBoxLayout, QMessageBox)
+from PySide6.QtCore import QDate, QUrl
 from PySide6.QtGui import QDesktopServices
 from models import PurchaseOrder, POStatus, POItem, Job
-from database import get_db
+from db_session import session_scope, open_session
+from numbering import next_number
+from line_items import LineItem, save_po_items
+from ui.change_bus import record_change
+from ui.line_items_model import LineItemsModel, LineItemDelegate, PO_COLUMNS, format_cents
+from ui.data_service import get_data_service
 from ui.assets import get_icon, play_sound
 
 class POEditorDialog(QDialog):
@@ -67,10 +71,13 @@ class POEditorDialog(QDialog):
         items_label.setStyleSheet("font-size: 16px; font-weight: bold; margin-top: 10px;")
         layout.addWidget(items_label)
         
-        # Line Items Table
-        self.items_table = QTableWidget()
-        self.items_table.setColumnCount(7)
-        self.items_table.setHorizontalHeaderLabels(["Description", "Qty", "Stock", "Job", "Unit Price", "Total", ""])
+        # Line Items Table (editors are only created for the cell being edited)
+        self.items_model = LineItemsModel(PO_COLUMNS, self)
+        self.items_model.totals_changed.connect(self.calculate_total)
+        self.items_table = QTableView()
+        self.items_table.setModel(self.items_model)
+        self.items_table.setItemDelegate(LineItemDelegate(self.items_table))
+        self.items_table.setEditTriggers(QAbstractItemView.AllEditTriggers)
         self.items_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.items_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.items_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
@@ -83,10 +90,10 @@ class POEditorDialog(QDialog):
         layout.addWidget(self.items_table)
         
         # Add Line Item Button
-        add_item_btn = QPushButton("Add Item")
-        add_item_btn.setIcon(get_icon("fa5s.plus", color="#27ae60"))
-        add_item_btn.clicked.connect(self.add_line_item)
-        layout.addWidget(add_item_btn)
+        self.add_item_btn = QPushButton("Add Item")
+        self.add_item_btn.setIcon(get_icon("fa5s.plus", color="#27ae60"))
+        self.add_item_btn.clicked.connect(self.add_line_item)
+        layout.addWidget(self.add_item_btn)
         
         # Total Section
         total_layout = QHBoxLayout()
@@ -150,333 +157,45 @@ class POEditorDialog(QDialog):
         
         layout.addLayout(btn_layout)
         
-        # Load jobs for dropdowns
-        self.load_jobs()
-        
         # Load existing data if editing
         if not self.is_new:
             self.load_po_data()
-        else:
+        
+        if self.is_new:
             # Add one empty line item
             self.add_line_item()
+        else:
+            # The line items load in the background; the item buttons wait
+            # for them so a save can't drop existing items
+            self.add_item_btn.setEnabled(False)
+            self.save_btn.setEnabled(False)
+            self.load_items()
             
-    def load_jobs(self):
-        # Helper to get jobs for the comboboxes
-        db = next(get_db())
-        try:
-            self.active_jobs = db.query(Job).filter(Job.is_archived == False).order_by(Job.job_number.desc()).all()
-        finally:
-            db.close()
+    def load_items(self):
+        self.load_call = get_data_service().run(query_po_items, self.po.id, label="PO editor", budget=1)
+        self.load_call.finished.connect(self.on_items_loaded)
+        self.load_call.failed.connect(self.on_items_failed)
+
+    def on_items_loaded(self, items):
+        self.load_po_items(items)
+        self.add_item_btn.setEnabled(True)
+        self.save_btn.setEnabled(True)
+
+    def on_items_failed(self, message):
+        # Saving without the existing items would delete them, so don't offer it
+        QMessageBox.critical(self, "Error", f"Failed to load PO items:\n{message}")
+        self.reject()
 
     def on_status_changed(self, status):
         # Enable received date only when status is Received
         self.received_date_input.setEnabled(status == POStatus.RECEIVED.value)
         
     def add_line_item(self):
-        row = self.items_table.rowCount()
-        self.items_table.insertRow(row)
-        
-        # Description
-        desc = QLineEdit()
-        desc.textChanged.connect(self.calculate_total)
-        self.items_table.setCellWidget(row, 0, desc)
-        
-        # Quantity
-        qty = QSpinBox()
-        qty.setMinimum(1)
-        qty.setMaximum(9999)
-        qty.setValue(1)
-        qty.valueChanged.connect(lambda: self.update_line_total(row))
-        self.items_table.setCellWidget(row, 1, qty)
-        
-        # Stock Checkbox
-        stock_cb = QCheckBox()
-        stock_cb.stateChanged.connect(lambda state, r=row: self.on_stock_changed(state, r))
-        # Center the checkbox
-        cb_widget = QWidget()
-        cb_layout = QHBoxLayout(cb_widget)
-        cb_layout.addWidget(stock_cb)
-        cb_layout.setAlignment(Qt.AlignCenter)
-        cb_layout.setContentsMargins(0, 0, 0, 0)
-        self.items_table.setCellWidget(row, 2, cb_widget)
-        
-        # Job Selector
-        job_combo = QComboBox()
-        job_combo.addItem("Select Job...", None)
-        if not hasattr(self, 'active_jobs'):
-            self.load_jobs()
-            
-        for job in self.active_jobs:
-            job_combo.addItem(f"{job.job_number} - {job.customer_name}", job.id)
-            
-        self.items_table.setCellWidget(row, 3, job_combo)
-
-        # Unit Price
-        price = QDoubleSpinBox()
-        price.setPrefix("$")
-        price.setMinimum(0)
-        price.setMaximum(999999)
-        price.setDecimals(2)
-        price.valueChanged.connect(lambda: self.update_line_total(row))
-        self.items_table.setCellWidget(row, 4, price)
-        
-        # Total (read-only)
-        total = QTableWidgetItem("$0.00")
-        total.setFlags(total.flags() & ~Qt.ItemIsEditable)
-        self.items_table.setItem(row, 5, total)
-        
-        # Delete Button
-        delete_btn = QPushButton("Delete")
-        delete_btn.setIcon(get_icon("fa5s.trash", color="#e74c3c"))
-        delete_btn.clicked.connect(lambda: self.delete_line_item(row))
-        self.items_table.setCellWidget(row, 6, delete_btn)
-        
-    def on_stock_changed(self, state, row):
-        job_combo = self.items_table.cellWidget(row, 3)
-        if job_combo:
-            job_combo.setEnabled(state != Qt.Checked)
-            if state == Qt.Checked:
-                job_combo.setCurrentIndex(0) # Reset selection
-        
-    def delete_line_item(self, row):
-        self.items_table.removeRow(row)
-        self.calculate_total()
-        
-    def update_line_total(self, row):
-        qty_widget = self.items_table.cellWidget(row, 1)
-        price_widget = self.items_table.cellWidget(row, 4)
-        
-        if qty_widget and price_widget:
-            qty = qty_widget.value()
-            price = price_widget.value()
-            total = qty * price
-            
-            total_item = self.items_table.item(row, 5)
-            if total_item:
-                total_item.setText(f"${total:.2f}")
-                
-        self.calculate_total()
+        row = self.items_model.add_item()
+        self.items_table.setCurrentIndex(self.items_model.index(row, 0))
         
     def calculate_total(self):
-        total = 0
-        
-        for row in range(self.items_table.rowCount()):
-            total_item = self.items_table.item(row, 5)
-            if total_item:
-                total_text = total_item.text().replace("$", "")
-                try:
-                    total += float(total_text)
-                except:
-                    pass
-        
-        self.total_label.setText(f"${total:.2f}")
-        
-    def load_po_data(self):
-        self.supplier_input.setText(self.po.supplier_name)
-        if self.po.order_date:
-            self.order_date_input.setDate(QDate(self.po.order_date))
-        if self.po.expected_date:
-            self.expected_date_input.setDate(QDate(self.po.expected_date))
-        if self.po.received_date:
-            self.received_date_input.setDate(QDate(self.po.received_date))
-        self.status_input.setCurrentText(self.po.status)
-        self.notes_input.setPlainText(self.po.notes or "")
-        
-        # Load line items
-        db = next(get_db())
-        items = db.query(POItem).filter(POItem.po_id == self.po.id).all()
-        
-        for item in items:
-            row = self.items_table.rowCount()
-            self.items_table.insertRow(row)
-            
-            desc = QLineEdit(item.description)
-            desc.textChanged.connect(self.calculate_total)
-            self.items_table.setCellWidget(row, 0, desc)
-            
-            qty = QSpinBox()
-            qty.setValue(item.quantity)
-            qty.valueChanged.connect(lambda: self.update_line_total(row))
-            self.items_table.setCellWidget(row, 1, qty)
-            
-            price = QDoubleSpinBox()
-            price.setPrefix("$")
-            price.setValue(item.unit_price / 100)
-            price.setDecimals(2)
-            price.valueChanged.connect(lambda: self.update_line_total(row))
-            self.items_table.setCellWidget(row, 2, price)
-            
-            total = QTableWidgetItem(f"${item.total / 100:.2f}")
-            total.setFlags(total.flags() & ~Qt.ItemIsEditable)
-            self.items_table.setItem(row, 3, total)
-            
-            delete_btn = QPushButton("Delete")
-            delete_btn.setIcon(get_icon("fa5s.trash", color="#e74c3c"))
-            delete_btn.clicked.connect(lambda checked, r=row: self.delete_line_item(r))
-            self.items_table.setCellWidget(row, 4, delete_btn)
-            
-        self.calculate_total()
-        
-    def save_po(self):
-        # Validate
-        supplier_name = self.supplier_input.text().strip()
-        if not supplier_name:
-            play_sound("caution")
-            QMessageBox.warning(self, "Validation Error", "Supplier Name is required.")
-            return
-            
-        if self.items_table.rowCount() == 0:
-            play_sound("caution")
-            QMessageBox.warning(self, "Validation Error", "At least one item is required.")
-            return
-            
-        try:
-            db = next(get_db())
-            
-            # Convert total to cents
-            total_cents = int(float(self.total_label.text().replace("$", "")) * 100)
-            
-            if self.is_new:
-                # Generate PO number
-                latest = db.query(PurchaseOrder).order_by(PurchaseOrder.id.desc()).first()
-                next_num = (latest.id + 1) if latest else 1
-                po_number = f"PO{next_num:05d}"
-                
-                po = PurchaseOrder(
-                    po_number=po_number,
-                    supplier_name=supplier_name,
-                    order_date=self.order_date_input.date().toPython(),
-                    expected_date=self.expected_date_input.date().toPython(),
-                    received_date=self.received_date_input.date().toPython() if self.status_input.currentText() == POStatus.STOCK_ARRIVED.value else None,
-                    status=self.status_input.currentText(),
-                    notes=self.notes_input.toPlainText().strip() or None,
-                    total=total_cents,
-                    is_archived=(self.status_input.currentText() == POStatus.COMPLETE.value)
-                )
-                
-                # Handle Linked Jobs
-                selected_job_ids = []
-                for i in range(self.jobs_list.count()):
-                    item = self.jobs_list.item(i)
-                    if item.isSelected():
-                        selected_job_ids.append(item.data(Qt.UserRole))
-                
-                if selected_job_ids:
-                    selected_jobs = db.query(Job).filter(Job.id.in_(selected_job_ids)).all()
-                    po.jobs = selected_jobs
-                    po.job_id = selected_job_ids[0] # Legacy support
-                
-                db.add(po)
-                db.flush()
-                
-                # Save line items
-                for row in range(self.items_table.rowCount()):
-                    desc_widget = self.items_table.cellWidget(row, 0)
-                    qty_widget = self.items_table.cellWidget(row, 1)
-                    price_widget = self.items_table.cellWidget(row, 2)
-                    
-                    description = desc_widget.text().strip()
-                    if not description:
-                        continue
-                        
-                    quantity = qty_widget.value()
-                    unit_price_cents = int(price_widget.value() * 100)
-                    total_cents = quantity * unit_price_cents
-                    
-                    item = POItem(
-                        po_id=po.id,
-                        description=description,
-                        quantity=quantity,
-                        unit_price=unit_price_cents,
-                        total=total_cents
-                    )
-                    db.add(item)
-                    
-            else:
-                # Update existing PO
-                self.po.supplier_name = supplier_name
-                self.po.order_date = self.order_date_input.date().toPython()
-                self.po.expected_date = self.expected_date_input.date().toPython()
-                self.po.received_date = self.received_date_input.date().toPython() if self.status_input.currentText() == POStatus.STOCK_ARRIVED.value else None
-                self.po.status = self.status_input.currentText()
-                self.po.notes = self.notes_input.toPlainText().strip() or None
-                self.po.total = total_cents
-                
-                # Auto-archive if status is Complete
-                if self.status_input.currentText() == POStatus.COMPLETE.value:
-                    self.po.is_archived = True
-                
-                # Delete old items
-                db.query(POItem).filter(POItem.po_id == self.po.id).delete()
-                
-                # Save new items
-                for row in range(self.items_table.rowCount()):
-                    desc_widget = self.items_table.cellWidget(row, 0)
-                    qty_widget = self.items_table.cellWidget(row, 1)
-                    price_widget = self.items_table.cellWidget(row, 2)
-                    
-                    description = desc_widget.text().strip()
-                    if not description:
-                        continue
-                        
-                    quantity = qty_widget.value()
-                    unit_price_cents = int(price_widget.value() * 100)
-                    total_cents = quantity * unit_price_cents
-                    
-                    item = POItem(
-                        po_id=self.po.id,
-                        description=description,
-                        quantity=quantity,
-                        unit_price=unit_price_cents,
-                        total=total_cents
-                    )
-                    db.add(item)
-                    
-            db.commit()
-            print(f"PO saved successfully. Status: {self.status_input.currentText()}, Archived: {self.po.is_archived if not self.is_new else False}")
-            play_sound("celebration")
-            self.accept()
-            
-        except Exception as e:
-            print(f"Error saving PO: {e}")
-            import traceback
-            traceback.print_exc()
-            play_sound("caution")
-            QMessageBox.critical(self, "Error", f"Failed to save PO:\n{str(e)}")
-            db.rollback()
-        
-    def delete_line_item(self, row):
-        self.items_table.removeRow(row)
-        self.calculate_total()
-        
-    def update_line_total(self, row):
-        qty_widget = self.items_table.cellWidget(row, 1)
-        price_widget = self.items_table.cellWidget(row, 2)
-        
-        if qty_widget and price_widget:
-            qty = qty_widget.value()
-            price = price_widget.value()
-            total = qty * price
-            
-            total_item = self.items_table.item(row, 3)
-            if total_item:
-                total_item.setText(f"${total:.2f}")
-                
-        self.calculate_total()
-        
-    def calculate_total(self):
-        total = 0
-        
-        for row in range(self.items_table.rowCount()):
-            total_item = self.items_table.item(row, 3)
-            if total_item:
-                total_text = total_item.text().replace("$", "")
-                try:
-                    total += float(total_text)
-                except:
-                    pass
-        
-        self.total_label.setText(f"${total:.2f}")
+        self.total_label.setText(format_cents(self.items_model.totals.total))
         
     def load_po_data(self):
         self.supplier_input.setText(self.po.supplier_name)
@@ -489,75 +208,14 @@ class POEditorDialog(QDialog):
         self.status_input.setCurrentText(self.po.status)
         self.notes_input.setPlainText(self.po.notes or "")
         
-        # Load line items
-        db = next(get_db())
-        items = db.query(POItem).filter(POItem.po_id == self.po.id).all()
-        
-        # Ensure active jobs are loaded
-        if not hasattr(self, 'active_jobs'):
-            self.load_jobs()
-
-        for item in items:
-            row = self.items_table.rowCount()
-            self.items_table.insertRow(row)
-            
-            desc = QLineEdit(item.description)
-            desc.textChanged.connect(self.calculate_total)
-            self.items_table.setCellWidget(row, 0, desc)
-            
-            qty = QSpinBox()
-            qty.setValue(item.quantity)
-            qty.valueChanged.connect(lambda: self.update_line_total(row))
-            self.items_table.setCellWidget(row, 1, qty)
-            
-            # Stock Checkbox
-            stock_cb = QCheckBox()
-            stock_cb.setChecked(item.is_stock)
-            stock_cb.stateChanged.connect(lambda state, r=row: self.on_stock_changed(state, r))
-            cb_widget = QWidget()
-            cb_layout = QHBoxLayout(cb_widget)
-            cb_layout.addWidget(stock_cb)
-            cb_layout.setAlignment(Qt.AlignCenter)
-            cb_layout.setContentsMargins(0, 0, 0, 0)
-            self.items_table.setCellWidget(row, 2, cb_widget)
-
-            # Job Selector
-            job_combo = QComboBox()
-            job_combo.addItem("Select Job...", None)
-            for job in self.active_jobs:
-                job_combo.addItem(f"{job.job_number} - {job.customer_name}", job.id)
-            
-            if item.job_id:
-                index = job_combo.findData(item.job_id)
-                if index >= 0:
-                    job_combo.setCurrentIndex(index)
-            
-            job_combo.setEnabled(not item.is_stock)
-            self.items_table.setCellWidget(row, 3, job_combo)
-
-            price = QDoubleSpinBox()
-            price.setPrefix("$")
-            price.setValue(item.unit_price / 100)
-            price.setDecimals(2)
-            price.valueChanged.connect(lambda: self.update_line_total(row))
-            self.items_table.setCellWidget(row, 4, price)
-            
-            total = QTableWidgetItem(f"${item.total / 100:.2f}")
-            total.setFlags(total.flags() & ~Qt.ItemIsEditable)
-            self.items_table.setItem(row, 5, total)
-            
-            delete_btn = QPushButton("Delete")
-            delete_btn.setIcon(get_icon("fa5s.trash", color="#e74c3c"))
-            delete_btn.clicked.connect(lambda checked, r=row: self.delete_line_item(r))
-            self.items_table.setCellWidget(row, 6, delete_btn)
-            
-        self.calculate_total()
+    def load_po_items(self, items):
+        self.items_model.set_items([LineItem.from_record(item) for item in items])
         
     def send_email(self):
         """Open default email client with supplier email"""
         # Try to get email from supplier record
         supplier_email = None
-        db = next(get_db())
+        db = open_session()
         try:
             from models import Supplier
             supplier = db.query(Supplier).filter(Supplier.supplier_name == self.supplier_input.text().strip()).first()
@@ -581,126 +239,65 @@ class POEditorDialog(QDialog):
             QMessageBox.warning(self, "Validation Error", "Supplier Name is required.")
             return
             
-        if self.items_table.rowCount() == 0:
+        if self.items_model.rowCount() == 0:
             play_sound("caution")
             QMessageBox.warning(self, "Validation Error", "At least one item is required.")
             return
             
         try:
-            db = next(get_db())
+            with session_scope() as db:
             
-            # Convert total to cents
-            total_cents = int(float(self.total_label.text().replace("$", "")) * 100)
+                total_cents = self.items_model.totals.total
             
-            if self.is_new:
-                # Generate PO number
-                latest = db.query(PurchaseOrder).order_by(PurchaseOrder.id.desc()).first()
-                next_num = (latest.id + 1) if latest else 1
-                po_number = f"PO{next_num:05d}"
-                
-                po = PurchaseOrder(
-                    po_number=po_number,
-                    supplier_name=supplier_name,
-                    order_date=self.order_date_input.date().toPython(),
-                    due_date=self.expected_date_input.date().toPython(),
-                    received_date=self.received_date_input.date().toPython() if self.status_input.currentText() == POStatus.RECEIVED.value else None,
-                    status=self.status_input.currentText(),
-                    notes=self.notes_input.toPlainText().strip() or None,
-                    total=total_cents,
-                    is_archived=(self.status_input.currentText() == POStatus.COMPLETE.value)
-                )
+                if self.is_new:
+                    po_number = next_number(db, "purchase_order")
                 
-                db.add(po)
-                db.flush()
-                
-                # Save line items
-                for row in range(self.items_table.rowCount()):
-                    desc_widget = self.items_table.cellWidget(row, 0)
-                    qty_widget = self.items_table.cellWidget(row, 1)
-                    stock_widget = self.items_table.cellWidget(row, 2).findChild(QCheckBox)
-                    job_widget = self.items_table.cellWidget(row, 3)
-                    price_widget = self.items_table.cellWidget(row, 4)
-                    
-                    description = desc_widget.text().strip()
-                    if not description:
-                        continue
-                        
-                    quantity = qty_widget.value()
-                    is_stock = stock_widget.isChecked()
-                    job_id = job_widget.currentData() if not is_stock else None
-                    unit_price_cents = int(price_widget.value() * 100)
-                    total_cents = quantity * unit_price_cents
-                    
-                    item = POItem(
-                        po_id=po.id,
-                        description=description,
-                        quantity=quantity,
-                        unit_price=unit_price_cents,
+                    po = PurchaseOrder(
+                        po_number=po_number,
+                        supplier_name=supplier_name,
+                        order_date=self.order_date_input.date().toPython(),
+                        due_date=self.expected_date_input.date().toPython(),
+                        received_date=self.received_date_input.date().toPython() if self.status_input.currentText() == POStatus.RECEIVED.value else None,
+                        status=self.status_input.currentText(),
+                        notes=self.notes_input.toPlainText().strip() or None,
                         total=total_cents,
-                        is_stock=is_stock,
-                        job_id=job_id
+                        is_archived=(self.status_input.currentText() == POStatus.COMPLETE.value),
+                        # Link PO to job if created from job editor; a new PO has no jobs to load
+                        jobs=[db.get(Job, self.job.id)] if self.job else []
                     )
-                    db.add(item)
                 
-                # Link PO to job if created from job editor
-                if self.job:
-                    if self.job not in po.jobs:
-                        po.jobs.append(self.job)
+                    db.add(po)
+                    db.flush()
+                
+                    # Save line items
+                    save_po_items(db, po.id, self.items_model.rows())
                     
-            else:
-                # Update existing PO
-                # Re-query to get attached object
-                po = db.query(PurchaseOrder).get(self.po.id)
+                else:
+                    # Update existing PO
+                    # Re-query to get attached object
+                    po = db.query(PurchaseOrder).get(self.po.id)
                 
-                po.supplier_name = supplier_name
-                po.order_date = self.order_date_input.date().toPython()
-                po.due_date = self.expected_date_input.date().toPython()
-                po.received_date = self.received_date_input.date().toPython() if self.status_input.currentText() == POStatus.RECEIVED.value else None
-                po.status = self.status_input.currentText()
-                po.notes = self.notes_input.toPlainText().strip() or None
+                    po.supplier_name = supplier_name
+                    po.order_date = self.order_date_input.date().toPython()
+                    po.due_date = self.expected_date_input.date().toPython()
+                    po.received_date = self.received_date_input.date().toPython() if self.status_input.currentText() == POStatus.RECEIVED.value else None
+                    po.status = self.status_input.currentText()
+                    po.notes = self.notes_input.toPlainText().strip() or None
 
-                po.total = total_cents
-                
-                # Auto-archive if status is Complete
-                if self.status_input.currentText() == POStatus.COMPLETE.value:
-                    po.is_archived = True
+                    po.total = total_cents
                 
-                # Delete old items
-                db.query(POItem).filter(POItem.po_id == po.id).delete()
+                    # Auto-archive if status is Complete
+                    if self.status_input.currentText() == POStatus.COMPLETE.value:
+                        po.is_archived = True
                 
-                # Save new items
-                for row in range(self.items_table.rowCount()):
-                    desc_widget = self.items_table.cellWidget(row, 0)
-                    qty_widget = self.items_table.cellWidget(row, 1)
-                    stock_widget = self.items_table.cellWidget(row, 2).findChild(QCheckBox)
-                    job_widget = self.items_table.cellWidget(row, 3)
-                    price_widget = self.items_table.cellWidget(row, 4)
+                    # Write only the lines that changed
+                    if save_po_items(db, po.id, self.items_model.rows()):
+                        record_change(db, "purchase_order", po.id)
                     
-                    description = desc_widget.text().strip()
-                    if not description:
-                        continue
-                        
-                    quantity = qty_widget.value()
-                    is_stock = stock_widget.isChecked()
-                    job_id = job_widget.currentData() if not is_stock else None
-                    unit_price_cents = int(price_widget.value() * 100)
-                    total_cents = quantity * unit_price_cents
-                    
-                    item = POItem(
-                        po_id=po.id,
-                        description=description,
-                        quantity=quantity,
-                        unit_price=unit_price_cents,
-                        total=total_cents,
-                        is_stock=is_stock,
-                        job_id=job_id
-                    )
-                    db.add(item)
-                    
-            db.commit()
-            print(f"PO saved successfully. Status: {self.status_input.currentText()}, Archived: {self.po.is_archived if not self.is_new else False}")
-            play_sound("celebration")
-            self.accept()
+                db.commit()
+                print(f"PO saved successfully. Status: {self.status_input.currentText()}, Archived: {self.po.is_archived if not self.is_new else False}")
+                play_sound("celebration")
+                self.accept()
             
         except Exception as e:
             print(f"Error saving PO: {e}")
@@ -708,4 +305,8 @@ class POEditorDialog(QDialog):
             traceback.print_exc()
             play_sound("caution")
             QMessageBox.critical(self, "Error", f"Failed to save PO:\n{str(e)}")
-            db.rollback()
+
+
+def query_po_items(db, po_id):
+    """The PO's line items, for the editor table"""
+    return db.query(POItem).filter(POItem.po_id == po_id).all()
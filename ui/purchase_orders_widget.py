@@ -1,50 +1,44 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                               QLabel, QScrollArea, QFrame, QGridLayout, QMessageBox, QLineEdit)
+                               QLabel, QScrollArea, QMessageBox, QLineEdit)
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QColor
 from ui.assets import get_icon, play_sound
-from database import get_db
-from models import PurchaseOrder, POStatus
-from datetime import date
+from models import PurchaseOrder
+from projections import PORow, load_entity
+from datetime import datetime
+from ui.search_controller import SearchController
 from ui.po_card import POCardWidget
+from ui.flow_layout import FlowLayout
+from ui.change_bus import get_change_bus
+from ui.change_detector import PageRefresher
+from ui.counter_board import get_counter_board
+from ui.data_service import get_data_service
+from ui.report_export import export_report, format_date, format_cents
 
-class FlowLayout(QFrame):
-    """Simple flow layout for cards"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        # Grey background
-        self.setStyleSheet("QFrame { background-color: #F0F0F0; border: none; }")
-        
-        # Use GridLayout for card arrangement
-        self.grid = QGridLayout(self)
-        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.grid.setContentsMargins(10, 10, 10, 10)
-        self.grid.setSpacing(20)
+# Queries a page load may issue: the POs, then the jobs their items are for
+PO_QUERY_BUDGET = 2
 
-    def clear(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+def po_sort_key(po):
+    # Same order as query_pos: newest first
+    return (po.created_at is not None, po.created_at or datetime.min)
 
-    def add_cards(self, pos, on_view, on_edit, on_print):
-        self.clear()
-        cols = 5 # Number of columns (5 cards wide)
-        for i, po in enumerate(pos):
-            card = POCardWidget(po)
-            card.clicked.connect(on_view)
-            card.edit_clicked.connect(on_edit)
-            card.print_clicked.connect(on_print)
-            row = i // cols
-            col = i % cols
-            self.grid.addWidget(card, row, col)
+# Columns of the exported purchase orders report: (header, relative width, value)
+PO_REPORT_COLUMNS = [
+    ("PO #", 1, lambda po: po.po_number),
+    ("Supplier", 2.5, lambda po: po.supplier_name),
+    ("Description", 3, lambda po: po.description),
+    ("Ordered", 1.2, lambda po: format_date(po.order_date)),
+    ("Due", 1.2, lambda po: format_date(po.due_date)),
+    ("Status", 1.3, lambda po: po.status),
+    ("Total", 1.2, lambda po: format_cents(po.total)),
+]
 
 class PurchaseOrdersWidget(QWidget):
     def __init__(self):
         super().__init__()
         
-        # Set grey background
-        self.setStyleSheet("QWidget { background-color: #F0F0F0; }")
+        # Grey background, from the application theme
+        self.setObjectName("page")
         
         layout = QVBoxLayout(self)
         
@@ -123,6 +117,7 @@ class PurchaseOrdersWidget(QWidget):
         self.search_box.setPlaceholderText("Search purchase orders...")
         self.search_box.setFixedWidth(300)
         self.search_box.textChanged.connect(self.on_search)
+        self.search_controller = SearchController(self.query_pos, self.apply_pos, self, budget=PO_QUERY_BUDGET)
         self.search_box.setStyleSheet("""
             QLineEdit {
                 padding: 8px;
@@ -178,30 +173,35 @@ class PurchaseOrdersWidget(QWidget):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: transparent; }")
-        self.cards_container = FlowLayout()
+        self.cards_container = FlowLayout(self.make_card, sort_key=po_sort_key, descending=True)
         self.scroll_area.setWidget(self.cards_container)
         
         layout.addWidget(self.scroll_area)
         
         self.new_po_btn.clicked.connect(self.open_new_po_dialog)
         self.print_btn.clicked.connect(self.print_pos_page)
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+        self.refresher = PageRefresher(self, ["purchase_order"], self.refresh_data) # Other stations' changes
+        get_counter_board().changed.connect(self.update_counts)
+        self.update_counts()
         
         self.refresh_data()
 
     def on_search(self, text):
-        self.refresh_data(search=text)
+        self.search_controller.search(text)
 
     def open_new_po_dialog(self):
         from ui.po_editor import POEditorDialog
         dialog = POEditorDialog(self)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
 
     def edit_po(self, po):
         from ui.po_editor import POEditorDialog
+        po = load_entity(po)
+        if po is None:
+            return # Deleted elsewhere; the change bus drops its card
         dialog = POEditorDialog(self, po)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
             
     def view_po(self, po):
         # For now, view is same as edit but maybe read-only?
@@ -213,83 +213,76 @@ class PurchaseOrdersWidget(QWidget):
         # Placeholder for single PO print
         QMessageBox.information(self, "Print PO", f"Printing PO {po.po_number} is not yet implemented.")
 
-    def refresh_data(self, search=""):
-        db = next(get_db())
-        try:
-            query = db.query(PurchaseOrder).filter(PurchaseOrder.is_archived == False)
-            
-            if search:
-                search_filter = f"%{search}%"
-                query = query.filter(
-                    (PurchaseOrder.po_number.like(search_filter)) |
-                    (PurchaseOrder.supplier_name.like(search_filter)) |
-                    (PurchaseOrder.description.like(search_filter))
-                )
-            
-            pos = query.order_by(PurchaseOrder.created_at.desc()).all()
-            
-            # Calculate counts
-            today = date.today()
-            to_order = 0
-            waiting_stock = 0
-            received = 0
-            overdue = 0
-            
-            for po in pos:
-                if po.status == POStatus.TO_ORDER:
-                    to_order += 1
-                elif po.status == POStatus.RECEIVED:
-                    received += 1
-                elif po.status == POStatus.WAITING_STOCK:
-                    if po.due_date and po.due_date < today:
-                        overdue += 1
-                    else:
-                        waiting_stock += 1
-            
-            # Update Traffic Light labels
-            self.to_order_count.setText(str(to_order))
-            self.waiting_stock_count.setText(str(waiting_stock))
-            self.received_count.setText(str(received))
-            self.overdue_count.setText(str(overdue))
-            
-            # Update Cards
-            self.cards_container.add_cards(pos, self.view_po, self.edit_po, self.print_po)
-            
-        finally:
-            db.close()
-            
-    def print_pos_page(self):
-        """Print the entire PO Management page in landscape"""
-        from PySide6.QtPrintSupport import QPrinter, QPrintDialog
-        from PySide6.QtGui import QPainter, QPageLayout
-        from PySide6.QtCore import QMarginsF
-        
-        printer = QPrinter(QPrinter.HighResolution)
-        # Set landscape orientation
-        printer.setPageOrientation(QPageLayout.Landscape)
-        # Set margins
-        margins = QMarginsF(10, 10, 10, 10)
-        printer.setPageMargins(margins, QPageLayout.Millimeter)
+    def refresh_data(self, search=None):
+        """Reload the page in the background, keeping the current search text"""
+        if search is None:
+            search = self.search_box.text()
+        self.search_controller.refresh(search)
+
+    def pos_query(self, db, search):
+        query = db.query(PurchaseOrder).filter(PurchaseOrder.is_archived == False)
         
-        dialog = QPrintDialog(printer, self)
-        if dialog.exec():
-            painter = QPainter(printer)
-            
-            # Get the scroll area widget (cards container)
-            widget_to_print = self.scroll_area.widget()
-            
-            # Calculate scaling to fit to page
-            page_rect = printer.pageRect(QPrinter.DevicePixel)
-            widget_rect = widget_to_print.rect()
-            
-            # Scale to fit width and height
-            scale_x = page_rect.width() / widget_rect.width()
-            scale_y = page_rect.height() / widget_rect.height()
-            scale = min(scale_x, scale_y)
-            
-            painter.scale(scale, scale)
-            
-            # Render the widget
-            widget_to_print.render(painter)
+        if search:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                (PurchaseOrder.po_number.like(search_filter)) |
+                (PurchaseOrder.supplier_name.like(search_filter)) |
+                (PurchaseOrder.description.like(search_filter))
+            )
+        return query
+
+    def query_pos(self, db, search):
+        """Load the purchase orders to show; runs on a search worker thread"""
+        return PORow.all(self.pos_query(db, search).order_by(PurchaseOrder.created_at.desc()))
+
+    def report_pos(self, db, search):
+        """The page's purchase orders in page order, for the PDF export"""
+        return (
+            self.pos_query(db, search)
+            .order_by(PurchaseOrder.created_at.desc(), PurchaseOrder.id)
+        )
+
+    def query_one_po(self, db, po_id, search):
+        """Load one purchase order if it belongs on the page, else None"""
+        return PORow.first(self.pos_query(db, search).filter(PurchaseOrder.id == po_id))
+
+    def make_card(self, po):
+        card = POCardWidget(po)
+        card.clicked.connect(self.view_po)
+        card.edit_clicked.connect(self.edit_po)
+        card.print_clicked.connect(self.print_po)
+        return card
+
+    def apply_pos(self, pos):
+        self.cards_container.add_cards(pos)
+
+    def update_counts(self):
+        """Header counts over all active purchase orders, whatever the search"""
+        counts = get_counter_board().counts("purchase_order")
+        self.to_order_count.setText(str(counts["to_order"]))
+        self.waiting_stock_count.setText(str(counts["waiting_stock"]))
+        self.received_count.setText(str(counts["received"]))
+        self.overdue_count.setText(str(counts["overdue"]))
+
+    def on_entity_changed(self, entity, entity_id, kind):
+        """Patch the one changed card instead of reloading the page"""
+        if entity != "purchase_order":
+            return
+        if kind == "delete":
+            self.cards_container.remove_card(entity_id)
+            return
+        call = get_data_service().run(self.query_one_po, entity_id, self.search_box.text(),
+                                      label="query_one_po", budget=PO_QUERY_BUDGET)
+        call.finished.connect(lambda po: self.apply_po(entity_id, po))
+        call.failed.connect(lambda message: self.refresh_data())
+
+    def apply_po(self, po_id, po):
+        if po is None:
+            # Archived, or no longer matches the search
+            self.cards_container.remove_card(po_id)
+        else:
+            self.cards_container.upsert_card(po)
             
-            painter.end()
+    def print_pos_page(self):
+        """Export the purchase orders on the page (current search) as a paginated PDF"""
+        export_report(self, "Purchase Orders", PO_REPORT_COLUMNS, self.report_pos, self.search_box.text())
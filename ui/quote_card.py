@@ -2,6 +2,7 @@ from PySide6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushBu
                                QWidget)
 from PySide6.QtCore import Qt, Signal, QSize
 from ui.assets import get_icon
+from ui.theme import status_key, styled
 from models import Quote, QuoteStatus
 from datetime import date
 
@@ -16,26 +17,8 @@ class QuoteCardWidget(QFrame):
         self.setFixedWidth(280)
         self.setFixedHeight(180)
         
-        # Card background - light blue/cyan like JobCard and POCard
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: #D5EEF2;
-                border: 1px solid #B8D8DD;
-                border-radius: 8px;
-            }}
-            QLabel {{ border: none; background: transparent; }}
-            QPushButton {{
-                border: none;
-                background: transparent;
-                color: #2c3e50;
-                font-size: 11px;
-                padding: 4px 8px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(0, 0, 0, 0.05);
-                border-radius: 4px;
-            }}
-        """)
+        # Colours come from the application theme (ui/theme.py)
+        styled(self, "card", kind="quote")
         
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(12, 12, 12, 12)
@@ -46,19 +29,16 @@ class QuoteCardWidget(QFrame):
         left_layout.setSpacing(4)
         
         # Quote Number
-        quote_num = QLabel(quote.quote_number)
-        quote_num.setStyleSheet("font-weight: bold; font-size: 14px; color: #546E7A;")
+        quote_num = styled(QLabel(quote.quote_number), "cardNumber")
         left_layout.addWidget(quote_num)
         
         # Customer Name
-        customer = QLabel(quote.customer_name)
-        customer.setStyleSheet("font-weight: bold; font-size: 14px; color: #2c3e50;")
+        customer = styled(QLabel(quote.customer_name), "cardTitle")
         customer.setWordWrap(True)
         left_layout.addWidget(customer)
         
         # Total
-        total_label = QLabel(f"${quote.total / 100:.2f}")
-        total_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #27ae60;")
+        total_label = styled(QLabel(f"${quote.total / 100:.2f}"), "cardTotal")
         left_layout.addWidget(total_label)
         
         left_layout.addStretch()
@@ -69,7 +49,7 @@ class QuoteCardWidget(QFrame):
             date_label = QLabel(f"QUOTE: {date_text}\nEXPIRES: {quote.expiry_date.strftime('%b %d, %Y')}")
         else:
             date_label = QLabel(f"QUOTE: {date_text}")
-        date_label.setStyleSheet("color: #546E7A; font-size: 10px; font-weight: bold; line-height: 1.2;")
+        styled(date_label, "cardDate")
         left_layout.addWidget(date_label)
         
         # Bottom buttons row
@@ -110,16 +90,7 @@ class QuoteCardWidget(QFrame):
         right_layout.setAlignment(Qt.AlignTop)
         
         # Status badge
-        status_badge = QLabel(quote.status.upper())
-        status_bg, status_text = self._get_status_colors(quote.status)
-        status_badge.setStyleSheet(f"""
-            background-color: {status_bg};
-            color: {status_text};
-            padding: 4px 8px;
-            border-radius: 8px;
-            font-size: 9px;
-            font-weight: bold;
-        """)
+        status_badge = styled(QLabel(quote.status.upper()), "pill", status=status_key("quote", quote.status))
         status_badge.setAlignment(Qt.AlignCenter)
         status_badge.setWordWrap(True)
         right_layout.addWidget(status_badge)
@@ -136,18 +107,4 @@ class QuoteCardWidget(QFrame):
     
     def _on_print_clicked(self):
         self.print_clicked.emit(self.quote)
-    
-    def _get_status_colors(self, status):
-        """Get background and text colors for status badge"""
-        if status == QuoteStatus.DRAFT:
-            return "#95a5a6", "#FFFFFF"  # Grey
-        elif status == QuoteStatus.SENT:
-            return "#3498db", "#FFFFFF"  # Blue
-        elif status == QuoteStatus.ACCEPTED:
-            return "#27ae60", "#FFFFFF"  # Green
-        elif status == QuoteStatus.REJECTED:
-            return "#e74c3c", "#FFFFFF"  # Red
-        elif status == QuoteStatus.EXPIRED:
-            return "#f39c12", "#FFFFFF"  # Orange
-        else:
-            return "#95a5a6", "#FFFFFF"  # Default grey
+
@@ -1,10 +1,13 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                                QLineEdit, QTextEdit, QComboBox, QPushButton, QLabel, QMessageBox,
-                               QDateEdit, QTableWidget, QTableWidgetItem, QSpinBox, QDoubleSpinBox,
-                               QHeaderView, QAbstractItemView)
-from PySide6.QtCore import Qt, QDate
+                               QDateEdit, QTableView, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import QDate
 from ui.assets import play_sound, get_icon
-from database import get_db
+from db_session import session_scope, open_session
+from numbering import next_number
+from line_items import LineItem, save_quote_items, tax_rate_basis_points
+from ui.line_items_model import LineItemsModel, LineItemDelegate, QUOTE_COLUMNS, format_cents
+from ui.change_bus import record_change
 from models import Quote, QuoteItem, QuoteStatus
 from datetime import datetime, timedelta
 
@@ -53,10 +56,13 @@ class QuoteEditorDialog(QDialog):
         items_label.setStyleSheet("font-size: 16px; font-weight: bold; margin-top: 10px;")
         layout.addWidget(items_label)
         
-        # Line Items Table
-        self.items_table = QTableWidget()
-        self.items_table.setColumnCount(5)
-        self.items_table.setHorizontalHeaderLabels(["Description", "Qty", "Unit Price", "Total", ""])
+        # Line Items Table (editors are only created for the cell being edited)
+        self.items_model = LineItemsModel(QUOTE_COLUMNS, self, tax_rate_basis_points())
+        self.items_model.totals_changed.connect(self.calculate_totals)
+        self.items_table = QTableView()
+        self.items_table.setModel(self.items_model)
+        self.items_table.setItemDelegate(LineItemDelegate(self.items_table))
+        self.items_table.setEditTriggers(QAbstractItemView.AllEditTriggers)
         self.items_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.items_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.items_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
@@ -83,7 +89,7 @@ class QuoteEditorDialog(QDialog):
         
         self.tax_label = QLabel("$0.00")
         self.tax_label.setStyleSheet("font-size: 14px;")
-        totals_form.addRow("Tax (10%):", self.tax_label)
+        totals_form.addRow(f"Tax ({self.items_model.totals.rate_text}):", self.tax_label)
         
         self.total_label = QLabel("$0.00")
         self.total_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #2c3e50;")
@@ -127,79 +133,14 @@ class QuoteEditorDialog(QDialog):
             self.add_line_item()
             
     def add_line_item(self):
-        row = self.items_table.rowCount()
-        self.items_table.insertRow(row)
-        
-        # Description
-        desc = QLineEdit()
-        desc.textChanged.connect(self.calculate_totals)
-        self.items_table.setCellWidget(row, 0, desc)
-        
-        # Quantity
-        qty = QSpinBox()
-        qty.setMinimum(1)
-        qty.setMaximum(9999)
-        qty.setValue(1)
-        qty.valueChanged.connect(lambda: self.update_line_total(row))
-        self.items_table.setCellWidget(row, 1, qty)
-        
-        # Unit Price
-        price = QDoubleSpinBox()
-        price.setPrefix("$")
-        price.setMinimum(0)
-        price.setMaximum(999999)
-        price.setDecimals(2)
-        price.valueChanged.connect(lambda: self.update_line_total(row))
-        self.items_table.setCellWidget(row, 2, price)
-        
-        # Total (read-only)
-        total = QTableWidgetItem("$0.00")
-        total.setFlags(total.flags() & ~Qt.ItemIsEditable)
-        self.items_table.setItem(row, 3, total)
-        
-        # Delete Button
-        delete_btn = QPushButton("Delete")
-        delete_btn.setIcon(get_icon("fa5s.trash", color="#e74c3c"))
-        delete_btn.clicked.connect(lambda: self.delete_line_item(row))
-        self.items_table.setCellWidget(row, 4, delete_btn)
-        
-    def delete_line_item(self, row):
-        self.items_table.removeRow(row)
-        self.calculate_totals()
-        
-    def update_line_total(self, row):
-        qty_widget = self.items_table.cellWidget(row, 1)
-        price_widget = self.items_table.cellWidget(row, 2)
-        
-        if qty_widget and price_widget:
-            qty = qty_widget.value()
-            price = price_widget.value()
-            total = qty * price
-            
-            total_item = self.items_table.item(row, 3)
-            if total_item:
-                total_item.setText(f"${total:.2f}")
-                
-        self.calculate_totals()
+        row = self.items_model.add_item()
+        self.items_table.setCurrentIndex(self.items_model.index(row, 0))
         
     def calculate_totals(self):
-        subtotal = 0
-        
-        for row in range(self.items_table.rowCount()):
-            total_item = self.items_table.item(row, 3)
-            if total_item:
-                total_text = total_item.text().replace("$", "")
-                try:
-                    subtotal += float(total_text)
-                except:
-                    pass
-                    
-        tax = subtotal * 0.10
-        total = subtotal + tax
-        
-        self.subtotal_label.setText(f"${subtotal:.2f}")
-        self.tax_label.setText(f"${tax:.2f}")
-        self.total_label.setText(f"${total:.2f}")
+        totals = self.items_model.totals
+        self.subtotal_label.setText(format_cents(totals.subtotal))
+        self.tax_label.setText(format_cents(totals.tax))
+        self.total_label.setText(format_cents(totals.total))
         
     def load_quote_data(self):
         self.customer_input.setText(self.quote.customer_name)
@@ -210,39 +151,12 @@ class QuoteEditorDialog(QDialog):
         self.notes_input.setPlainText(self.quote.notes or "")
         
         # Load line items
-        db = next(get_db())
-        items = db.query(QuoteItem).filter(QuoteItem.quote_id == self.quote.id).all()
-        
-        for item in items:
-            row = self.items_table.rowCount()
-            self.items_table.insertRow(row)
-            
-            desc = QLineEdit(item.description)
-            desc.textChanged.connect(self.calculate_totals)
-            self.items_table.setCellWidget(row, 0, desc)
-            
-            qty = QSpinBox()
-            qty.setValue(item.quantity)
-            qty.valueChanged.connect(lambda: self.update_line_total(row))
-            self.items_table.setCellWidget(row, 1, qty)
-            
-            price = QDoubleSpinBox()
-            price.setPrefix("$")
-            price.setValue(item.unit_price / 100)
-            price.setDecimals(2)
-            price.valueChanged.connect(lambda: self.update_line_total(row))
-            self.items_table.setCellWidget(row, 2, price)
-            
-            total = QTableWidgetItem(f"${item.total / 100:.2f}")
-            total.setFlags(total.flags() & ~Qt.ItemIsEditable)
-            self.items_table.setItem(row, 3, total)
-            
-            delete_btn = QPushButton("Delete")
-            delete_btn.setIcon(get_icon("fa5s.trash", color="#e74c3c"))
-            delete_btn.clicked.connect(lambda checked, r=row: self.delete_line_item(r))
-            self.items_table.setCellWidget(row, 4, delete_btn)
-            
-        self.calculate_totals()
+        db = open_session()
+        try:
+            items = db.query(QuoteItem).filter(QuoteItem.quote_id == self.quote.id).all()
+            self.items_model.set_items([LineItem.from_record(item) for item in items])
+        finally:
+            db.close()
         
     def save_quote(self):
         # Validate
@@ -252,112 +166,60 @@ class QuoteEditorDialog(QDialog):
             QMessageBox.warning(self, "Validation Error", "Customer Name is required.")
             return
             
-        if self.items_table.rowCount() == 0:
+        if self.items_model.rowCount() == 0:
             play_sound("caution")
             QMessageBox.warning(self, "Validation Error", "At least one line item is required.")
             return
             
         try:
-            db = next(get_db())
+            with session_scope() as db:
             
-            # Convert totals to cents
-            subtotal_cents = int(float(self.subtotal_label.text().replace("$", "")) * 100)
-            tax_cents = int(float(self.tax_label.text().replace("$", "")) * 100)
-            total_cents = int(float(self.total_label.text().replace("$", "")) * 100)
+                totals = self.items_model.totals
+                subtotal_cents = totals.subtotal
+                tax_cents = totals.tax
+                total_cents = totals.total
             
-            if self.is_new:
-                # Generate quote number
-                # Find the latest quote number starting with "QN"
-                last_quote = db.query(Quote).filter(Quote.quote_number.like("QN%")).order_by(Quote.id.desc()).first()
-                
-                if last_quote and last_quote.quote_number:
-                    try:
-                        last_num = int(last_quote.quote_number[2:])
-                        new_num = last_num + 1
-                    except ValueError:
-                        new_num = 1
-                else:
-                    new_num = 1
-                
-                quote_number = f"QN{new_num:06d}"
-                
-                quote = Quote(
-                    quote_number=quote_number,
-                    customer_name=customer_name,
-                    quote_date=self.quote_date_input.date().toPython(),
-                    expiry_date=self.expiry_date_input.date().toPython(),
-                    status=self.status_input.currentText(),
-                    notes=self.notes_input.toPlainText().strip() or None,
-                    subtotal=subtotal_cents,
-                    tax=tax_cents,
-                    total=total_cents
-                )
-                db.add(quote)
-                db.flush()  # Get the ID
+                if self.is_new:
+                    quote_number = next_number(db, "quote")
                 
-                # Save line items
-                for row in range(self.items_table.rowCount()):
-                    desc_widget = self.items_table.cellWidget(row, 0)
-                    qty_widget = self.items_table.cellWidget(row, 1)
-                    price_widget = self.items_table.cellWidget(row, 2)
-                    
-                    description = desc_widget.text().strip()
-                    if not description:
-                        continue
-                        
-                    quantity = qty_widget.value()
-                    unit_price_cents = int(price_widget.value() * 100)
-                    total_cents = quantity * unit_price_cents
-                    
-                    item = QuoteItem(
-                        quote_id=quote.id,
-                        description=description,
-                        quantity=quantity,
-                        unit_price=unit_price_cents,
+                    quote = Quote(
+                        quote_number=quote_number,
+                        customer_name=customer_name,
+                        quote_date=self.quote_date_input.date().toPython(),
+                        expiry_date=self.expiry_date_input.date().toPython(),
+                        status=self.status_input.currentText(),
+                        notes=self.notes_input.toPlainText().strip() or None,
+                        subtotal=subtotal_cents,
+                        tax=tax_cents,
                         total=total_cents
                     )
-                    db.add(item)
+                    db.add(quote)
+                    db.flush()  # Get the ID
+                
+                    # Save line items
+                    save_quote_items(db, quote.id, self.items_model.rows())
                     
-            else:
-                # Update existing quote
-                self.quote.customer_name = customer_name
-                self.quote.quote_date = self.quote_date_input.date().toPython()
-                self.quote.expiry_date = self.expiry_date_input.date().toPython()
-                self.quote.status = self.status_input.currentText()
-                self.quote.notes = self.notes_input.toPlainText().strip() or None
-                self.quote.subtotal = subtotal_cents
-                self.quote.tax = tax_cents
-                self.quote.total = total_cents
+                else:
+                    # Update existing quote
+                    # Re-query to get attached object
+                    quote = db.query(Quote).get(self.quote.id)
                 
-                # Delete old items
-                db.query(QuoteItem).filter(QuoteItem.quote_id == self.quote.id).delete()
+                    quote.customer_name = customer_name
+                    quote.quote_date = self.quote_date_input.date().toPython()
+                    quote.expiry_date = self.expiry_date_input.date().toPython()
+                    quote.status = self.status_input.currentText()
+                    quote.notes = self.notes_input.toPlainText().strip() or None
+                    quote.subtotal = subtotal_cents
+                    quote.tax = tax_cents
+                    quote.total = total_cents
                 
-                # Save new items
-                for row in range(self.items_table.rowCount()):
-                    desc_widget = self.items_table.cellWidget(row, 0)
-                    qty_widget = self.items_table.cellWidget(row, 1)
-                    price_widget = self.items_table.cellWidget(row, 2)
-                    
-                    description = desc_widget.text().strip()
-                    if not description:
-                        continue
-                        
-                    quantity = qty_widget.value()
-                    unit_price_cents = int(price_widget.value() * 100)
-                    total_cents = quantity * unit_price_cents
-                    
-                    item = QuoteItem(
-                        quote_id=self.quote.id,
-                        description=description,
-                        quantity=quantity,
-                        unit_price=unit_price_cents,
-                        total=total_cents
-                    )
-                    db.add(item)
+                    # Write only the lines that changed
+                    if save_quote_items(db, quote.id, self.items_model.rows()):
+                        record_change(db, "quote", quote.id)
                     
-            db.commit()
-            play_sound("celebration")
-            self.accept()
+                db.commit()
+                play_sound("celebration")
+                self.accept()
             
         except Exception as e:
             play_sound("caution")
@@ -1,48 +1,40 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                               QLabel, QScrollArea, QFrame, QGridLayout, QMessageBox, QLineEdit)
+                               QLabel, QScrollArea, QMessageBox, QLineEdit)
 from PySide6.QtCore import Qt, QSize
 from ui.assets import get_icon, play_sound
-from database import get_db
 from models import Quote, QuoteStatus
+from ui.search_controller import SearchController
 from ui.quote_card import QuoteCardWidget
+from ui.flow_layout import FlowLayout
+from ui.change_bus import get_change_bus
+from ui.change_detector import PageRefresher
+from ui.counter_board import get_counter_board
+from ui.data_service import get_data_service
+from ui.report_export import export_report, format_date, format_cents
+from projections import QuoteRow, load_entity
+from datetime import date
 
-class FlowLayout(QFrame):
-    """Simple flow layout for cards"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        # Grey background
-        self.setStyleSheet("QFrame { background-color: #F0F0F0; border: none; }")
-        
-        # Use GridLayout for card arrangement
-        self.grid = QGridLayout(self)
-        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.grid.setContentsMargins(10, 10, 10, 10)
-        self.grid.setSpacing(20)
-
-    def clear(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+def quote_sort_key(quote):
+    # Same order as query_quotes: newest first, undated last
+    return (quote.quote_date is not None, quote.quote_date or date.min)
 
-    def add_cards(self, quotes, on_view, on_edit, on_print):
-        self.clear()
-        cols = 5 # Number of columns (5 cards wide)
-        for i, quote in enumerate(quotes):
-            card = QuoteCardWidget(quote)
-            card.clicked.connect(on_view)
-            card.edit_clicked.connect(on_edit)
-            card.print_clicked.connect(on_print)
-            row = i // cols
-            col = i % cols
-            self.grid.addWidget(card, row, col)
+# Columns of the exported quotes report: (header, relative width, value)
+QUOTE_REPORT_COLUMNS = [
+    ("Quote #", 1.2, lambda quote: quote.quote_number),
+    ("Customer", 2.5, lambda quote: quote.customer_name),
+    ("Description", 3, lambda quote: quote.description),
+    ("Date", 1.2, lambda quote: format_date(quote.quote_date)),
+    ("Expires", 1.2, lambda quote: format_date(quote.expiry_date)),
+    ("Status", 1.2, lambda quote: quote.status),
+    ("Total", 1.2, lambda quote: format_cents(quote.total)),
+]
 
 class QuotesWidget(QWidget):
     def __init__(self):
         super().__init__()
         
-        # Set grey background
-        self.setStyleSheet("QWidget { background-color: #F0F0F0; }")
+        # Grey background, from the application theme
+        self.setObjectName("page")
         
         layout = QVBoxLayout(self)
         
@@ -125,6 +117,7 @@ class QuotesWidget(QWidget):
         self.search_box.setPlaceholderText("Search quotes...")
         self.search_box.setFixedWidth(300)
         self.search_box.textChanged.connect(self.on_search)
+        self.search_controller = SearchController(self.query_quotes, self.apply_quotes, self)
         self.search_box.setStyleSheet("""
             QLineEdit {
                 padding: 8px;
@@ -180,30 +173,35 @@ class QuotesWidget(QWidget):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: transparent; }")
-        self.cards_container = FlowLayout()
+        self.cards_container = FlowLayout(self.make_card, sort_key=quote_sort_key, descending=True)
         self.scroll_area.setWidget(self.cards_container)
         
         layout.addWidget(self.scroll_area)
         
         self.new_quote_btn.clicked.connect(self.open_new_quote_dialog)
         self.print_btn.clicked.connect(self.print_quotes_page)
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+        self.refresher = PageRefresher(self, ["quote"], self.refresh_data) # Other stations' changes
+        get_counter_board().changed.connect(self.update_counts)
+        self.update_counts()
         
         self.refresh_data()
 
     def on_search(self, text):
-        self.refresh_data(search=text)
+        self.search_controller.search(text)
 
     def open_new_quote_dialog(self):
         from ui.quote_editor import QuoteEditorDialog
         dialog = QuoteEditorDialog(self)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
 
     def edit_quote(self, quote):
         from ui.quote_editor import QuoteEditorDialog
+        quote = load_entity(quote)
+        if quote is None:
+            return # Deleted elsewhere; the change bus drops its card
         dialog = QuoteEditorDialog(self, quote)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
             
     def view_quote(self, quote):
         # For now, view is same as edit
@@ -213,67 +211,74 @@ class QuotesWidget(QWidget):
         # Placeholder for single quote print
         QMessageBox.information(self, "Print Quote", f"Printing Quote {quote.quote_number} is not yet implemented.")
 
-    def refresh_data(self, search=""):
-        db = next(get_db())
-        try:
-            query = db.query(Quote).filter(Quote.is_archived == False)
-            
-            if search:
-                search_filter = f"%{search}%"
-                query = query.filter(
-                    (Quote.quote_number.like(search_filter)) |
-                    (Quote.customer_name.like(search_filter)) |
-                    (Quote.description.like(search_filter))
-                )
-            
-            quotes = query.order_by(Quote.quote_date.desc()).all()
-            
-            # Calculate status counts
-            status_counts = {
-                QuoteStatus.DRAFT: 0,
-                QuoteStatus.SENT: 0,
-                QuoteStatus.ACCEPTED: 0,
-                QuoteStatus.REJECTED: 0,
-                QuoteStatus.EXPIRED: 0
-            }
-            
-            for quote in quotes:
-                if quote.status in status_counts:
-                    status_counts[quote.status] += 1
-            
-            # Update Status labels
-            self.status_draft_count.setText(str(status_counts[QuoteStatus.DRAFT]))
-            self.status_sent_count.setText(str(status_counts[QuoteStatus.SENT]))
-            self.status_accepted_count.setText(str(status_counts[QuoteStatus.ACCEPTED]))
-            self.status_rejected_count.setText(str(status_counts[QuoteStatus.REJECTED]))
-            self.status_expired_count.setText(str(status_counts[QuoteStatus.EXPIRED]))
-            
-            # Update Cards
-            self.cards_container.add_cards(quotes, self.view_quote, self.edit_quote, self.print_quote)
-            
-        finally:
-            db.close()
+    def refresh_data(self, search=None):
+        """Reload the page in the background, keeping the current search text"""
+        if search is None:
+            search = self.search_box.text()
+        self.search_controller.refresh(search)
+
+    def quotes_query(self, db, search):
+        query = db.query(Quote).filter(Quote.is_archived == False)
+        
+        if search:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                (Quote.quote_number.like(search_filter)) |
+                (Quote.customer_name.like(search_filter)) |
+                (Quote.description.like(search_filter))
+            )
+        return query
+
+    def query_quotes(self, db, search):
+        """Load the quotes to show; runs on a search worker thread"""
+        return QuoteRow.all(self.quotes_query(db, search).order_by(Quote.quote_date.desc()))
+
+    def report_quotes(self, db, search):
+        """The page's quotes in page order, for the PDF export"""
+        return self.quotes_query(db, search).order_by(Quote.quote_date.desc(), Quote.id)
+
+    def query_one_quote(self, db, quote_id, search):
+        """Load one quote if it belongs on the page, else None"""
+        return QuoteRow.first(self.quotes_query(db, search).filter(Quote.id == quote_id))
+
+    def make_card(self, quote):
+        card = QuoteCardWidget(quote)
+        card.clicked.connect(self.view_quote)
+        card.edit_clicked.connect(self.edit_quote)
+        card.print_clicked.connect(self.print_quote)
+        return card
+
+    def apply_quotes(self, quotes):
+        self.cards_container.add_cards(quotes)
+
+    def update_counts(self):
+        """Header counts over all active quotes, whatever the search"""
+        counts = get_counter_board().counts("quote")
+        self.status_draft_count.setText(str(counts[QuoteStatus.DRAFT.value]))
+        self.status_sent_count.setText(str(counts[QuoteStatus.SENT.value]))
+        self.status_accepted_count.setText(str(counts[QuoteStatus.ACCEPTED.value]))
+        self.status_rejected_count.setText(str(counts[QuoteStatus.REJECTED.value]))
+        self.status_expired_count.setText(str(counts[QuoteStatus.EXPIRED.value]))
+
+    def on_entity_changed(self, entity, entity_id, kind):
+        """Patch the one changed card instead of reloading the page"""
+        if entity != "quote":
+            return
+        if kind == "delete":
+            self.cards_container.remove_card(entity_id)
+            return
+        call = get_data_service().run(self.query_one_quote, entity_id, self.search_box.text(),
+                                      label="query_one_quote")
+        call.finished.connect(lambda quote: self.apply_quote(entity_id, quote))
+        call.failed.connect(lambda message: self.refresh_data())
+
+    def apply_quote(self, quote_id, quote):
+        if quote is None:
+            # Archived, or no longer matches the search
+            self.cards_container.remove_card(quote_id)
+        else:
+            self.cards_container.upsert_card(quote)
             
     def print_quotes_page(self):
-        """Print the entire Quotes page in landscape"""
-        from PySide6.QtPrintSupport import QPrinter, QPrintDialog
-        from PySide6.QtGui import QPainter, QPageLayout
-        from PySide6.QtCore import QMarginsF
-        
-        printer = QPrinter(QPrinter.HighResolution)
-        printer.setPageOrientation(QPageLayout.Landscape)
-        margins = QMarginsF(10, 10, 10, 10)
-        printer.setPageMargins(margins, QPageLayout.Millimeter)
-        
-        dialog = QPrintDialog(printer, self)
-        if dialog.exec():
-            painter = QPainter(printer)
-            widget_to_print = self.scroll_area.widget()
-            page_rect = printer.pageRect(QPrinter.DevicePixel)
-            widget_rect = widget_to_print.rect()
-            scale_x = page_rect.width() / widget_rect.width()
-            scale_y = page_rect.height() / widget_rect.height()
-            scale = min(scale_x, scale_y)
-            painter.scale(scale, scale)
-            widget_to_print.render(painter)
-            painter.end()
+        """Export the quotes on the page (current search) as a paginated PDF"""
+        export_report(self, "Quotes", QUOTE_REPORT_COLUMNS, self.report_quotes, self.search_box.text())
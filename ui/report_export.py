@@ -0,0 +1,242 @@
+from PySide6.QtWidgets import QFileDialog, QProgressDialog, QMessageBox
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal, QMarginsF, QRectF, QUrl
+from PySide6.QtGui import QPdfWriter, QPainter, QPageSize, QPageLayout, QFont, QFontMetricsF, QPen, QColor, QDesktopServices
+from db_session import open_session
+from datetime import date
+import os
+
+# Rows fetched from the database at a time; only one batch is held in memory
+REPORT_BATCH = 200
+
+REPORT_DPI = 300
+FONT_SIZE = 9
+TITLE_SIZE = 14
+
+
+def format_date(value):
+    return value.strftime("%Y-%m-%d") if value else ""
+
+
+def format_cents(cents):
+    return f"${(cents or 0) / 100:,.2f}"
+
+
+class ReportExport(QObject):
+    """
+    One PDF export running on a worker thread.
+
+    columns are (header, relative width, value(record)) and query_fn(db, *args)
+    returns the records in report order (a Query is streamed in batches).
+    Pages are drawn and written one at a time. progress(rows, total) and
+    then finished(pages) or failed(message) are delivered on the UI thread;
+    after cancel() the partial file is removed and cancelled is emitted.
+    """
+    progress = Signal(int, int)
+    finished = Signal(int)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, path, title, columns, query_fn, args, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.title = title
+        self.columns = columns
+        self.query_fn = query_fn
+        self.args = args
+        self.cancel_requested = False
+
+    def start(self):
+        QThreadPool.globalInstance().start(_ExportTask(self))
+
+    def cancel(self):
+        self.cancel_requested = True
+
+
+class _ExportTask(QRunnable):
+    def __init__(self, export):
+        super().__init__()
+        self.export = export
+
+    def run(self):
+        export = self.export
+        db = None
+        try:
+            db = open_session()
+            pages = write_report(export, db)
+        except Exception as e:
+            pages = None
+            error = str(e) or e.__class__.__name__
+        finally:
+            if db is not None:
+                db.close()
+
+        if export.cancel_requested:
+            remove_file(export.path)
+            export.cancelled.emit()
+        elif pages is None:
+            remove_file(export.path)
+            export.failed.emit(error)
+        else:
+            export.finished.emit(pages)
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_report(export, db):
+    """Draw the report into export.path page by page; returns the page count"""
+    records = export.query_fn(db, *export.args)
+    total = 0
+    if hasattr(records, "yield_per"):
+        total = records.order_by(None).count()
+        records = records.yield_per(REPORT_BATCH)
+
+    writer = QPdfWriter(export.path)
+    writer.setResolution(REPORT_DPI)
+    writer.setTitle(export.title)
+    writer.setPageLayout(QPageLayout(
+        QPageSize(QPageSize.A4), QPageLayout.Landscape, QMarginsF(10, 10, 10, 10), QPageLayout.Millimeter
+    ))
+
+    painter = QPainter(writer)
+    try:
+        page = ReportPage(painter, writer, export.title, export.columns)
+        page.start(1)
+        rows = 0
+        for record in records:
+            if export.cancel_requested:
+                break
+            if not page.has_room():
+                writer.newPage()
+                page.start(page.number + 1)
+            page.add_row([value(record) for _header, _width, value in export.columns])
+            rows += 1
+            if rows % REPORT_BATCH == 0:
+                export.progress.emit(rows, total)
+        export.progress.emit(rows, total)
+        if rows == 0:
+            page.add_row(["No records"])
+        return page.number
+    finally:
+        painter.end()
+
+
+class ReportPage:
+    """Table layout for one page at a time: title line, column headers, rows"""
+    def __init__(self, painter, writer, title, columns):
+        self.painter = painter
+        self.title = title
+        self.headers = [header for header, _width, _value in columns]
+        self.number = 0
+
+        self.rect = QRectF(0, 0, writer.width(), writer.height())
+        total_width = sum(width for _header, width, _value in columns)
+        self.column_x = []
+        x = 0.0
+        for _header, width, _value in columns:
+            self.column_x.append((x, self.rect.width() * width / total_width))
+            x += self.rect.width() * width / total_width
+
+        self.font = QFont("Arial", FONT_SIZE)
+        self.bold_font = QFont("Arial", FONT_SIZE, QFont.Bold)
+        self.title_font = QFont("Arial", TITLE_SIZE, QFont.Bold)
+        # Fonts are sized in points; scale to the writer's resolution
+        for font in (self.font, self.bold_font, self.title_font):
+            font.setPixelSize(round(font.pointSizeF() * REPORT_DPI / 72))
+        self.metrics = QFontMetricsF(self.font)
+        self.row_height = self.metrics.height() * 1.6
+        self.padding = self.metrics.averageCharWidth()
+        self.subtitle = date.today().strftime("%b %d, %Y")
+
+    def start(self, number):
+        self.number = number
+        painter = self.painter
+        title_height = QFontMetricsF(self.title_font).height() * 1.4
+
+        painter.setPen(QColor("#000000"))
+        painter.setFont(self.title_font)
+        painter.drawText(QRectF(0, 0, self.rect.width(), title_height), Qt.AlignLeft | Qt.AlignVCenter, self.title)
+        painter.setFont(self.font)
+        painter.drawText(QRectF(0, 0, self.rect.width(), title_height), Qt.AlignRight | Qt.AlignVCenter,
+                         f"{self.subtitle}  -  Page {number}")
+        self.y = title_height
+
+        painter.setFont(self.bold_font)
+        self._draw_cells(self.headers)
+        self.y += self.row_height
+        painter.setPen(QPen(QColor("#2c3e50"), 3))
+        painter.drawLine(0, self.y, self.rect.width(), self.y)
+        painter.setFont(self.font)
+
+    def has_room(self):
+        return self.y + self.row_height <= self.rect.height()
+
+    def add_row(self, values):
+        self._draw_cells(values)
+        self.y += self.row_height
+        self.painter.setPen(QPen(QColor("#dddddd"), 1))
+        self.painter.drawLine(0, self.y, self.rect.width(), self.y)
+
+    def _draw_cells(self, values):
+        self.painter.setPen(QColor("#000000"))
+        metrics = QFontMetricsF(self.painter.font())
+        for (x, width), value in zip(self.column_x, values):
+            text = " ".join(str(value or "").split()) # One line per cell
+            text = metrics.elidedText(text, Qt.ElideRight, width - 2 * self.padding)
+            self.painter.drawText(QRectF(x + self.padding, self.y, width - 2 * self.padding, self.row_height),
+                                  Qt.AlignLeft | Qt.AlignVCenter, text)
+
+
+def export_report(parent, title, columns, query_fn, *args):
+    """
+    Ask where to save, then export the records from query_fn(db, *args)
+    as a paginated PDF in the background with a cancellable progress dialog.
+    """
+    path, _filter = QFileDialog.getSaveFileName(parent, f"Export {title}", f"{title}.pdf", "PDF Files (*.pdf)")
+    if not path:
+        return None
+    if not path.lower().endswith(".pdf"):
+        path += ".pdf"
+
+    progress = QProgressDialog(f"Exporting {title}...", "Cancel", 0, 0, parent)
+    progress.setWindowTitle("Export PDF")
+    progress.setWindowModality(Qt.WindowModal)
+    progress.setMinimumDuration(500)
+    progress.setAutoClose(False)
+    progress.setAutoReset(False)
+
+    export = ReportExport(path, title, columns, query_fn, args, progress)
+    progress.canceled.connect(export.cancel)
+
+    def on_progress(rows, total):
+        if total:
+            progress.setMaximum(total)
+            progress.setValue(min(rows, total))
+        progress.setLabelText(f"Exporting {title}... {rows} rows")
+
+    def on_finished(pages):
+        progress.close()
+        progress.deleteLater()
+        QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+
+    def on_failed(message):
+        progress.close()
+        progress.deleteLater()
+        print(f"Error exporting {title}: {message}")
+        QMessageBox.critical(parent, "Export Error", f"Error exporting {title}:\n{message}")
+
+    def on_cancelled():
+        progress.close()
+        progress.deleteLater()
+
+    export.progress.connect(on_progress)
+    export.finished.connect(on_finished)
+    export.failed.connect(on_failed)
+    export.cancelled.connect(on_cancelled)
+    export.start()
+    progress.show()
+    return export
@@ -0,0 +1,81 @@
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QMessageBox
+from ui.data_service import get_data_service
+
+# Wait this long after the last keystroke before querying
+SEARCH_DELAY_MS = 250
+
+
+class SearchController(QObject):
+    """
+    Debounced background search for a list page.
+
+    query(db, text) runs through the data service and returns the results,
+    apply(results) runs on the UI thread. Every keystroke bumps a generation
+    number, so results of superseded searches are dropped and only the latest
+    result set is applied. budget caps the queries one search may issue
+    (see loaders.QueryBudget). If the latest search fails, fail(message) is
+    called instead; by default the page shows a warning, as the results on
+    screen are no longer what was asked for.
+    """
+    def __init__(self, query, apply, parent=None, delay_ms=SEARCH_DELAY_MS, label=None, budget=None, fail=None):
+        super().__init__(parent)
+        self.query = query
+        self.apply = apply
+        self.fail = fail or self._warn
+        self.label = label or query.__name__
+        self.budget = budget
+        self.generation = 0
+        self.text = ""
+        self.call = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self._start)
+
+    def search(self, text):
+        """Schedule a search for text, replacing any pending one"""
+        self.text = text
+        self.generation += 1
+        self.timer.start()
+
+    def refresh(self, text):
+        """Run the query for text right away (still in the background)"""
+        self.cancel()
+        self.text = text
+        self._start()
+
+    def cancel(self):
+        """Forget pending and running searches"""
+        self.timer.stop()
+        self.generation += 1
+        if self.call is not None:
+            self.call.cancel()
+            self.call = None
+
+    def is_current(self, generation):
+        return generation == self.generation
+
+    def _start(self):
+        # A query still waiting for a worker is no longer worth running
+        if self.call is not None:
+            self.call.cancel()
+
+        generation = self.generation
+        self.call = get_data_service().run(self.query, self.text, label=self.label, budget=self.budget)
+        self.call.finished.connect(lambda results: self._on_finished(generation, results))
+        self.call.failed.connect(lambda message: self._on_failed(generation, message))
+
+    def _on_finished(self, generation, results):
+        if self.is_current(generation):
+            self.call = None
+            self.apply(results)
+
+    def _on_failed(self, generation, message):
+        if self.is_current(generation):
+            self.call = None
+            self.fail(message)
+
+    def _warn(self, message):
+        QMessageBox.warning(self.parent(), "Search", f"Could not load the list:\n{message}")
@@ -1,8 +1,7 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                               QLineEdit, QScrollArea, QFrame, QGridLayout, QLabel, QButtonGroup)
+                               QLineEdit, QScrollArea, QLabel, QButtonGroup)
 from PySide6.QtCore import Qt, QSize
 from ui.assets import get_icon
-from database import get_db
 from models import Job, Quote, Task, PurchaseOrder, Customer, Supplier
 from ui.job_card import JobCardWidget
 from ui.quote_card import QuoteCardWidget
@@ -10,34 +9,49 @@ from ui.task_card import TaskCardWidget
 from ui.po_card import POCardWidget
 from ui.customer_card import CustomerCardWidget
 from ui.supplier_card import SupplierCardWidget
+import search_index
+from ui.archive_pager import ArchivePager
+from ui.flow_layout import FlowLayout
+from ui.change_bus import get_change_bus
+from ui.data_service import get_data_service
+from loaders import card_options
 
-class FlowLayout(QFrame):
-    """Simple flow layout for cards"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setStyleSheet("QFrame { background-color: transparent; border: none; }")
-        
-        self.grid = QGridLayout(self)
-        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.grid.setContentsMargins(10, 10, 10, 10)
-        self.grid.setSpacing(20)
+# Search filter button -> search index entities (None = everything)
+FILTER_ENTITIES = {
+    "All": None,
+    "Jobs": ["job"],
+    "Quotes": ["quote"],
+    "Tasks": ["task"],
+    "Purchase Orders": ["purchase_order"],
+    "Customers": ["customer"],
+    "Suppliers": ["supplier"],
+}
+
+# Archive results are loaded page by page as the user scrolls (see ArchivePager)
+LOAD_MORE_MARGIN = 300 # px from the bottom of the results that triggers the next page
+
+# Queries one search may issue: the index, then each entity type's rows and
+# the relationships their cards read, however many results there are
+SEARCH_QUERY_BUDGET = 2 + 3 * len(search_index.ENTITY_MODELS)
 
-    def clear(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+CARD_WIDGETS = {
+    Job: JobCardWidget,
+    Quote: QuoteCardWidget,
+    Task: TaskCardWidget,
+    PurchaseOrder: POCardWidget,
+    Customer: CustomerCardWidget,
+    Supplier: SupplierCardWidget,
+}
 
-    def add_widget(self, widget, index, cols=4):
-        row = index // cols
-        col = index % cols
-        self.grid.addWidget(widget, row, col)
+def result_key(result):
+    # Same shape as the change bus arguments
+    return (search_index.MODEL_ENTITIES[type(result)], result.id)
 
 class SearchWidget(QWidget):
     def __init__(self, mode="active"):
         super().__init__()
         self.mode = mode
-        self.setStyleSheet("QWidget { background-color: #F0F0F0; }")
+        self.setObjectName("page") # Grey background, from the application theme
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -152,11 +166,21 @@ class SearchWidget(QWidget):
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: transparent; }")
         
-        self.results_container = FlowLayout()
+        self.results_container = FlowLayout(self.make_card, key=result_key, cols=4, transparent=True)
         self.scroll_area.setWidget(self.results_container)
         
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.on_scroll)
+        scroll_bar.rangeChanged.connect(lambda _min, _max: self.on_scroll(scroll_bar.value()))
+        
+        self.pager = None
+        self.result_count = 0
+        self.call = None # The search or archive page being loaded
+        
         layout.addWidget(self.scroll_area)
         
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+        
         # Initial empty state
         self.show_empty_state("Enter a search term to begin")
 
@@ -168,6 +192,13 @@ class SearchWidget(QWidget):
         self.results_container.grid.addWidget(label, 0, 0)
 
     def perform_search(self):
+        # A newer search replaces whatever is still loading
+        if self.call is not None:
+            self.call.cancel()
+            self.call = None
+        self.pager = None
+        self.result_count = 0
+        
         query = self.search_input.text().strip()
         if not query:
             self.show_empty_state("Enter a search term to begin")
@@ -178,122 +209,113 @@ class SearchWidget(QWidget):
         # Determine if we are searching active or archived items
         search_archived = (self.mode == "archive")
         
+        self.show_empty_state("Searching...")
+        self.call = get_data_service().run(self.query_results, query, FILTER_ENTITIES[filter_text], search_archived,
+                                           label="search", budget=SEARCH_QUERY_BUDGET)
+        self.call.finished.connect(self.apply_results)
+        self.call.failed.connect(self.on_search_failed)
+
+    def query_results(self, db, query, entities, search_archived):
+        """Run a search; returns (archive pager or None, first results). Runs on a data worker."""
+        use_index = search_index.index_available(db)
+        if search_archived:
+            # The archive grows for years, so page through it newest first
+            pager = ArchivePager(query, entities, use_index, load_options=card_options)
+            return pager, pager.fetch_more(db)
+        if use_index:
+            # Ranked full-text matches across all entity types
+            return None, search_index.search_objects(
+                db, query, entities, archived=search_archived, load_options=card_options
+            )
+        return None, self.like_search(db, query, entities, search_archived)
+
+    def apply_results(self, loaded):
+        self.call = None
+        self.pager, results = loaded
         self.results_container.clear()
+        self.add_results(results)
         
-        db = next(get_db())
-        results_found = 0
-        card_index = 0
-        
-        try:
-            # Helper to add widget
-            def add_result(widget):
-                nonlocal card_index, results_found
-                self.results_container.add_widget(widget, card_index, cols=4)
-                card_index += 1
-                results_found += 1
+        if not results:
+            self.show_empty_state("No results found matching your criteria.")
 
-            # JOBS
-            if filter_text in ["All", "Jobs"]:
-                q = db.query(Job).filter(Job.is_archived == search_archived)
-                
-                if query:
-                    search_filter = (
-                        Job.job_number.ilike(f"%{query}%") |
-                        Job.customer_name.ilike(f"%{query}%") |
-                        Job.order_type.ilike(f"%{query}%") |
-                        Job.notes.ilike(f"%{query}%")
-                    )
-                    q = q.filter(search_filter)
-                
-                for job in q.all():
-                    card = JobCardWidget(job)
-                    add_result(card)
+    def on_search_failed(self, message):
+        self.call = None
+        self.pager = None # Don't keep retrying a failing archive page on every scroll
+        if not self.results_container.items:
+            self.show_empty_state("The search failed. Please try again.")
 
-            # QUOTES
-            if filter_text in ["All", "Quotes"]:
-                q = db.query(Quote).filter(Quote.is_archived == search_archived)
-                
-                if query:
-                    search_filter = (
-                        Quote.quote_number.ilike(f"%{query}%") |
-                        Quote.customer_name.ilike(f"%{query}%") |
-                        Quote.notes.ilike(f"%{query}%")
-                    )
-                    q = q.filter(search_filter)
-                
-                for quote in q.all():
-                    card = QuoteCardWidget(quote)
-                    add_result(card)
+    def make_card(self, result):
+        return CARD_WIDGETS[type(result)](result)
 
-            # TASKS
-            if filter_text in ["All", "Tasks"]:
-                q = db.query(Task).filter(Task.is_archived == search_archived)
-                
-                if query:
-                    search_filter = (
-                        Task.task_number.ilike(f"%{query}%") |
-                        Task.title.ilike(f"%{query}%") |
-                        Task.description.ilike(f"%{query}%") |
-                        Task.assigned_to.ilike(f"%{query}%")
-                    )
-                    q = q.filter(search_filter)
-                
-                for task in q.all():
-                    card = TaskCardWidget(task)
-                    add_result(card)
+    def add_results(self, results):
+        self.results_container.add_cards(results, append=True)
+        self.result_count = len(self.results_container.items)
 
-            # PURCHASE ORDERS
-            if filter_text in ["All", "Purchase Orders"]:
-                q = db.query(PurchaseOrder).filter(PurchaseOrder.is_archived == search_archived)
-                
-                if query:
-                    search_filter = (
-                        PurchaseOrder.po_number.ilike(f"%{query}%") |
-                        PurchaseOrder.supplier_name.ilike(f"%{query}%") |
-                        PurchaseOrder.notes.ilike(f"%{query}%")
-                    )
-                    q = q.filter(search_filter)
-                
-                for po in q.all():
-                    card = POCardWidget(po)
-                    add_result(card)
+    def on_entity_changed(self, entity, entity_id, kind):
+        """Refresh or drop the card of a changed result; new rows wait for the next search"""
+        if (entity, entity_id) not in self.results_container.cards:
+            return
+        if kind == "delete":
+            self.results_container.remove_card((entity, entity_id))
+            self.result_count = len(self.results_container.items)
+            return
+        call = get_data_service().run(self.query_one_result, entity, entity_id, label="query_one_result", budget=2)
+        call.finished.connect(lambda result: self.apply_result(entity, entity_id, result))
+        call.failed.connect(lambda message: self.perform_search())
 
-            # CUSTOMERS
-            if filter_text in ["All", "Customers"]:
-                q = db.query(Customer).filter(Customer.is_archived == search_archived)
-                
-                if query:
-                    search_filter = (
-                        Customer.customer_number.ilike(f"%{query}%") |
-                        Customer.company_name.ilike(f"%{query}%") |
-                        Customer.contact_name.ilike(f"%{query}%") |
-                        Customer.email.ilike(f"%{query}%")
-                    )
-                    q = q.filter(search_filter)
-                
-                for customer in q.all():
-                    card = CustomerCardWidget(customer)
-                    add_result(card)
+    def query_one_result(self, db, entity, entity_id):
+        model = search_index.ENTITY_MODELS[entity]
+        return (
+            db.query(model).options(*card_options(model))
+            .filter(model.id == entity_id, model.is_archived == (self.mode == "archive")).first()
+        )
 
-            # SUPPLIERS
-            if filter_text in ["All", "Suppliers"]:
-                q = db.query(Supplier).filter(Supplier.is_archived == search_archived)
-                
-                if query:
-                    search_filter = (
-                        Supplier.supplier_name.ilike(f"%{query}%") |
-                        Supplier.contact_name.ilike(f"%{query}%") |
-                        Supplier.email.ilike(f"%{query}%") |
-                        Supplier.services_supplies.ilike(f"%{query}%")
-                    )
-                    q = q.filter(search_filter)
-                
-                for supplier in q.all():
-                    card = SupplierCardWidget(supplier)
-                    add_result(card)
+    def apply_result(self, entity, entity_id, result):
+        if (entity, entity_id) not in self.results_container.cards:
+            return # Cleared by a new search meanwhile
+        if result is None:
+            # Deleted, or moved in or out of the archive
+            self.results_container.remove_card((entity, entity_id))
+        else:
+            self.results_container.upsert_card(result)
+        self.result_count = len(self.results_container.items)
 
-            if results_found == 0:
-                self.show_empty_state("No results found matching your criteria.")
-                
-        finally:
-            db.close()
+    def on_scroll(self, value):
+        """Load the next archive page once the user nears the end of the results"""
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if value >= scroll_bar.maximum() - LOAD_MORE_MARGIN:
+            self.load_more_results()
+
+    def load_more_results(self):
+        if self.pager is None or self.call is not None:
+            return
+        
+        if self.pager.limit_reached():
+            # Keep the page bounded; older results need a narrower search
+            self.pager = None
+            label = QLabel(f"Showing the {self.result_count} most recent results. Refine your search to see older ones.")
+            label.setAlignment(Qt.AlignCenter)
+            label.setStyleSheet("color: #95a5a6; font-size: 14px; margin: 10px;")
+            row = (self.result_count + 3) // 4
+            self.results_container.grid.addWidget(label, row, 0, 1, 4)
+            return
+        if not self.pager.can_fetch_more():
+            return
+        
+        # The pager only moves on the worker, and only one page loads at a time
+        self.call = get_data_service().run(self.pager.fetch_more, label="archive page")
+        self.call.finished.connect(self.apply_more_results)
+        self.call.failed.connect(self.on_search_failed)
+
+    def apply_more_results(self, results):
+        self.call = None
+        self.add_results(results)
+
+    def like_search(self, db, query, entities, search_archived):
+        """Fallback for databases without FTS5: scan each table with ILIKE"""
+        results = []
+        for entity in entities or search_index.ENTITY_MODELS:
+            model = search_index.ENTITY_MODELS[entity]
+            q = db.query(model).options(*card_options(model)).filter(model.is_archived == search_archived)
+            results.extend(q.filter(search_index.like_filter(entity, query)).all())
+        return results
@@ -1,5 +1,6 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QLineEdit, QPushButton, QFormLayout, QGroupBox, QListWidget, QMessageBox, QScrollArea)
+                               QLineEdit, QPushButton, QFormLayout, QGroupBox, QListWidget, QMessageBox, QScrollArea,
+                               QDoubleSpinBox)
 from PySide6.QtCore import Qt, Signal
 from settings_manager import get_settings
 
@@ -161,6 +162,15 @@ class SettingsWidget(QWidget):
         self.tax_number_input.setStyleSheet(self.get_input_style())
         business_layout.addRow("Tax Number:", self.tax_number_input)
         
+        # Tax Rate (added to quotes)
+        self.tax_rate_input = QDoubleSpinBox()
+        self.tax_rate_input.setRange(0, 100)
+        self.tax_rate_input.setDecimals(2)
+        self.tax_rate_input.setSuffix("%")
+        self.tax_rate_input.setFixedWidth(200)
+        self.tax_rate_input.setStyleSheet(self.get_input_style())
+        business_layout.addRow("Tax Rate:", self.tax_rate_input)
+        
         # Business Phone
         self.business_phone_input = QLineEdit()
         self.business_phone_input.setPlaceholderText("(02) 1234 5678")
@@ -334,6 +344,7 @@ class SettingsWidget(QWidget):
         # Business Details
         self.tax_type_input.setText(settings.get_tax_type())
         self.tax_number_input.setText(settings.get_tax_number())
+        self.tax_rate_input.setValue(settings.get_tax_rate())
         self.business_phone_input.setText(settings.get_business_phone())
         self.business_email_input.setText(settings.get_business_email())
         self.business_address_input.setText(settings.get_business_address())
@@ -354,6 +365,7 @@ class SettingsWidget(QWidget):
         # Business Details
         settings.set_tax_type(self.tax_type_input.text())
         settings.set_tax_number(self.tax_number_input.text())
+        settings.set_tax_rate(self.tax_rate_input.value())
         settings.set_business_phone(self.business_phone_input.text())
         settings.set_business_email(self.business_email_input.text())
         settings.set_business_address(self.business_address_input.text())
@@ -2,6 +2,7 @@ from PySide6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushBu
 from PySide6.QtCore import Qt, Signal, QSize, QUrl
 from PySide6.QtGui import QDesktopServices
 from ui.assets import get_icon
+from ui.theme import styled
 from models import Supplier
 
 class SupplierCardWidget(QFrame):
@@ -14,26 +15,8 @@ class SupplierCardWidget(QFrame):
         self.setFixedWidth(280)
         self.setFixedHeight(180)
         
-        # Card background
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: #D5EEF2;
-                border: 1px solid #B8D8DD;
-                border-radius: 8px;
-            }}
-            QLabel {{ border: none; background: transparent; }}
-            QPushButton {{
-                border: none;
-                background: transparent;
-                color: #2c3e50;
-                font-size: 11px;
-                padding: 4px 8px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(0, 0, 0, 0.05);
-                border-radius: 4px;
-            }}
-        """)
+        # Colours come from the application theme (ui/theme.py)
+        styled(self, "card", kind="supplier")
         
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(12, 12, 12, 12)
@@ -44,34 +27,29 @@ class SupplierCardWidget(QFrame):
         left_layout.setSpacing(4)
         
         # Supplier Name
-        supplier_name = QLabel(supplier.supplier_name)
-        supplier_name.setStyleSheet("font-weight: bold; font-size: 14px; color: #2c3e50;")
+        supplier_name = styled(QLabel(supplier.supplier_name), "cardTitle")
         supplier_name.setWordWrap(True)
         left_layout.addWidget(supplier_name)
         
         # Contact Name
         if supplier.contact_name:
-            contact = QLabel(supplier.contact_name)
-            contact.setStyleSheet("color: #546E7A; font-size: 12px;")
+            contact = styled(QLabel(supplier.contact_name), "cardContact")
             left_layout.addWidget(contact)
         
         # Services/Supplies
         if supplier.services_supplies:
-            services = QLabel(supplier.services_supplies[:60] + "..." if len(supplier.services_supplies) > 60 else supplier.services_supplies)
-            services.setStyleSheet("color: #546E7A; font-size: 10px; font-style: italic;")
+            services = styled(QLabel(supplier.services_supplies[:60] + "..." if len(supplier.services_supplies) > 60 else supplier.services_supplies), "cardNote")
             services.setWordWrap(True)
             left_layout.addWidget(services)
         
         # Email
         if supplier.email:
-            email = QLabel(supplier.email)
-            email.setStyleSheet("color: #546E7A; font-size: 10px;")
+            email = styled(QLabel(supplier.email), "cardDetail")
             left_layout.addWidget(email)
         
         # Phone
         if supplier.phone:
-            phone = QLabel(f"☎ {supplier.phone}")
-            phone.setStyleSheet("color: #546E7A; font-size: 10px;")
+            phone = styled(QLabel(f"☎ {supplier.phone}"), "cardDetail")
             left_layout.addWidget(phone)
         
         left_layout.addStretch()
@@ -112,15 +90,7 @@ class SupplierCardWidget(QFrame):
         
         # Account type badge (if available)
         if supplier.account_type:
-            account_badge = QLabel(supplier.account_type.upper())
-            account_badge.setStyleSheet("""
-                background-color: #3498db;
-                color: #FFFFFF;
-                padding: 4px 8px;
-                border-radius: 8px;
-                font-size: 9px;
-                font-weight: bold;
-            """)
+            account_badge = styled(QLabel(supplier.account_type.upper()), "pill", status="")
             account_badge.setAlignment(Qt.AlignCenter)
             right_layout.addWidget(account_badge)
         
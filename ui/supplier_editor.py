@@ -2,7 +2,7 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                                QLineEdit, QTextEdit, QComboBox, QPushButton, QLabel, QMessageBox, QListWidget)
 from PySide6.QtCore import Qt
 from ui.assets import play_sound
-from database import get_db
+from db_session import session_scope
 from models import Supplier
 from settings_manager import get_settings
 
@@ -127,39 +127,41 @@ class SupplierEditorDialog(QDialog):
             return
             
         try:
-            db = next(get_db())
+            with session_scope() as db:
             
-            # Get selected freight methods
-            selected_methods = [item.text() for item in self.freight_methods_list.selectedItems()]
-            freight_methods_str = ", ".join(selected_methods) if selected_methods else None
+                # Get selected freight methods
+                selected_methods = [item.text() for item in self.freight_methods_list.selectedItems()]
+                freight_methods_str = ", ".join(selected_methods) if selected_methods else None
             
-            if self.is_new:
-                supplier = Supplier(
-                    supplier_name=supplier_name,
-                    contact_name=self.contact_name_input.text().strip() or None,
-                    email=self.email_input.text().strip() or None,
-                    phone=self.phone_input.text().strip() or None,
-                    address=self.address_input.toPlainText().strip() or None,
-                    services_supplies=self.services_input.toPlainText().strip() or None,
-                    account_type=self.account_type_input.currentText() or None,
-                    freight_method=freight_methods_str,
-                    notes=self.notes_input.toPlainText().strip() or None
-                )
-                db.add(supplier)
-            else:
-                self.supplier.supplier_name = supplier_name
-                self.supplier.contact_name = self.contact_name_input.text().strip() or None
-                self.supplier.email = self.email_input.text().strip() or None
-                self.supplier.phone = self.phone_input.text().strip() or None
-                self.supplier.address = self.address_input.toPlainText().strip() or None
-                self.supplier.services_supplies = self.services_input.toPlainText().strip() or None
-                self.supplier.account_type = self.account_type_input.currentText() or None
-                self.supplier.freight_method = freight_methods_str
-                self.supplier.notes = self.notes_input.toPlainText().strip() or None
+                if self.is_new:
+                    supplier = Supplier(
+                        supplier_name=supplier_name,
+                        contact_name=self.contact_name_input.text().strip() or None,
+                        email=self.email_input.text().strip() or None,
+                        phone=self.phone_input.text().strip() or None,
+                        address=self.address_input.toPlainText().strip() or None,
+                        services_supplies=self.services_input.toPlainText().strip() or None,
+                        account_type=self.account_type_input.currentText() or None,
+                        freight_method=freight_methods_str,
+                        notes=self.notes_input.toPlainText().strip() or None
+                    )
+                    db.add(supplier)
+                else:
+                    # Re-query to get attached object
+                    supplier = db.get(Supplier, self.supplier.id)
+                    supplier.supplier_name = supplier_name
+                    supplier.contact_name = self.contact_name_input.text().strip() or None
+                    supplier.email = self.email_input.text().strip() or None
+                    supplier.phone = self.phone_input.text().strip() or None
+                    supplier.address = self.address_input.toPlainText().strip() or None
+                    supplier.services_supplies = self.services_input.toPlainText().strip() or None
+                    supplier.account_type = self.account_type_input.currentText() or None
+                    supplier.freight_method = freight_methods_str
+                    supplier.notes = self.notes_input.toPlainText().strip() or None
                 
-            db.commit()
-            play_sound("celebration")
-            self.accept()
+                db.commit()
+                play_sound("celebration")
+                self.accept()
             
         except Exception as e:
             play_sound("caution")
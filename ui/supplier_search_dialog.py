@@ -1,8 +1,9 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                                QTableView, QHeaderView, QLabel, QAbstractItemView, QLineEdit)
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
-from database import get_db
+from db_session import session_scope
 from models import Supplier
+from ui.model_diff import sync_rows
 
 class SupplierSearchTableModel(QAbstractTableModel):
     def __init__(self, suppliers=None):
@@ -41,9 +42,7 @@ class SupplierSearchTableModel(QAbstractTableModel):
         return None
         
     def update_data(self, suppliers):
-        self.beginResetModel()
-        self.suppliers = suppliers
-        self.endResetModel()
+        sync_rows(self, self.suppliers, suppliers)
 
 class SupplierSearchDialog(QDialog):
     def __init__(self, parent=None):
@@ -93,21 +92,20 @@ class SupplierSearchDialog(QDialog):
         self.refresh_data(search=text)
         
     def refresh_data(self, search=""):
-        db = next(get_db())
-        query = db.query(Supplier).filter(Supplier.is_archived == False)
-        
-        if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                (Supplier.supplier_name.like(search_filter)) |
-                (Supplier.contact_name.like(search_filter)) |
-                (Supplier.email.like(search_filter)) |
-                (Supplier.phone.like(search_filter))
-            )
-        
-        suppliers = query.all()
-        self.model.update_data(suppliers)
-        db.close()
+        with session_scope() as db:
+            query = db.query(Supplier).filter(Supplier.is_archived == False)
+        
+            if search:
+                search_filter = f"%{search}%"
+                query = query.filter(
+                    (Supplier.supplier_name.like(search_filter)) |
+                    (Supplier.contact_name.like(search_filter)) |
+                    (Supplier.email.like(search_filter)) |
+                    (Supplier.phone.like(search_filter))
+                )
+        
+            suppliers = query.all()
+            self.model.update_data(suppliers)
         
     def select_supplier(self):
         indexes = self.table.selectionModel().selectedRows()
@@ -1,42 +1,20 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                               QLabel, QScrollArea, QFrame, QGridLayout, QLineEdit)
+                               QLabel, QScrollArea, QLineEdit)
 from PySide6.QtCore import Qt, QSize
 from ui.assets import get_icon, play_sound
-from database import get_db
 from models import Supplier
+from ui.search_controller import SearchController
 from ui.supplier_card import SupplierCardWidget
-
-class FlowLayout(QFrame):
-    """Simple flow layout for cards"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setStyleSheet("QFrame { background-color: #F0F0F0; border: none; }")
-        self.grid = QGridLayout(self)
-        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.grid.setContentsMargins(10, 10, 10, 10)
-        self.grid.setSpacing(20)
-
-    def clear(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-    def add_cards(self, suppliers, on_view, on_edit):
-        self.clear()
-        cols = 5
-        for i, supplier in enumerate(suppliers):
-            card = SupplierCardWidget(supplier)
-            card.clicked.connect(on_view)
-            card.edit_clicked.connect(on_edit)
-            row = i // cols
-            col = i % cols
-            self.grid.addWidget(card, row, col)
+from ui.flow_layout import FlowLayout
+from ui.change_bus import get_change_bus
+from ui.change_detector import PageRefresher
+from ui.data_service import get_data_service
+from projections import SupplierRow, load_entity
 
 class SuppliersWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("QWidget { background-color: #F0F0F0; }")
+        self.setObjectName("page") # Grey background, from the application theme
         layout = QVBoxLayout(self)
         
         # Header
@@ -61,6 +39,7 @@ class SuppliersWidget(QWidget):
         self.search_box.setPlaceholderText("Search suppliers...")
         self.search_box.setFixedWidth(300)
         self.search_box.textChanged.connect(self.on_search)
+        self.search_controller = SearchController(self.query_suppliers, self.apply_suppliers, self)
         self.search_box.setStyleSheet("""
             QLineEdit {
                 padding: 8px;
@@ -96,47 +75,85 @@ class SuppliersWidget(QWidget):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: transparent; }")
-        self.cards_container = FlowLayout()
+        self.cards_container = FlowLayout(self.make_card)
         self.scroll_area.setWidget(self.cards_container)
         layout.addWidget(self.scroll_area)
         
         self.new_supplier_btn.clicked.connect(self.open_new_supplier_dialog)
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+        self.refresher = PageRefresher(self, ["supplier"], self.refresh_data) # Other stations' changes
         self.refresh_data()
 
     def on_search(self, text):
-        self.refresh_data(search=text)
+        self.search_controller.search(text)
 
     def open_new_supplier_dialog(self):
         from ui.supplier_editor import SupplierEditorDialog
         dialog = SupplierEditorDialog(self)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
 
     def edit_supplier(self, supplier):
         from ui.supplier_editor import SupplierEditorDialog
+        supplier = load_entity(supplier)
+        if supplier is None:
+            return # Deleted elsewhere; the change bus drops its card
         dialog = SupplierEditorDialog(self, supplier)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
             
     def view_supplier(self, supplier):
         self.edit_supplier(supplier)
 
-    def refresh_data(self, search=""):
-        db = next(get_db())
-        try:
-            query = db.query(Supplier).filter(Supplier.is_archived == False)
-            
-            if search:
-                search_filter = f"%{search}%"
-                query = query.filter(
-                    (Supplier.supplier_name.like(search_filter)) |
-                    (Supplier.contact_name.like(search_filter)) |
-                    (Supplier.email.like(search_filter)) |
-                    (Supplier.phone.like(search_filter))
-                )
-            
-            suppliers = query.all()
-            self.cards_container.add_cards(suppliers, self.view_supplier, self.edit_supplier)
-            
-        finally:
-            db.close()
+    def refresh_data(self, search=None):
+        """Reload the page in the background, keeping the current search text"""
+        if search is None:
+            search = self.search_box.text()
+        self.search_controller.refresh(search)
+
+    def suppliers_query(self, db, search):
+        query = db.query(Supplier).filter(Supplier.is_archived == False)
+        
+        if search:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                (Supplier.supplier_name.like(search_filter)) |
+                (Supplier.contact_name.like(search_filter)) |
+                (Supplier.email.like(search_filter)) |
+                (Supplier.phone.like(search_filter))
+            )
+        return query
+
+    def query_suppliers(self, db, search):
+        """Load the suppliers to show; runs on a search worker thread"""
+        return SupplierRow.all(self.suppliers_query(db, search))
+
+    def query_one_supplier(self, db, supplier_id, search):
+        """Load one supplier if it belongs on the page, else None"""
+        return SupplierRow.first(self.suppliers_query(db, search).filter(Supplier.id == supplier_id))
+
+    def make_card(self, supplier):
+        card = SupplierCardWidget(supplier)
+        card.clicked.connect(self.view_supplier)
+        card.edit_clicked.connect(self.edit_supplier)
+        return card
+
+    def apply_suppliers(self, suppliers):
+        self.cards_container.add_cards(suppliers)
+
+    def on_entity_changed(self, entity, entity_id, kind):
+        """Patch the one changed card instead of reloading the page"""
+        if entity != "supplier":
+            return
+        if kind == "delete":
+            self.cards_container.remove_card(entity_id)
+            return
+        call = get_data_service().run(self.query_one_supplier, entity_id, self.search_box.text(),
+                                      label="query_one_supplier")
+        call.finished.connect(lambda supplier: self.apply_supplier(entity_id, supplier))
+        call.failed.connect(lambda message: self.refresh_data())
+
+    def apply_supplier(self, supplier_id, supplier):
+        if supplier is None:
+            # Archived, or no longer matches the search
+            self.cards_container.remove_card(supplier_id)
+        else:
+            self.cards_container.upsert_card(supplier)
@@ -3,7 +3,8 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                                QDateEdit)
 from PySide6.QtCore import Qt, QDate
 from ui.assets import play_sound
-from database import get_db
+from db_session import session_scope
+from numbering import next_number
 from models import Task, TaskStatus, Priority
 
 class TaskEditorDialog(QDialog):
@@ -98,44 +99,34 @@ class TaskEditorDialog(QDialog):
             return
             
         try:
-            db = next(get_db())
+            with session_scope() as db:
             
-            if self.is_new:
-                # Generate Task Number
-                last_task = db.query(Task).filter(Task.task_number.like("TN%")).order_by(Task.id.desc()).first()
-                
-                if last_task and last_task.task_number:
-                    try:
-                        last_num = int(last_task.task_number[2:])
-                        new_num = last_num + 1
-                    except ValueError:
-                        new_num = 1
-                else:
-                    new_num = 1
-                
-                task_number = f"TN{new_num:06d}"
+                if self.is_new:
+                    task_number = next_number(db, "task")
 
-                task = Task(
-                    task_number=task_number,
-                    title=title,
-                    description=self.description_input.toPlainText().strip() or None,
-                    due_date=self.due_date_input.date().toPython(),
-                    priority=self.priority_input.currentText(),
-                    status=self.status_input.currentText(),
-                    assigned_to=self.assigned_to_input.text().strip() or None
-                )
-                db.add(task)
-            else:
-                self.task.title = title
-                self.task.description = self.description_input.toPlainText().strip() or None
-                self.task.due_date = self.due_date_input.date().toPython()
-                self.task.priority = self.priority_input.currentText()
-                self.task.status = self.status_input.currentText()
-                self.task.assigned_to = self.assigned_to_input.text().strip() or None
+                    task = Task(
+                        task_number=task_number,
+                        title=title,
+                        description=self.description_input.toPlainText().strip() or None,
+                        due_date=self.due_date_input.date().toPython(),
+                        priority=self.priority_input.currentText(),
+                        status=self.status_input.currentText(),
+                        assigned_to=self.assigned_to_input.text().strip() or None
+                    )
+                    db.add(task)
+                else:
+                    # Re-query to get attached object
+                    task = db.get(Task, self.task.id)
+                    task.title = title
+                    task.description = self.description_input.toPlainText().strip() or None
+                    task.due_date = self.due_date_input.date().toPython()
+                    task.priority = self.priority_input.currentText()
+                    task.status = self.status_input.currentText()
+                    task.assigned_to = self.assigned_to_input.text().strip() or None
                 
-            db.commit()
-            play_sound("celebration")
-            self.accept()
+                db.commit()
+                play_sound("celebration")
+                self.accept()
             
         except Exception as e:
             play_sound("caution")
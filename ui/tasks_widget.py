@@ -1,43 +1,37 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                               QLabel, QScrollArea, QFrame, QGridLayout, QMessageBox, QLineEdit)
+                               QLabel, QScrollArea, QMessageBox, QLineEdit)
 from PySide6.QtCore import Qt, QSize
 from ui.assets import get_icon, play_sound
-from database import get_db
 from models import Task, TaskStatus
+from ui.search_controller import SearchController
 from ui.task_card import TaskCardWidget
+from ui.flow_layout import FlowLayout
+from ui.change_bus import get_change_bus
+from ui.change_detector import PageRefresher
+from ui.counter_board import get_counter_board
+from ui.data_service import get_data_service
+from ui.report_export import export_report, format_date
+from projections import TaskRow, load_entity
 from datetime import date
 
-class FlowLayout(QFrame):
-    """Simple flow layout for cards"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setStyleSheet("QFrame { background-color: #F0F0F0; border: none; }")
-        self.grid = QGridLayout(self)
-        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.grid.setContentsMargins(10, 10, 10, 10)
-        self.grid.setSpacing(20)
+def task_sort_key(task):
+    # Same order as query_tasks: undated first, then soonest due
+    return (task.due_date is not None, task.due_date or date.min)
 
-    def clear(self):
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-    def add_cards(self, tasks, on_view, on_edit):
-        self.clear()
-        cols = 5
-        for i, task in enumerate(tasks):
-            card = TaskCardWidget(task)
-            card.clicked.connect(on_view)
-            card.edit_clicked.connect(on_edit)
-            row = i // cols
-            col = i % cols
-            self.grid.addWidget(card, row, col)
+# Columns of the exported tasks report: (header, relative width, value)
+TASK_REPORT_COLUMNS = [
+    ("Task #", 1.2, lambda task: task.task_number),
+    ("Title", 3, lambda task: task.title),
+    ("Assigned To", 1.5, lambda task: task.assigned_to),
+    ("Due Date", 1.2, lambda task: format_date(task.due_date)),
+    ("Priority", 1, lambda task: task.priority),
+    ("Status", 1.3, lambda task: task.status),
+]
 
 class TasksWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("QWidget { background-color: #F0F0F0; }")
+        self.setObjectName("page") # Grey background, from the application theme
         layout = QVBoxLayout(self)
         
         # Header
@@ -139,6 +133,7 @@ class TasksWidget(QWidget):
         self.search_box.setPlaceholderText("Search tasks...")
         self.search_box.setFixedWidth(300)
         self.search_box.textChanged.connect(self.on_search)
+        self.search_controller = SearchController(self.query_tasks, self.apply_tasks, self)
         self.search_box.setStyleSheet("""
             QLineEdit {
                 padding: 8px;
@@ -187,101 +182,106 @@ class TasksWidget(QWidget):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setStyleSheet("QScrollArea { border: none; background-color: transparent; }")
-        self.cards_container = FlowLayout()
+        self.cards_container = FlowLayout(self.make_card, sort_key=task_sort_key)
         self.scroll_area.setWidget(self.cards_container)
         layout.addWidget(self.scroll_area)
         
         self.new_task_btn.clicked.connect(self.open_new_task_dialog)
         self.print_btn.clicked.connect(self.print_tasks_page)
+        get_change_bus().entity_changed.connect(self.on_entity_changed)
+        self.refresher = PageRefresher(self, ["task"], self.refresh_data) # Other stations' changes
+        get_counter_board().changed.connect(self.update_counts)
+        self.update_counts()
         self.refresh_data()
 
     def on_search(self, text):
-        self.refresh_data(search=text)
+        self.search_controller.search(text)
 
     def open_new_task_dialog(self):
         from ui.task_editor import TaskEditorDialog
         dialog = TaskEditorDialog(self)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
 
     def edit_task(self, task):
         from ui.task_editor import TaskEditorDialog
+        task = load_entity(task)
+        if task is None:
+            return # Deleted elsewhere; the change bus drops its card
         dialog = TaskEditorDialog(self, task)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
             
     def view_task(self, task):
         self.edit_task(task)
 
-    def refresh_data(self, search=""):
-        db = next(get_db())
-        try:
-            query = db.query(Task).filter(Task.is_archived == False)
-            
-            if search:
-                search_filter = f"%{search}%"
-                query = query.filter(
-                    (Task.title.like(search_filter)) |
-                    (Task.description.like(search_filter)) |
-                    (Task.assigned_to.like(search_filter))
-                )
-            
-            tasks = query.order_by(Task.due_date).all()
-            
-            # Calculate counts
-            today = date.today()
-            overdue = 0
-            due_today = 0
-            on_time = 0
-            
-            status_counts = {
-                TaskStatus.TODO: 0,
-                TaskStatus.IN_PROGRESS: 0,
-                TaskStatus.COMPLETED: 0
-            }
-            
-            for task in tasks:
-                if task.status in status_counts:
-                    status_counts[task.status] += 1
-                
-                if task.due_date and task.status != TaskStatus.COMPLETED:
-                    if task.due_date < today:
-                        overdue += 1
-                    elif task.due_date == today:
-                        due_today += 1
-                    else:
-                        on_time += 1
-            
-            self.overdue_count.setText(str(overdue))
-            self.due_today_count.setText(str(due_today))
-            self.on_time_count.setText(str(on_time))
-            
-            self.status_todo_count.setText(str(status_counts[TaskStatus.TODO]))
-            self.status_progress_count.setText(str(status_counts[TaskStatus.IN_PROGRESS]))
-            self.status_completed_count.setText(str(status_counts[TaskStatus.COMPLETED]))
-            
-            self.cards_container.add_cards(tasks, self.view_task, self.edit_task)
-            
-        finally:
-            db.close()
-            
-    def print_tasks_page(self):
-        from PySide6.QtPrintSupport import QPrinter, QPrintDialog
-        from PySide6.QtGui import QPainter, QPageLayout
-        from PySide6.QtCore import QMarginsF
+    def refresh_data(self, search=None):
+        """Reload the page in the background, keeping the current search text"""
+        if search is None:
+            search = self.search_box.text()
+        self.search_controller.refresh(search)
+
+    def tasks_query(self, db, search):
+        query = db.query(Task).filter(Task.is_archived == False)
         
-        printer = QPrinter(QPrinter.HighResolution)
-        printer.setPageOrientation(QPageLayout.Landscape)
-        margins = QMarginsF(10, 10, 10, 10)
-        printer.setPageMargins(margins, QPageLayout.Millimeter)
+        if search:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                (Task.title.like(search_filter)) |
+                (Task.description.like(search_filter)) |
+                (Task.assigned_to.like(search_filter))
+            )
+        return query
+
+    def query_tasks(self, db, search):
+        """Load the tasks to show; runs on a search worker thread"""
+        return TaskRow.all(self.tasks_query(db, search).order_by(Task.due_date))
+
+    def report_tasks(self, db, search):
+        """The page's tasks in page order, for the PDF export"""
+        return self.tasks_query(db, search).order_by(Task.due_date, Task.id)
+
+    def query_one_task(self, db, task_id, search):
+        """Load one task if it belongs on the page, else None"""
+        return TaskRow.first(self.tasks_query(db, search).filter(Task.id == task_id))
+
+    def make_card(self, task):
+        card = TaskCardWidget(task)
+        card.clicked.connect(self.view_task)
+        card.edit_clicked.connect(self.edit_task)
+        return card
+
+    def apply_tasks(self, tasks):
+        self.cards_container.add_cards(tasks)
+
+    def update_counts(self):
+        """Header counts over all active tasks, whatever the search"""
+        counts = get_counter_board().counts("task")
+        self.overdue_count.setText(str(counts["overdue"]))
+        self.due_today_count.setText(str(counts["due_today"]))
+        self.on_time_count.setText(str(counts["on_time"]))
         
-        dialog = QPrintDialog(printer, self)
-        if dialog.exec():
-            painter = QPainter(printer)
-            widget_to_print = self.scroll_area.widget()
-            page_rect = printer.pageRect(QPrinter.DevicePixel)
-            widget_rect = widget_to_print.rect()
-            scale = min(page_rect.width() / widget_rect.width(), page_rect.height() / widget_rect.height())
-            painter.scale(scale, scale)
-            widget_to_print.render(painter)
-            painter.end()
+        self.status_todo_count.setText(str(counts[TaskStatus.TODO.value]))
+        self.status_progress_count.setText(str(counts[TaskStatus.IN_PROGRESS.value]))
+        self.status_completed_count.setText(str(counts[TaskStatus.COMPLETED.value]))
+
+    def on_entity_changed(self, entity, entity_id, kind):
+        """Patch the one changed card instead of reloading the page"""
+        if entity != "task":
+            return
+        if kind == "delete":
+            self.cards_container.remove_card(entity_id)
+            return
+        call = get_data_service().run(self.query_one_task, entity_id, self.search_box.text(),
+                                      label="query_one_task")
+        call.finished.connect(lambda task: self.apply_task(entity_id, task))
+        call.failed.connect(lambda message: self.refresh_data())
+
+    def apply_task(self, task_id, task):
+        if task is None:
+            # Archived, or no longer matches the search
+            self.cards_container.remove_card(task_id)
+        else:
+            self.cards_container.upsert_card(task)
+            
+    def print_tasks_page(self):
+        """Export the tasks on the page (current search) as a paginated PDF"""
+        export_report(self, "Tasks", TASK_REPORT_COLUMNS, self.report_tasks, self.search_box.text())
@@ -0,0 +1,197 @@
+"""
+The application style sheet, built and applied once.
+
+Cards used to call setStyleSheet on themselves and on several of their
+children, so Qt parsed and polished a handful of style sheets for every
+card shown. Now nothing inside a card has a style sheet: each styled part
+has an object name (card, trafficLight, pill, cardTitle, ...) and dynamic
+properties for what it shows (kind="job", traffic="red", status="In
+Queue"). THEME has a rule for every combination, generated from the colour
+tables below, which JobCardDelegate also paints from. apply_theme() sets
+it on the application once.
+
+Qt prefers a parent widget's style sheet to the application's, however
+specific the application's selectors are. So the pages that hold cards
+don't have their own sheet either: they are named "page" and the card grid
+"cardGrid", and both are styled here.
+"""
+from enum import Enum
+from PySide6.QtWidgets import QApplication
+
+PAGE_BACKGROUND = "#F0F0F0"
+
+# Traffic light state -> colour, per card kind (job cards use the Material palette)
+TRAFFIC_COLORS = {
+    "job": {"blue": "#2196F3", "red": "#F44336", "orange": "#FF9800", "green": "#4CAF50"},
+    "task": {"blue": "#3498db", "red": "#e74c3c", "orange": "#f39c12", "green": "#2ecc71"},
+    "po": {"blue": "#3498db", "red": "#e74c3c", "orange": "#E67E22", "green": "#2ecc71", "grey": "#95a5a6"},
+}
+
+# Pill (background, text) colours
+PRIORITY_COLORS = {
+    "Miracle": ("#FF0000", "#FFFFFF"), # Bright Red
+    "Express": ("#FF8C00", "#FFFFFF"), # Dark Orange
+    "Normal": ("#00FF00", "#FFFFFF"), # Bright Green
+}
+
+# Status pills per card kind; "" is the colour of any other status
+STATUS_COLORS = {
+    "job": {
+        "Job Created": ("#00BFFF", "#FFFFFF"), # Bright Blue
+        "Awaiting Stock": ("#9C27B0", "#FFFFFF"), # Bright Purple
+        "In Queue": ("#00FF00", "#FFFFFF"), # Bright Green
+        "Out Queue": ("#FFD700", "#000000"), # Daisy Yellow
+        "Customer Notified": ("#000000", "#FFFFFF"), # Black
+        "Complete": ("#FFFFFF", "#000000"), # White
+        "": ("#607D8B", "#FFFFFF"), # Blue-gray
+    },
+    "task": {
+        "To Do": ("#95a5a6", "#FFFFFF"), # Grey
+        "In Progress": ("#3498db", "#FFFFFF"), # Blue
+        "Completed": ("#27ae60", "#FFFFFF"), # Green
+        "Cancelled": ("#e74c3c", "#FFFFFF"), # Red
+        "": ("#95a5a6", "#FFFFFF"),
+    },
+    "quote": {
+        "Draft": ("#95a5a6", "#FFFFFF"), # Grey
+        "Sent": ("#3498db", "#FFFFFF"), # Blue
+        "Accepted": ("#27ae60", "#FFFFFF"), # Green
+        "Rejected": ("#e74c3c", "#FFFFFF"), # Red
+        "Expired": ("#f39c12", "#FFFFFF"), # Orange
+        "": ("#95a5a6", "#FFFFFF"),
+    },
+    "customer": {
+        "Active": ("#27ae60", "#FFFFFF"), # Green
+        "On Hold": ("#f39c12", "#FFFFFF"), # Orange
+        "Archived": ("#95a5a6", "#FFFFFF"), # Grey
+        "Banned": ("#e74c3c", "#FFFFFF"), # Red
+        "": ("#95a5a6", "#FFFFFF"),
+    },
+    "supplier": {
+        "": ("#3498db", "#FFFFFF"), # Account type
+    },
+}
+
+# Statuses that aren't spelled exactly as above, matched by the words in them (in order)
+STATUS_WORDS = {
+    "job": [
+        ("Job Created", ("created",)),
+        ("Awaiting Stock", ("awaiting stock", "waiting stock")),
+        ("In Queue", ("in queue",)),
+        ("Out Queue", ("out queue",)),
+        ("Customer Notified", ("notified",)),
+        ("Complete", ("complete",)),
+    ],
+    "task": [
+        ("To Do", ("to do", "todo")),
+        ("In Progress", ("in progress",)),
+        ("Completed", ("completed",)),
+        ("Cancelled", ("cancelled",)),
+    ],
+}
+
+
+def status_key(kind, status):
+    """The STATUS_COLORS key of status on a kind of card"""
+    status = status.value if isinstance(status, Enum) else (status or "")
+    if status in STATUS_COLORS[kind]:
+        return status
+    status_lower = status.lower()
+    for key, words in STATUS_WORDS.get(kind, []):
+        if any(word in status_lower for word in words):
+            return key
+    return ""
+
+
+def priority_key(priority):
+    """The PRIORITY_COLORS key of a priority; anything not miracle or express is normal"""
+    priority_lower = (priority.value if isinstance(priority, Enum) else (priority or "")).lower()
+    if "miracle" in priority_lower:
+        return "Miracle"
+    if "express" in priority_lower:
+        return "Express"
+    return "Normal"
+
+
+def styled(widget, name, **properties):
+    """Give widget the object name and dynamic properties THEME selects it by"""
+    widget.setObjectName(name)
+    for key, value in properties.items():
+        widget.setProperty(key, value)
+    return widget
+
+
+def _build_theme():
+    rules = [f"""
+        /* Pages holding cards; "*" keeps these below every named part */
+        #page, #page * {{ background-color: {PAGE_BACKGROUND}; }}
+        QFrame#cardGrid {{ background-color: {PAGE_BACKGROUND}; border: none; }}
+        QFrame#cardGrid[transparent="true"] {{ background-color: transparent; }}
+
+        /* Cards - light blue/cyan like the mockup */
+        QFrame#card {{
+            background-color: #D5EEF2;
+            border: 1px solid #B8D8DD;
+            border-radius: 8px;
+        }}
+        QFrame#card QLabel {{ border: none; background: transparent; }}
+        QFrame#card QPushButton {{
+            border: none;
+            background: transparent;
+            color: #2c3e50;
+            font-size: 11px;
+            padding: 4px 8px;
+        }}
+        QFrame#card QPushButton:hover {{
+            background-color: rgba(0, 0, 0, 0.05);
+            border-radius: 4px;
+        }}
+        QFrame#card QWidget#trafficLight {{ border-radius: 17px; border: none; }}
+
+        QFrame#card QLabel#cardTitle {{ font-weight: bold; font-size: 14px; color: #2c3e50; }}
+        QFrame#card QLabel#cardNumber {{ font-weight: bold; font-size: 14px; color: #546E7A; }}
+        QFrame#card QLabel#cardSubtitle {{ color: #546E7A; font-size: 11px; }}
+        QFrame#card QLabel#cardContact {{ color: #546E7A; font-size: 12px; }}
+        QFrame#card QLabel#cardDetail {{ color: #546E7A; font-size: 10px; }}
+        QFrame#card QLabel#cardNote {{ color: #546E7A; font-size: 10px; font-style: italic; }}
+        QFrame#card QLabel#cardTotal {{ font-size: 16px; font-weight: bold; color: #27ae60; }}
+        QFrame#card QLabel#cardDate {{ color: #546E7A; font-size: 10px; font-weight: bold; }}
+        QFrame#card QLabel#cardCaption {{ color: #7f8c8d; font-size: 11px; }}
+        QFrame#card QLabel#cardMore {{ color: #7f8c8d; font-size: 10px; font-style: italic; }}
+        QFrame#card QLabel#cardEmpty {{ color: #95a5a6; font-size: 10px; font-style: italic; }}
+        QFrame#card QLabel#pill {{
+            padding: 4px 8px;
+            border-radius: 8px;
+            font-size: 9px;
+            font-weight: bold;
+        }}
+    """]
+
+    for kind, colors in TRAFFIC_COLORS.items():
+        for state, color in colors.items():
+            rules.append(f'QFrame#card[kind="{kind}"] QWidget#trafficLight[traffic="{state}"] '
+                         f'{{ background-color: {color}; }}')
+            rules.append(f'QFrame#card[kind="{kind}"] QLabel#cardDate[traffic="{state}"] {{ color: {color}; }}')
+
+    for priority, (background, foreground) in PRIORITY_COLORS.items():
+        rules.append(f'QFrame#card QLabel#pill[priority="{priority}"] '
+                     f'{{ background-color: {background}; color: {foreground}; }}')
+
+    for kind, statuses in STATUS_COLORS.items():
+        for status, (background, foreground) in statuses.items():
+            rules.append(f'QFrame#card[kind="{kind}"] QLabel#pill[status="{status}"] '
+                         f'{{ background-color: {background}; color: {foreground}; }}')
+
+    return "\n".join(rules)
+
+
+THEME = _build_theme()
+
+
+def apply_theme(app=None):
+    """Set THEME on the application (once; later calls do nothing)"""
+    app = app or QApplication.instance()
+    if app is None or app.property("themeApplied"):
+        return
+    app.setStyleSheet(THEME)
+    app.setProperty("themeApplied", True)
@@ -0,0 +1,235 @@
+from PySide6.QtWidgets import QProgressDialog, QMessageBox
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, QRectF, QPointF, QMarginsF
+from PySide6.QtGui import QPainter, QFont, QFontMetricsF, QStaticText, QPen, QColor, QPageLayout, QTransform
+from PySide6.QtPrintSupport import QPrinter, QPrintDialog
+
+# Tickets per sheet (columns x rows)
+TICKET_COLUMNS = 2
+TICKET_ROWS = 2
+
+# Tickets drawn per timer tick, so the UI stays responsive while spooling
+TICKETS_PER_TICK = 8
+
+# Gap between tickets on a sheet, in millimetres
+GUTTER_MM = 6
+
+
+def _date(value):
+    return value.strftime("%b %d, %Y") if value else "N/A"
+
+
+# Ticket rows: (label, value(job))
+TICKET_FIELDS = [
+    ("Customer", lambda job: job.customer_name),
+    ("Order Type", lambda job: job.order_type),
+    ("Due Date", lambda job: _date(job.due_date)),
+    ("Priority", lambda job: job.priority),
+    ("Status", lambda job: job.status),
+    ("Source", lambda job: job.order_source),
+    ("Assigned To", lambda job: job.assigned_to),
+    ("Shipping", lambda job: job.shipping),
+    ("Phone", lambda job: job.contact_phone),
+]
+
+
+class TicketTemplate:
+    """
+    Job ticket layout for one ticket size, worked out once. Labels are
+    cached QStaticText and the value and notes areas are fixed rects, so
+    each ticket only draws its own text.
+    """
+    def __init__(self, width, height, dpi):
+        self.rect = QRectF(0, 0, width, height)
+        scale = dpi / 72 # Fonts are sized in points
+
+        self.number_font = self._font(16 * scale, bold=True)
+        self.label_font = self._font(8 * scale, bold=True)
+        self.value_font = self._font(10 * scale)
+        self.notes_font = self._font(9 * scale)
+
+        padding = 8 * scale
+        inner = self.rect.adjusted(padding, padding, -padding, -padding)
+        number_height = QFontMetricsF(self.number_font).height() * 1.3
+        self.number_rect = QRectF(inner.left(), inner.top(), inner.width(), number_height)
+        self.rule_y = inner.top() + number_height
+
+        label_metrics = QFontMetricsF(self.label_font)
+        label_width = max(label_metrics.horizontalAdvance(label.upper()) for label, _value in TICKET_FIELDS) + padding
+        row_height = QFontMetricsF(self.value_font).height() * 1.35
+
+        self.labels = [] # (QStaticText, position)
+        self.value_rects = []
+        y = self.rule_y + padding / 2
+        for label, _value in TICKET_FIELDS:
+            static = QStaticText(label.upper())
+            static.setTextFormat(Qt.PlainText)
+            static.setPerformanceHint(QStaticText.AggressiveCaching)
+            static.prepare(QTransform(), self.label_font)
+            label_y = y + (row_height - label_metrics.height()) / 2
+            self.labels.append((static, QPointF(inner.left(), label_y)))
+            self.value_rects.append(QRectF(inner.left() + label_width, y, inner.width() - label_width, row_height))
+            y += row_height
+
+        self.notes_label = QStaticText("NOTES")
+        self.notes_label.setTextFormat(Qt.PlainText)
+        self.notes_label.prepare(QTransform(), self.label_font)
+        self.notes_label_pos = QPointF(inner.left(), y + padding / 2)
+        notes_top = y + padding / 2 + label_metrics.height() * 1.2
+        self.notes_rect = QRectF(inner.left(), notes_top, inner.width(), max(0.0, inner.bottom() - notes_top))
+
+        self.border_pen = QPen(QColor("#2c3e50"), max(1.0, scale))
+        self.rule_pen = QPen(QColor("#bdc3c7"), max(1.0, scale / 2))
+
+    def _font(self, pixel_size, bold=False):
+        font = QFont("Arial")
+        font.setPixelSize(max(1, round(pixel_size)))
+        font.setBold(bold)
+        return font
+
+    def paint(self, painter, origin, job):
+        painter.save()
+        painter.translate(origin)
+
+        painter.setPen(self.border_pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(self.rect)
+
+        painter.setFont(self.number_font)
+        painter.drawText(self.number_rect, Qt.AlignLeft | Qt.AlignVCenter, job.job_number or "")
+        painter.setPen(self.rule_pen)
+        painter.drawLine(QPointF(self.number_rect.left(), self.rule_y), QPointF(self.number_rect.right(), self.rule_y))
+
+        painter.setPen(QColor("#546E7A"))
+        painter.setFont(self.label_font)
+        for static, position in self.labels:
+            painter.drawStaticText(position, static)
+        painter.drawStaticText(self.notes_label_pos, self.notes_label)
+
+        painter.setPen(QColor("#000000"))
+        painter.setFont(self.value_font)
+        metrics = painter.fontMetrics()
+        for (_label, value), rect in zip(TICKET_FIELDS, self.value_rects):
+            text = metrics.elidedText(str(value(job) or ""), Qt.ElideRight, int(rect.width()))
+            painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, text)
+
+        if job.notes and self.notes_rect.height() > 0:
+            painter.setFont(self.notes_font)
+            painter.setClipRect(self.notes_rect)
+            painter.drawText(self.notes_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, job.notes)
+
+        painter.restore()
+
+
+# (width, height, dpi) -> TicketTemplate
+_templates = {}
+
+
+def get_ticket_template(width, height, dpi):
+    key = (round(width), round(height), dpi)
+    if key not in _templates:
+        _templates[key] = TicketTemplate(width, height, dpi)
+    return _templates[key]
+
+
+class TicketPrintRun(QObject):
+    """
+    Draws tickets for jobs into one print job, TICKETS_PER_TICK at a time
+    from a timer, TICKET_COLUMNS x TICKET_ROWS per sheet. finished(printed)
+    is emitted when done or cancelled.
+    """
+    progress = Signal(int, int)
+    finished = Signal(int)
+
+    def __init__(self, printer, jobs, parent=None):
+        super().__init__(parent)
+        self.printer = printer
+        self.jobs = list(jobs)
+        self.printed = 0
+        self.painter = None
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._draw_some)
+
+    def start(self):
+        printer = self.printer
+        page = printer.pageRect(QPrinter.DevicePixel)
+        dpi = printer.resolution()
+        gutter = GUTTER_MM / 25.4 * dpi
+        width = (page.width() - gutter * (TICKET_COLUMNS - 1)) / TICKET_COLUMNS
+        height = (page.height() - gutter * (TICKET_ROWS - 1)) / TICKET_ROWS
+        self.template = get_ticket_template(width, height, dpi)
+        self.origins = [
+            QPointF(column * (width + gutter), row * (height + gutter))
+            for row in range(TICKET_ROWS) for column in range(TICKET_COLUMNS)
+        ]
+
+        self.painter = QPainter()
+        if not self.painter.begin(printer):
+            self.painter = None
+            return False
+        self.painter.setRenderHint(QPainter.Antialiasing)
+        self.timer.start()
+        return True
+
+    def cancel(self):
+        if self.painter is not None:
+            self.printer.abort()
+            self._end()
+
+    def _draw_some(self):
+        per_sheet = len(self.origins)
+        for job in self.jobs[self.printed:self.printed + TICKETS_PER_TICK]:
+            slot = self.printed % per_sheet
+            if slot == 0 and self.printed > 0:
+                self.printer.newPage()
+            self.template.paint(self.painter, self.origins[slot], job)
+            self.printed += 1
+        self.progress.emit(self.printed, len(self.jobs))
+        if self.printed >= len(self.jobs):
+            self._end()
+
+    def _end(self):
+        self.timer.stop()
+        if self.painter is not None:
+            self.painter.end()
+            self.painter = None
+            self.finished.emit(self.printed)
+
+
+def print_tickets(parent, jobs):
+    """One print dialog, then every job's ticket spooled as a single document"""
+    if not jobs:
+        return None
+
+    printer = QPrinter(QPrinter.HighResolution)
+    printer.setPageOrientation(QPageLayout.Landscape)
+    printer.setPageMargins(QMarginsF(10, 10, 10, 10), QPageLayout.Millimeter)
+    printer.setDocName(f"Job tickets ({len(jobs)})")
+
+    dialog = QPrintDialog(printer, parent)
+    dialog.setWindowTitle(f"Print {len(jobs)} Job Ticket{'s' if len(jobs) != 1 else ''}")
+    if not dialog.exec():
+        return None
+
+    progress = QProgressDialog("Printing job tickets...", "Cancel", 0, len(jobs), parent)
+    progress.setWindowTitle("Print Tickets")
+    progress.setWindowModality(Qt.WindowModal)
+    progress.setMinimumDuration(500)
+    progress.setAutoClose(False)
+    progress.setAutoReset(False)
+
+    run = TicketPrintRun(printer, jobs, progress)
+    progress.canceled.connect(run.cancel)
+    run.progress.connect(lambda printed, total: progress.setValue(printed))
+
+    def on_finished(printed):
+        progress.close()
+        progress.deleteLater()
+
+    run.finished.connect(on_finished)
+    if not run.start():
+        progress.deleteLater()
+        QMessageBox.critical(parent, "Print Error", "Could not start printing job tickets.")
+        return None
+    return run